@@ -1,3 +1,28 @@
-from .treeviewex import CellType, TreeviewEx
+from .asyncio_bridge import AsyncioBridge
+from .ingest import FileLoader
+from .schema import (
+    DECIMAL,
+    FLOAT,
+    INT,
+    ColumnType,
+    date_type,
+    enum_type,
+)
+from .sqlite_source import SourceRow, SQLiteDataSource
+from .treeviewex import CellType, Change, TreeviewEx
 
-__all__ = ["CellType", "TreeviewEx"]
+__all__ = [
+    "AsyncioBridge",
+    "CellType",
+    "Change",
+    "ColumnType",
+    "DECIMAL",
+    "FileLoader",
+    "FLOAT",
+    "INT",
+    "SourceRow",
+    "SQLiteDataSource",
+    "TreeviewEx",
+    "date_type",
+    "enum_type",
+]
@@ -0,0 +1,193 @@
+# python3
+"""Run an asyncio event loop inside the Tk event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+
+__all__ = ["AsyncioBridge"]
+
+_STEP_MS = 16  # Wait between loop steps while tasks are pending
+_ITERATIONS = 8  # asyncio iterations per step, for chains of callbacks
+
+_BRIDGES = weakref.WeakKeyDictionary()  # Tk root -> AsyncioBridge
+
+
+class AsyncioBridge:
+    """
+    Drive an asyncio event loop from the Tk event loop.
+
+    Each step runs a few iterations of the asyncio loop without blocking
+    (pending I/O, due timers and ready callbacks) and schedules the next
+    step with ``after`` ``step_ms`` later while tasks are pending. Once
+    every task has finished, the bridge stops scheduling steps until
+    create_task(), call_soon_threadsafe() or wake() is called, so an idle
+    application is not woken. Tk keeps its own ``mainloop`` and
+    coroutines may touch widgets directly, because both loops run on the
+    Tk thread. The bridge is closed when its Tk root is destroyed.
+    """
+
+    def __init__(
+        self,
+        widget,
+        loop: asyncio.AbstractEventLoop | None = None,
+        step_ms: int = _STEP_MS,
+    ):
+        """
+        Initialize the bridge and register it for the widget's Tk root.
+
+        Parameters
+        ----------
+        widget : tkinter.Misc
+            Any widget of the Tk application.
+        loop : asyncio.AbstractEventLoop, optional
+            Event loop to drive. It must not be running elsewhere.
+            The default is a new event loop.
+        step_ms : int, optional
+            Wait between steps while tasks are pending, which bounds the
+            latency of I/O and timers. The default is 16.
+
+        Returns
+        -------
+        None.
+
+        """
+        root = widget._root()  # pylint: disable=protected-access
+        # A strong reference would keep the registry key alive
+        self._root_ref = weakref.ref(root)
+        self.loop = loop if loop is not None else asyncio.new_event_loop()
+        self.step_ms = step_ms
+        self._after_id = None
+        _BRIDGES[root] = self
+        root.bind("<Destroy>", self._on_destroy, add="+")
+
+    @property
+    def root(self):
+        """Return the Tk root, or None once it has been collected."""
+        return self._root_ref()
+
+    @classmethod
+    def for_widget(cls, widget) -> AsyncioBridge:
+        """
+        Return the running bridge of a widget's Tk root, creating one.
+
+        Parameters
+        ----------
+        widget : tkinter.Misc
+            Any widget of the Tk application.
+
+        Returns
+        -------
+        AsyncioBridge
+            Started bridge.
+
+        """
+        root = widget._root()  # pylint: disable=protected-access
+        bridge = _BRIDGES.get(root)
+        if bridge is None or bridge.loop.is_closed():
+            bridge = cls(widget)
+        bridge.start()
+        return bridge
+
+    def start(self) -> None:
+        """Start stepping the asyncio loop from the Tk event loop."""
+        if self._after_id is None:
+            self.wake()
+
+    def stop(self) -> None:
+        """Stop stepping; tasks resume when the bridge is started again."""
+        if self._after_id is not None:
+            root = self.root
+            if root is not None:
+                root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def close(self) -> None:
+        """Stop stepping, cancel remaining tasks and close the loop."""
+        self.stop()
+        if self.loop.is_closed():
+            return
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+        self.loop.close()
+        root = self.root
+        if root is not None and _BRIDGES.get(root) is self:
+            del _BRIDGES[root]
+
+    def create_task(self, coro) -> asyncio.Task:
+        """
+        Schedule a coroutine on the loop and wake the bridge.
+
+        Parameters
+        ----------
+        coro : coroutine
+            Coroutine to run.
+
+        Returns
+        -------
+        asyncio.Task
+            Task running the coroutine.
+
+        """
+        task = self.loop.create_task(coro)
+        self.wake()
+        return task
+
+    def call_soon_threadsafe(self, callback, *args) -> asyncio.Handle:
+        """
+        Schedule a callback on the loop and wake the bridge.
+
+        Parameters
+        ----------
+        callback : Callable
+            Called with args on the asyncio loop.
+        *args : Any
+            Arguments passed to callback.
+
+        Returns
+        -------
+        asyncio.Handle
+            Handle of the scheduled callback.
+
+        """
+        handle = self.loop.call_soon_threadsafe(callback, *args)
+        self.wake()
+        return handle
+
+    def wake(self) -> None:
+        """Run the next step as soon as Tk is idle."""
+        root = self.root
+        if root is None or self.loop.is_closed():
+            return
+        if self._after_id is not None:
+            root.after_cancel(self._after_id)
+        self._after_id = root.after_idle(self._step)
+
+    def _step(self) -> None:
+        """Run a few non-blocking iterations of the asyncio loop."""
+        self._after_id = None
+        if self.loop.is_closed():
+            return
+        # The loop is running when a coroutine called update()
+        for _ in range(0 if self.loop.is_running() else _ITERATIONS):
+            # stop() before run_forever() polls I/O once with no timeout
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+            if not asyncio.all_tasks(self.loop):
+                return  # Idle until woken again
+        # A task may have woken the bridge during this step
+        root = self.root
+        if self._after_id is None and root is not None:
+            self._after_id = root.after(self.step_ms, self._step)
+
+    def _on_destroy(self, event) -> None:
+        """Close the bridge when its Tk root is destroyed."""
+        # The binding of the root also fires for every other widget
+        if str(event.widget) == ".":
+            self.close()
@@ -0,0 +1,437 @@
+# python3
+"""Parallel loader of CSV and JSON Lines files for TreeviewEx."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from tkinter import TclError
+from typing import Callable, NamedTuple
+
+__all__ = ["FileLoader"]
+
+_CHUNK_BYTES = 4 << 20  # Bytes parsed per chunk
+_FIRST_CHUNK_BYTES = 64 << 10  # Small first chunk so that rows appear soon
+_FRAME_MS = 16  # Interval between insert steps
+_INSERT_BUDGET_MS = 8  # Longest time spent inserting per frame
+_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class _ChunkSpec(NamedTuple):
+    """Parsing options sent with every chunk to the workers."""
+
+    file_format: str  # "csv" or "jsonl"
+    encoding: str
+    delimiter: str
+    fieldnames: tuple  # CSV header
+    value_columns: tuple
+    text_column: str | None
+    id_column: str | None
+    parent_column: str | None
+    path_column: str | None
+    separator: str
+
+
+class FileLoader:
+    """
+    Parse a CSV or JSON Lines file in parallel and insert it per frame.
+
+    The file is split into line-aligned byte ranges that are parsed in
+    worker processes or threads. Parsed chunks are inserted in file order
+    on the Tk thread within a time budget per frame, so the first rows
+    appear while the rest of the file is still being parsed. At most
+    ``max_in_flight`` chunks are parsed or waiting to be inserted at a
+    time, which bounds memory use. Records must not contain line breaks.
+    Rows whose ID is already in the tree are skipped and listed in
+    ``skipped``.
+
+    The default process pool starts worker processes that import the
+    main module on platforms that spawn them (Windows and macOS), so the
+    application must create the widgets and start loading under an
+    ``if __name__ == "__main__":`` guard there.
+    """
+
+    def __init__(
+        self,
+        widget,
+        path,
+        file_format: str | None = None,
+        parent: str = "",
+        value_columns: list | None = None,
+        text_column: str | None = None,
+        id_column: str | None = None,
+        parent_column: str | None = None,
+        path_column: str | None = None,
+        separator: str = "/",
+        encoding: str = "utf-8",
+        delimiter: str = ",",
+        chunk_bytes: int = _CHUNK_BYTES,
+        max_in_flight: int | None = None,
+        processes: bool = True,
+        executor: Executor | None = None,
+        on_progress: Callable | None = None,
+        on_done: Callable | None = None,
+    ):
+        """
+        Initialize the loader and read the header.
+
+        Parameters
+        ----------
+        widget : TreeviewEx
+            Tree receiving the rows.
+        path : str or os.PathLike
+            File to load.
+        file_format : str, optional
+            "csv" or "jsonl". The default is taken from the file suffix.
+        parent : str, optional
+            Item under which top-level rows are inserted.
+            The default is "" (top level).
+        value_columns : list, optional
+            Fields shown as values, in order. The default is every field
+            that is not used for the text or the hierarchy.
+        text_column : str, optional
+            Field shown in the tree column. The default is the last path
+            segment with path_column, otherwise empty text.
+        id_column : str, optional
+            Field holding the row ID. The default is None (generated IDs).
+        parent_column : str, optional
+            Field holding the parent's row ID; empty for top-level rows.
+            Rows whose parent has not been inserted yet wait for it.
+        path_column : str, optional
+            Field holding a path such as "a/b/c", used as the row ID.
+            Missing ancestors are created. The default is None.
+        separator : str, optional
+            Path separator. The default is "/".
+        encoding : str, optional
+            Encoding of the file; it must be ASCII-compatible.
+            The default is "utf-8".
+        delimiter : str, optional
+            CSV field delimiter. The default is ",".
+        chunk_bytes : int, optional
+            Bytes parsed per chunk. The default is 4 MiB.
+        max_in_flight : int, optional
+            Chunks parsed or waiting at a time. The default is twice the
+            number of workers.
+        processes : bool, optional
+            Parse in a process pool; False uses a thread pool, which suits
+            sources limited by I/O. The process pool needs the main
+            module guarded by ``if __name__ == "__main__":`` on platforms
+            that spawn processes. The default is True.
+        executor : concurrent.futures.Executor, optional
+            Executor to use instead of a new pool. It is not shut down.
+        on_progress : Callable, optional
+            Called as ``on_progress(rows, fraction)`` after each frame
+            that inserted rows.
+        on_done : Callable, optional
+            Called as ``on_done(rows, error)`` when the file is loaded or
+            loading failed; error is the exception, or None. It is not
+            called after cancel().
+
+        Raises
+        ------
+        ValueError
+            If the format is unknown, or the file is a JSON array.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.widget = widget
+        self.path = os.fspath(path)
+        self.parent = parent
+        self.chunk_bytes = max(1, chunk_bytes)
+        self.on_progress = on_progress
+        self.on_done = on_done
+        if file_format is None:
+            file_format = _FORMATS.get(Path(self.path).suffix.lower())
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown file format: {file_format}")
+
+        with open(self.path, "rb") as file:
+            self.total_bytes = os.fstat(file.fileno()).st_size
+            first_line = file.readline()
+        if file_format == "csv":
+            header = csv.reader(
+                [first_line.decode(encoding)], delimiter=delimiter
+            )
+            fieldnames = tuple(next(header, ()))
+            self._data_start = len(first_line)
+        elif first_line.lstrip().startswith(b"["):
+            raise ValueError("JSON arrays cannot be split; use JSON Lines")
+        else:
+            fieldnames = tuple(json.loads(first_line) if first_line else ())
+            self._data_start = 0
+        if value_columns is None:
+            used = (text_column, id_column, parent_column, path_column)
+            value_columns = [name for name in fieldnames if name not in used]
+        self._spec = _ChunkSpec(
+            file_format,
+            encoding,
+            delimiter,
+            fieldnames,
+            tuple(value_columns),
+            text_column,
+            id_column,
+            parent_column,
+            path_column,
+            separator,
+        )
+
+        workers = os.cpu_count() or 1
+        self.max_in_flight = max(1, max_in_flight or 2 * workers)
+        self._executor = executor
+        self._own_executor = executor is None
+        self._processes = processes
+        self._workers = workers
+
+        self.rows_inserted = 0
+        self.skipped = []  # IDs of rows that were already in the tree
+        self.bytes_loaded = self._data_start
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._next_start = self._data_start  # Start of the next chunk
+        self._in_flight = deque()  # (future, end offset) in file order
+        self._rows = []  # Parsed rows of the chunk being inserted
+        self._row_index = 0
+        self._chunk_end = self._data_start
+        self._known = set()  # Row IDs that exist in the tree
+        self._created = set()  # Path ancestors created before their row
+        self._orphans = {}  # Missing parent ID -> rows waiting for it
+        self._after_id = None
+        self._file = None  # Open while loading, to find chunk boundaries
+
+    @property
+    def progress(self) -> float:
+        """Return the loaded fraction of the file, from 0.0 to 1.0."""
+        if self.total_bytes == 0:
+            return 1.0
+        return self.bytes_loaded / self.total_bytes
+
+    def start(self) -> None:
+        """Start parsing and inserting."""
+        if self.done or self._after_id is not None:
+            return
+        # Closed by _finish() when loading ends
+        self._file = open(  # pylint: disable=consider-using-with
+            self.path, "rb"
+        )
+        try:
+            if self._executor is None:
+                if self._processes:
+                    self._executor = ProcessPoolExecutor(self._workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        self._workers, thread_name_prefix="treeviewex-loader"
+                    )
+            self._submit()
+            self._after_id = self.widget.after(_FRAME_MS, self._step)
+        except BaseException:
+            self._finish()
+            raise
+
+    def cancel(self) -> None:
+        """Stop loading; rows inserted so far stay in the tree."""
+        if not self.done:
+            self.cancelled = True
+            self._finish()
+
+    def _submit(self) -> None:
+        """Start parsing chunks while fewer than max_in_flight are open."""
+        while (
+            self._next_start < self.total_bytes
+            and len(self._in_flight) + bool(self._rows) < self.max_in_flight
+        ):
+            size = self.chunk_bytes
+            if self._next_start == self._data_start:
+                size = min(size, _FIRST_CHUNK_BYTES)
+            end = self._line_end(self._next_start + size)
+            future = self._executor.submit(
+                _parse_chunk, self.path, self._next_start, end, self._spec
+            )
+            self._in_flight.append((future, end))
+            self._next_start = end
+
+    def _line_end(self, offset: int) -> int:
+        """Return the end of the line containing the byte before offset."""
+        if offset >= self.total_bytes:
+            return self.total_bytes
+        self._file.seek(offset - 1)
+        self._file.readline()
+        return self._file.tell()
+
+    def _step(self) -> None:
+        """Insert parsed rows in file order for one frame."""
+        self._after_id = None
+        if self.done:
+            return
+        before = self.rows_inserted
+        deadline = time.monotonic() + _INSERT_BUDGET_MS / 1000
+        try:
+            with self.widget.transaction("load"):
+                while time.monotonic() < deadline and self._next_row_ready():
+                    self._insert(self._rows[self._row_index])
+                    self._row_index += 1
+                self._submit()
+                finished = self._exhausted()
+                if finished:
+                    self._insert_orphans()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._finish(exc)
+            return
+        if self.on_progress is not None and self.rows_inserted != before:
+            self.on_progress(self.rows_inserted, self.progress)
+        if finished:
+            self._finish()
+        else:
+            self._after_id = self.widget.after(_FRAME_MS, self._step)
+
+    def _next_row_ready(self) -> bool:
+        """Return True if a parsed row is ready, taking finished chunks."""
+        while self._row_index >= len(self._rows):
+            self._rows = []
+            self.bytes_loaded = self._chunk_end
+            if not self._in_flight or not self._in_flight[0][0].done():
+                return False  # The next chunk is still being parsed
+            future, self._chunk_end = self._in_flight.popleft()
+            self._rows = future.result()
+            self._row_index = 0
+            self._submit()
+        return True
+
+    def _exhausted(self) -> bool:
+        """Return True once every chunk has been inserted."""
+        if self._in_flight or self._row_index < len(self._rows):
+            return False
+        self._rows = []
+        self.bytes_loaded = self._chunk_end
+        return True
+
+    def _insert(self, row: tuple) -> None:
+        """Insert a row and any rows that were waiting for it."""
+        row_id, parent_id, text, values = row
+        if row_id in self._created:
+            # A path ancestor created earlier; fill in its own data
+            self._created.discard(row_id)
+            self.widget.item(row_id, text=text, values=values)
+            self.rows_inserted += 1
+            return
+        parent = self._resolve_parent(parent_id)
+        if parent is None:
+            self._orphans.setdefault(parent_id, []).append(row)
+            return
+        pending = [(parent, row)]
+        while pending:
+            parent, (row_id, _, text, values) = pending.pop()
+            try:
+                self.widget.insert(
+                    parent, "end", iid=row_id or None, text=text, values=values
+                )
+                self.rows_inserted += 1
+            except TclError:
+                if not row_id or not self.widget.exists(row_id):
+                    raise
+                # Duplicate ID; rows waiting for it go under the existing row
+                self.skipped.append(row_id)
+            if row_id:
+                self._known.add(row_id)
+                waiting = self._orphans.pop(row_id, None)
+                if waiting:
+                    pending.extend((row_id, child) for child in waiting[::-1])
+
+    def _resolve_parent(self, parent_id: str) -> str | None:
+        """Return the item to insert under, or None if it is missing."""
+        if not parent_id:
+            return self.parent
+        if parent_id in self._known:
+            return parent_id
+        if self.widget.exists(parent_id):
+            self._known.add(parent_id)
+            return parent_id
+        if self._spec.path_column is None:
+            return None
+        grandparent_id, _, name = parent_id.rpartition(self._spec.separator)
+        grandparent = self._resolve_parent(grandparent_id)
+        self.widget.insert(grandparent, "end", iid=parent_id, text=name)
+        self._known.add(parent_id)
+        self._created.add(parent_id)
+        return parent_id
+
+    def _insert_orphans(self) -> None:
+        """Insert rows whose parent never appeared under the load parent."""
+        while self._orphans:
+            rows = self._orphans.pop(next(iter(self._orphans)))
+            for row_id, _, text, values in rows:
+                self._insert((row_id, "", text, values))
+
+    def _finish(self, error: Exception | None = None) -> None:
+        """Stop the pipeline and report the result."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        for future, _ in self._in_flight:
+            future.cancel()
+        self._in_flight.clear()
+        self._rows = []
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.done = True
+        self.error = error
+        loaders = getattr(self.widget, "_file_loaders", None)
+        if loaders is not None:
+            loaders.discard(self)
+        if not self.cancelled and self.on_done is not None:
+            self.on_done(self.rows_inserted, error)
+
+
+def _parse_chunk(path: str, start: int, end: int, spec: _ChunkSpec) -> list:
+    """Parse the records in a byte range into insertable rows."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        lines = file.read(end - start).decode(spec.encoding).splitlines()
+    if spec.file_format == "csv":
+        records = (
+            dict(zip(spec.fieldnames, record))
+            for record in csv.reader(lines, delimiter=spec.delimiter)
+            if record
+        )
+    else:
+        records = (json.loads(line) for line in lines if line.strip())
+    return [_make_row(record, spec) for record in records]
+
+
+def _make_row(record: dict, spec: _ChunkSpec) -> tuple:
+    """Return (row ID, parent ID, text, values) of one record."""
+    values = tuple(_field(record, name) for name in spec.value_columns)
+    text = ""
+    if spec.path_column is not None:
+        row_id = str(_field(record, spec.path_column)).strip(spec.separator)
+        parent_id, _, text = row_id.rpartition(spec.separator)
+    else:
+        row_id = str(_field(record, spec.id_column)) if spec.id_column else ""
+        parent_id = ""
+        if spec.parent_column is not None:
+            parent_id = str(_field(record, spec.parent_column))
+    if spec.text_column is not None:
+        text = _field(record, spec.text_column)
+    return (row_id, parent_id, text, values)
+
+
+def _field(record: dict, name: str):
+    """Return a field of a record, with "" for missing or null fields."""
+    value = record.get(name)
+    return "" if value is None else value
@@ -0,0 +1,162 @@
+# python3
+"""Typed column schema for TreeviewEx."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable
+
+__all__ = [
+    "ColumnType",
+    "DECIMAL",
+    "FLOAT",
+    "INT",
+    "date_type",
+    "enum_type",
+]
+
+
+class ColumnType:
+    """Parser and formatter pair converting between cell text and values."""
+
+    def __init__(
+        self,
+        parser: Callable,
+        formatter: Callable = str,
+        name: str = "custom",
+        choices: tuple | None = None,
+    ):
+        """
+        Initialize the column type.
+
+        Parameters
+        ----------
+        parser : Callable
+            Converts cell text to a value. Raises ValueError (or
+            TypeError/ArithmeticError) for invalid text.
+        formatter : Callable, optional
+            Converts a value back to cell text. The default is str.
+        name : str, optional
+            Name of the type. The default is "custom".
+        choices : tuple, optional
+            Allowed texts of an enum type. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.parser = parser
+        self.formatter = formatter
+        self.name = name
+        self.choices = choices
+
+    def __repr__(self) -> str:
+        return f"ColumnType({self.name!r})"
+
+    def parse(self, text: str):
+        """
+        Convert cell text to a value.
+
+        Parameters
+        ----------
+        text : str
+            Cell text.
+
+        Raises
+        ------
+        ValueError
+            If the text is not valid for this type.
+
+        Returns
+        -------
+        Any
+            Parsed value.
+
+        """
+        try:
+            return self.parser(text)
+        except ValueError:
+            raise
+        except (TypeError, ArithmeticError) as exc:
+            raise ValueError(f"Invalid {self.name} value: {text!r}") from exc
+
+    def format(self, value) -> str:
+        """Convert a value to cell text."""
+        return self.formatter(value)
+
+
+def _parse_int(text: str) -> int:
+    """Parse an integer, ignoring surrounding spaces."""
+    return int(str(text).strip())
+
+
+def _parse_float(text: str) -> float:
+    """Parse a float, ignoring surrounding spaces."""
+    return float(str(text).strip())
+
+
+def _parse_decimal(text: str) -> Decimal:
+    """Parse a finite decimal, ignoring surrounding spaces."""
+    value = Decimal(str(text).strip())
+    if not value.is_finite():
+        raise ValueError(f"Invalid decimal value: {text!r}")
+    return value
+
+
+INT = ColumnType(_parse_int, str, "int")
+FLOAT = ColumnType(_parse_float, str, "float")
+DECIMAL = ColumnType(_parse_decimal, str, "decimal")
+
+
+def date_type(fmt: str = "%Y-%m-%d") -> ColumnType:
+    """
+    Return a date column type.
+
+    Parameters
+    ----------
+    fmt : str, optional
+        strptime/strftime format of the cell text. The default is
+        "%Y-%m-%d".
+
+    Returns
+    -------
+    ColumnType
+        Type parsing cell text to datetime.date.
+
+    """
+
+    def parse(text: str) -> date:
+        return datetime.strptime(str(text).strip(), fmt).date()
+
+    def format_(value: date) -> str:
+        return value.strftime(fmt)
+
+    return ColumnType(parse, format_, "date")
+
+
+def enum_type(choices) -> ColumnType:
+    """
+    Return a column type accepting only the given texts.
+
+    Parameters
+    ----------
+    choices : iterable of str
+        Allowed cell texts.
+
+    Returns
+    -------
+    ColumnType
+        Type whose values are the cell texts themselves.
+
+    """
+    choices = tuple(str(choice) for choice in choices)
+    allowed = frozenset(choices)
+
+    def parse(text: str) -> str:
+        if text not in allowed:
+            raise ValueError(f"Value not in {list(choices)}: {text!r}")
+        return text
+
+    return ColumnType(parse, str, "enum", choices)
@@ -0,0 +1,330 @@
+# python3
+"""SQLite-backed paged data source for TreeviewEx."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import NamedTuple
+
+__all__ = ["SourceRow", "SQLiteDataSource"]
+
+_STRUCTURE_COLUMNS = ("id", "parent_id", "position", "text")
+_RULE_COLUMNS = ("readonly", "readonly_columns", "combobox_values")
+
+
+class SourceRow(NamedTuple):
+    """One row read from a data source."""
+
+    row_id: str
+    text: str
+    values: tuple
+    has_children: bool
+    readonly: bool = False  # The whole row is read-only
+    readonly_columns: frozenset = frozenset()  # Read-only column IDs
+    combobox_values: dict | None = None  # Column ID -> combobox values
+
+    @property
+    def has_rules(self) -> bool:
+        """Return True if the row carries readonly or combobox rules."""
+        return bool(
+            self.readonly or self.readonly_columns or self.combobox_values
+        )
+
+
+class SQLiteDataSource:
+    """
+    Page tree rows from a local SQLite table.
+
+    The table needs the columns ``id`` (integer primary key),
+    ``parent_id`` (NULL for top-level rows), ``position`` (0, 1, 2, ...
+    within each parent) and ``text``, plus one column per Treeview value.
+    Optional rule columns are ``readonly`` (integer flag for the row),
+    ``readonly_columns`` (space-separated column IDs such as ``"#1 #3"``)
+    and ``combobox_values`` (JSON object mapping column IDs to lists).
+    """
+
+    def __init__(
+        self,
+        database,
+        table: str = "nodes",
+        value_columns: list | None = None,
+        page_size: int = 200,
+        cache_pages: int = 64,
+        write_batch: int = 500,
+    ):
+        """
+        Initialize the data source.
+
+        Parameters
+        ----------
+        database : str, os.PathLike or sqlite3.Connection
+            Database file or an open connection.
+        table : str, optional
+            Table holding the tree. The default is "nodes".
+        value_columns : list, optional
+            Table columns shown as Treeview values, in order. The default
+            is every column except the structure and rule columns.
+        page_size : int, optional
+            Rows fetched per query. The default is 200.
+        cache_pages : int, optional
+            Pages kept in the LRU page cache. The default is 64.
+        write_batch : int, optional
+            Pending edits that trigger an immediate flush.
+            The default is 500.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(database)
+        self.table = table
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.write_batch = write_batch
+
+        table_columns = [
+            row[1]
+            for row in self.connection.execute(
+                f"PRAGMA table_info({_quote(table)})"
+            )
+        ]
+        if not table_columns:
+            raise ValueError(f"Table not found: {table}")
+        if value_columns is None:
+            value_columns = [
+                name
+                for name in table_columns
+                if name not in _STRUCTURE_COLUMNS + _RULE_COLUMNS
+            ]
+        self.value_columns = list(value_columns)
+        self._rule_columns = [c for c in _RULE_COLUMNS if c in table_columns]
+
+        self._pages = OrderedDict()  # (parent_id, page) -> list of rows
+        self._row_pages = {}  # Row ID -> (page key, index) of cached rows
+        self._counts = {}  # parent_id -> number of children
+        self._pending = {}  # (row_id, column index) -> value
+
+    @staticmethod
+    def create_table(
+        connection: sqlite3.Connection,
+        table: str = "nodes",
+        value_columns: tuple = ("value",),
+    ) -> None:
+        """
+        Create a table (and its index) in the layout this class reads.
+
+        Parameters
+        ----------
+        connection : sqlite3.Connection
+            Open connection.
+        table : str, optional
+            Table name. The default is "nodes".
+        value_columns : tuple, optional
+            Names of the value columns. The default is ("value",).
+
+        Returns
+        -------
+        None.
+
+        """
+        values = "".join(f", {_quote(name)} TEXT" for name in value_columns)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+            "id INTEGER PRIMARY KEY, parent_id INTEGER, "
+            "position INTEGER NOT NULL, text TEXT DEFAULT ''"
+            f"{values}, readonly INTEGER DEFAULT 0, "
+            "readonly_columns TEXT, combobox_values TEXT)"
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(table + '_parent')} "
+            f"ON {_quote(table)} (parent_id, position)"
+        )
+
+    def child_count(self, parent_id: str | None) -> int:
+        """
+        Return the number of children of a row.
+
+        Parameters
+        ----------
+        parent_id : str or None
+            Row ID, or None for the top level.
+
+        Returns
+        -------
+        int
+            Number of children.
+
+        """
+        if parent_id not in self._counts:
+            where, params = self._parent_clause(parent_id)
+            (count,) = self.connection.execute(
+                f"SELECT COUNT(*) FROM {_quote(self.table)} WHERE {where}",
+                params,
+            ).fetchone()
+            self._counts[parent_id] = count
+        return self._counts[parent_id]
+
+    def get_page(self, parent_id: str | None, page: int) -> list:
+        """
+        Return one page of children through the LRU page cache.
+
+        Parameters
+        ----------
+        parent_id : str or None
+            Row ID, or None for the top level.
+        page : int
+            Page index.
+
+        Returns
+        -------
+        list
+            SourceRow objects ordered by position.
+
+        """
+        key = (parent_id, page)
+        rows = self._pages.get(key)
+        if rows is None:
+            rows = self._fetch_page(parent_id, page)
+            self._pages[key] = rows
+            for index, row in enumerate(rows):
+                self._row_pages[row.row_id] = (key, index)
+            while len(self._pages) > self.cache_pages:
+                _, evicted = self._pages.popitem(last=False)
+                for row in evicted:
+                    self._row_pages.pop(row.row_id, None)
+        else:
+            self._pages.move_to_end(key)
+        return rows
+
+    def prefetch(self, parent_id: str | None, page: int) -> None:
+        """Load a page into the cache if it exists and is not cached."""
+        if page * self.page_size < self.child_count(parent_id):
+            self.get_page(parent_id, page)
+
+    def queue_write(self, row_id: str, column_index: int, value) -> bool:
+        """
+        Queue an edited value to be written back.
+
+        Parameters
+        ----------
+        row_id : str
+            Row ID.
+        column_index : int
+            Index into value_columns.
+        value : Any
+            New value.
+
+        Returns
+        -------
+        bool
+            True if enough writes are pending to flush now.
+
+        """
+        self._pending[(row_id, column_index)] = value
+        self._update_cached_value(row_id, column_index, value)
+        return len(self._pending) >= self.write_batch
+
+    @property
+    def pending_writes(self) -> int:
+        """Return the number of edits not yet written."""
+        return len(self._pending)
+
+    def flush(self) -> None:
+        """Write all queued edits in one transaction per value column."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        by_column = {}
+        for (row_id, column_index), value in pending.items():
+            by_column.setdefault(column_index, []).append((value, int(row_id)))
+        with self.connection:
+            for column_index, params in by_column.items():
+                column = _quote(self.value_columns[column_index])
+                self.connection.executemany(
+                    f"UPDATE {_quote(self.table)} SET {column} = ? "
+                    "WHERE id = ?",
+                    params,
+                )
+
+    def close(self) -> None:
+        """Flush pending edits and close the connection."""
+        self.flush()
+        self.connection.close()
+
+    def _parent_clause(self, parent_id: str | None) -> tuple:
+        """Return the WHERE clause and parameters selecting a parent."""
+        if parent_id is None:
+            return "parent_id IS NULL", ()
+        return "parent_id = ?", (int(parent_id),)
+
+    def _fetch_page(self, parent_id: str | None, page: int) -> list:
+        """Read one page of children from the database."""
+        where, params = self._parent_clause(parent_id)
+        table = _quote(self.table)
+        columns = ", ".join(
+            _quote(name) for name in self.value_columns + self._rule_columns
+        )
+        start = page * self.page_size
+        cursor = self.connection.execute(
+            f"SELECT n.id, n.text, {columns}, EXISTS("
+            f"SELECT 1 FROM {table} c WHERE c.parent_id = n.id) "
+            f"FROM {table} n WHERE {where} "
+            "AND position >= ? AND position < ? ORDER BY position",
+            params + (start, start + self.page_size),
+        )
+        count = len(self.value_columns)
+        rows = [self._make_row(record, count) for record in cursor]
+        if self._pending:
+            # Edits not yet written must survive the page being evicted
+            rows = [self._with_pending(row) for row in rows]
+        return rows
+
+    def _make_row(self, record: tuple, count: int) -> SourceRow:
+        """Build a SourceRow from a query result."""
+        values = tuple("" if v is None else v for v in record[2 : 2 + count])
+        rules = dict(zip(self._rule_columns, record[2 + count : -1]))
+        combobox = rules.get("combobox_values")
+        return SourceRow(
+            row_id=str(record[0]),
+            text=record[1] or "",
+            values=values,
+            has_children=bool(record[-1]),
+            readonly=bool(rules.get("readonly")),
+            readonly_columns=frozenset(
+                (rules.get("readonly_columns") or "").split()
+            ),
+            combobox_values=json.loads(combobox) if combobox else None,
+        )
+
+    def _with_pending(self, row: SourceRow) -> SourceRow:
+        """Return a row with its queued edits applied."""
+        values = list(row.values)
+        changed = False
+        for index in range(len(values)):
+            key = (row.row_id, index)
+            if key in self._pending:
+                values[index] = self._pending[key]
+                changed = True
+        return row._replace(values=tuple(values)) if changed else row
+
+    def _update_cached_value(self, row_id, column_index, value) -> None:
+        """Keep cached pages consistent with a queued edit."""
+        location = self._row_pages.get(row_id)
+        if location is None:
+            return
+        key, index = location
+        rows = self._pages[key]
+        values = list(rows[index].values)
+        values[column_index] = value
+        rows[index] = rows[index]._replace(values=tuple(values))
+
+
+def _quote(name: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + name.replace('"', '""') + '"'
@@ -3,10 +3,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import inspect
+import random
+import time
+import weakref
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 from enum import Enum, auto
-from tkinter import HORIZONTAL, VERTICAL, Entry, Event, Frame, Menu
+from functools import partial
+from itertools import accumulate, islice
+from tkinter import HORIZONTAL, VERTICAL, Entry, Event, Frame, Menu, TclError
 from tkinter.ttk import Combobox, Scrollbar, Treeview
-from typing import Callable, Union
+from typing import Any, Callable, NamedTuple, Union
+
+from .asyncio_bridge import AsyncioBridge
+from .ingest import FileLoader
+from .validation import ValidationRunner, validate_each, validate_each_async
 
 
 class CellType(Enum):
@@ -17,7 +31,66 @@ class CellType(Enum):
     COMBOBOX = auto()
 
 
-__all__ = ["CellType", "TreeviewEx"]
+class Change(NamedTuple):
+    """One change in a change set delivered to subscribers."""
+
+    kind: str  # "cell", "insert", "delete", "move", "readonly", "combobox"
+    row: str | None  # Row ID, or None for column rules
+    column: str | None  # Column ID ("#n"), or None for whole rows
+    old: Any  # Previous value, values, (parent, index) or rule state
+    new: Any  # New value, values, (parent, index) or rule state
+    source: str  # "edit", "paste", "api", or a transaction's source
+
+
+__all__ = ["CellType", "Change", "TreeviewEx"]
+
+_FRAME_MS = 16  # Interval used to coalesce scroll work into one move
+_WHEEL_DELTA = 120  # event.delta of one wheel notch on Windows and X11
+_SHIFT_MASK = 0x0001  # event.state bit for the Shift modifier
+_KINETIC_FRICTION = 0.85  # Velocity kept per frame by kinetic scrolling
+_KINETIC_MIN_VELOCITY = 0.5  # Kinetic scrolling stops below this speed
+_XSCROLL_UNIT = 20  # Pixels per "unit" of virtualized horizontal scrolling
+_AUTOFIT_PADDING = 16  # Pixels added to the widest measured text
+_AUTOFIT_CANDIDATES = 32  # Longest strings per column that are measured
+_AUTOFIT_BUDGET_MS = 8  # Longest time one auto-fit slice blocks the UI
+_AUTOFIT_READ_BATCH = 64  # Rows read between time budget checks
+_SEPARATOR_SLOP = 4  # Pixels left of a heading separator to find its column
+_TREE_INDENT = 20  # Default indent per level of the "#0" column
+_PLACEHOLDER_SUFFIX = "::placeholder"  # Child ID marking unloaded children
+_SOURCE_FLUSH_MS = 500  # Delay before queued data source edits are written
+_SOURCE_ROW_HEIGHT = 20  # Smallest row height assumed to size the window
+_VALIDATION_BATCH = 200  # Pasted cells checked per validation job
+_PENDING_TAG = "pending"  # Row tag shown while edits await validation
+_STREAM_BUDGET_MS = 8  # Longest time insert_stream inserts in one frame
+_SELECTION_MODES = ("set", "add", "remove", "toggle")  # Tk selection ops
+_DRAG_THRESHOLD = 4  # Pointer movement in pixels that starts a drag
+_DRAG_SCROLL_MARGIN = 20  # Edge zone in pixels that scrolls while dragging
+_DRAG_SCROLL_MS = 50  # Interval of autoscroll steps while dragging
+_DROP_TAG = "drop_target"  # Row tag of the row receiving dropped children
+_DROP_COLOR = "#3c78d8"  # Color of the drop indicator and target row
+_MODIFIER_MASK = 0x0005  # Shift and Control bits of Event.state
+_STYLE_BATCH = 1000  # Rows whose style tags are recomputed per frame
+_READONLY_TAG = "readonly"  # Row tag of read-only rows with a style
+_READONLY_COLOR = "#eeeeee"  # Default background of read-only rows
+_ENTRY_EVENTS = (
+    ("<Return>", "_on_return"),
+    ("<FocusOut>", "_on_focus_out"),
+    ("<Escape>", "_on_escape"),
+)
+_COMBOBOX_EVENTS = (
+    ("<Return>", "_on_return"),
+    ("<Escape>", "_on_escape"),
+    ("<<ComboboxSelected>>", "_on_combobox_selected"),
+)
+# Scrolling over an editor scrolls the tree instead
+_EDITOR_WHEEL_EVENTS = (
+    ("<MouseWheel>", "_on_mouse_wheel"),
+    ("<Shift-MouseWheel>", "_on_shift_mouse_wheel"),
+    ("<Button-4>", "_on_mouse_wheel"),
+    ("<Button-5>", "_on_mouse_wheel"),
+    ("<Shift-Button-4>", "_on_shift_mouse_wheel"),
+    ("<Shift-Button-5>", "_on_shift_mouse_wheel"),
+)
 
 
 def _colid2colindex(column_id: str) -> int:
@@ -38,17 +111,351 @@ def _colid2colindex(column_id: str) -> int:
     return int(column_id[1:]) - 1
 
 
+class _TextMeasureCache:
+    """Cache of text widths keyed by (font, text)."""
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Entries kept before the oldest ones are dropped.
+            The default is 100_000.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.max_entries = max_entries
+        self._widths = {}
+
+    @staticmethod
+    def font_key(widget, font: str) -> tuple:
+        """
+        Return the actual configuration of a font.
+
+        Named fonts can be reconfigured, so measurements are cached by
+        the configuration rather than by the name. Tk also accepts the
+        returned description as a font.
+        """
+        actual = widget.tk.call("font", "actual", font)
+        return tuple(str(value) for value in widget.tk.splitlist(actual))
+
+    def measure(self, widget, font, text: str) -> int:
+        """Return the width of ``text`` in ``font``, measuring it once."""
+        key = (font, text)
+        width = self._widths.get(key)
+        if width is None:
+            width = widget.tk.getint(
+                widget.tk.call("font", "measure", font, text)
+            )
+            if len(self._widths) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest
+                del self._widths[next(iter(self._widths))]
+            self._widths[key] = width
+        return width
+
+    def clear(self) -> None:
+        """Drop all cached widths."""
+        self._widths.clear()
+
+
+_MEASURE_CACHE = _TextMeasureCache()
+_EDITOR_POOLS = weakref.WeakKeyDictionary()  # Toplevel -> _EditorPool
+
+
+def _create_editor(widget_class, master, events: tuple, handler: Callable):
+    """Create an editor widget and bind its events to handler(name)."""
+    editor = widget_class(master)
+    for sequence, name in events + _EDITOR_WHEEL_EVENTS:
+        editor.bind(sequence, handler(name))
+    return editor
+
+
+def _create_context_menu(master, handler: Callable) -> Menu:
+    """Create the standard popup menu calling handler(name) commands."""
+    menu = Menu(master, tearoff=0)
+
+    menu.add_command(
+        label="Expand this node",
+        command=handler("_expand_current_node"),
+    )
+    menu.add_command(
+        label="Collapse this node",
+        command=handler("_collapse_current_node"),
+    )
+    menu.add_separator()
+    menu.add_command(
+        label="Expand all children recursively",
+        command=handler("_expand_all_children"),
+    )
+    menu.add_command(
+        label="Collapse all children recursively",
+        command=handler("_collapse_all_children"),
+    )
+    return menu
+
+
+class _EditorPool:
+    """Editors and context menu shared by the trees of one toplevel."""
+
+    def __init__(self, toplevel):
+        """
+        Initialize the pool.
+
+        Parameters
+        ----------
+        toplevel : widget
+            Toplevel window that becomes the master of the widgets.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.toplevel = toplevel
+        self.owner = None  # Tree whose edit uses the editors
+        self.menu_owner = None  # Tree that last showed the menu
+        self._entry = None
+        self._combobox = None
+        self._context_menu = None
+
+    @classmethod
+    def for_widget(cls, widget) -> _EditorPool:
+        """Return the pool of a widget's toplevel, creating one."""
+        toplevel = widget.winfo_toplevel()
+        pool = _EDITOR_POOLS.get(toplevel)
+        if pool is None:
+            pool = _EDITOR_POOLS[toplevel] = cls(toplevel)
+            # The pool and its widgets keep the toplevel key alive
+            toplevel.bind("<Destroy>", pool._on_destroy, add="+")
+        return pool
+
+    @property
+    def entry(self) -> Entry:
+        """Return the shared Entry, creating it on first use."""
+        if self._entry is None:
+            self._entry = _create_editor(
+                Entry, self.toplevel, _ENTRY_EVENTS, self._editor_handler
+            )
+        return self._entry
+
+    @property
+    def combobox(self) -> Combobox:
+        """Return the shared Combobox, creating it on first use."""
+        if self._combobox is None:
+            self._combobox = _create_editor(
+                Combobox, self.toplevel, _COMBOBOX_EVENTS, self._editor_handler
+            )
+        return self._combobox
+
+    @property
+    def context_menu(self) -> Menu:
+        """Return the shared context menu, creating it on first use."""
+        if self._context_menu is None:
+            self._context_menu = _create_context_menu(
+                self.toplevel, self._menu_handler
+            )
+        return self._context_menu
+
+    def acquire(self, tree) -> None:
+        """Hand the editors to a tree, ending the edit of the previous one."""
+        # pylint: disable=protected-access
+        owner = self.owner
+        if owner is not None and owner is not tree and owner._editing_cell:
+            # Moving a shared editor does not fire <FocusOut>
+            owner._end_edit()
+        self.owner = tree
+
+    def release(self, tree) -> None:
+        """Forget a tree that is being destroyed."""
+        if self.owner is tree:
+            self.owner = None
+        if self.menu_owner is tree:
+            self.menu_owner = None
+
+    def _on_destroy(self, event) -> None:
+        """Drop the pool when its toplevel is destroyed."""
+        # The binding of a toplevel also fires for its descendants
+        if str(event.widget) == str(self.toplevel):
+            _EDITOR_POOLS.pop(self.toplevel, None)
+            self.owner = None
+            self.menu_owner = None
+
+    def _editor_handler(self, name: str) -> Callable:
+        """Return an event handler forwarding to the editing tree."""
+
+        def handle(event):
+            if self.owner is None:
+                return None
+            return getattr(self.owner, name)(event)
+
+        return handle
+
+    def _menu_handler(self, name: str) -> Callable:
+        """Return a menu command forwarding to the tree of the popup."""
+
+        def command():
+            if self.menu_owner is not None:
+                getattr(self.menu_owner, name)()
+
+        return command
+
+
+class _ScrollCoalescer:
+    """Accumulate scroll requests for one axis and apply them per frame."""
+
+    def __init__(
+        self,
+        widget,
+        view: Callable,
+        kinetic: bool = False,
+        on_flush: Callable | None = None,
+    ):
+        """
+        Initialize the coalescer.
+
+        Parameters
+        ----------
+        widget : widget
+            Widget used to schedule the frame callback.
+        view : Callable
+            Scroll function of the axis, e.g. Treeview.yview.
+        kinetic : bool, optional
+            Keep scrolling with decaying speed after wheel input stops.
+            The default is False.
+        on_flush : Callable, optional
+            Called without arguments after a flush moved the view.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.widget = widget
+        self.view = view
+        self.kinetic = kinetic
+        self.on_flush = on_flush
+        self.units = 0.0  # Pending (possibly fractional) units
+        self.pages = 0  # Pending pages
+        self.moveto = None  # Latest pending "moveto" fraction
+        self.velocity = 0.0  # Units per frame for kinetic scrolling
+        self._has_input = False  # Wheel input arrived in this frame
+        self._after_id = None
+
+    def scroll_units(self, units: float) -> None:
+        """Queue a wheel scroll of ``units`` (may be fractional)."""
+        self.units += units
+        self._has_input = True
+        self._schedule()
+
+    def command(self, *args) -> None:
+        """Queue a scrollbar command ("moveto" or "scroll")."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            # Only the last position matters; drop older relative moves
+            self.moveto = float(args[1])
+            self.units = 0.0
+            self.pages = 0
+            self.velocity = 0.0
+        elif args[0] == "scroll" and str(args[2]).startswith("page"):
+            self.pages += int(args[1])
+        elif args[0] == "scroll":
+            self.units += int(args[1])
+        else:  # pragma: no cover
+            self.view(*args)  # pragma: no cover
+            return  # pragma: no cover
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Schedule a flush on the next frame unless one is pending."""
+        if self._after_id is None:
+            self._after_id = self.widget.after(_FRAME_MS, self.flush)
+
+    def flush(self) -> None:
+        """Apply the accumulated scroll with as few view calls as possible."""
+        self._after_id = None
+        moved = False
+        if self.moveto is not None:
+            self.view("moveto", self.moveto)
+            self.moveto = None
+            moved = True
+        if self.pages:
+            self.view("scroll", self.pages, "pages")
+            self.pages = 0
+            moved = True
+
+        if self.kinetic and not self._has_input and self.velocity:
+            # Coast with decaying speed after the wheel input stopped
+            self.velocity *= _KINETIC_FRICTION
+            if abs(self.velocity) < _KINETIC_MIN_VELOCITY:
+                self.velocity = 0.0
+            self.units += self.velocity
+
+        whole = int(self.units)
+        if whole:
+            self.view("scroll", whole, "units")
+            self.units -= whole
+            moved = True
+            if self.kinetic and self._has_input:
+                self.velocity = float(whole)
+        self._has_input = False
+
+        if self.velocity:
+            self._schedule()
+        if moved and self.on_flush is not None:
+            self.on_flush()
+
+    def cancel(self) -> None:
+        """Drop pending scroll requests and the scheduled flush."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self.units = 0.0
+        self.pages = 0
+        self.moveto = None
+        self.velocity = 0.0
+
+
+async def _as_async_iter(rows):
+    """Iterate over an async or plain iterable asynchronously."""
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
 class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
     """Extended Treeview widget."""
 
-    def __init__(self, master=None, **kwargs):
+    def __init__(
+        self,
+        master=None,
+        kinetic_scroll: bool = False,
+        shared_editors: bool = False,
+        **kwargs,
+    ):
         """
         Initialize the widget.
 
+        The editors and the context menu are created on first use.
+
         Parameters
         ----------
         master : widget, optional
             Parent widget. The default is None.
+        kinetic_scroll : bool, optional
+            Keep scrolling with decaying speed after a mouse wheel or
+            trackpad burst ends. The default is False.
+        shared_editors : bool, optional
+            Use one Entry, Combobox and context menu for all trees of the
+            toplevel that set this option. The default is False.
         **kwargs : dict
             Additional options passed to tkinter.ttk.Treeview.
 
@@ -67,34 +474,106 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         self.combobox_row_values = {}  # Map row IDs to combobox value lists
         self.combobox_column_values = {}  # Map columns to combobox value lists
         self.combobox_cell_values = {}  # Map cells to combobox value lists
+        self.column_types = {}  # Map column IDs to ColumnType objects
+        self.last_change_set = ()  # Change set of the last notification
+        self._change_listeners = []  # Callables receiving change sets
+        self._change_event_bound = False  # <<CellsChanged>> is bound
+        self._changes = []  # Changes waiting to be delivered
+        self._change_sources = []  # Sources of the open transactions
+        self._changes_after_id = None
+        self._typed_cache = {}  # Row ID -> {column ID: parsed value}
+        self._parent_ids = set()  # Items that may have children
+        self._selected = frozenset()  # Python-side copy of the selection
+        self._selection_dirty = False  # Re-read the selection when queried
+        self._own_select_events = 0  # <<TreeviewSelect>> caused here
+        self._style_rules = {}  # Style tag -> predicate over row values
+        self._readonly_style = False  # Read-only rows get the readonly tag
+        self._row_styles = {}  # Row ID -> style tags applied to the row
+        self._style_dirty = {}  # Rows to restyle, in insertion order
+        self._style_after_id = None
+        self._file_loaders = set()  # Running FileLoader objects
+
+        # Column virtualization state
+        self._column_window = None  # Displayed (first, last) column indexes
+        self._column_overscan = 2  # Extra columns displayed on each side
+        self._column_offsets = None  # Cached logical column start positions
+        self._tree_column_width = 0  # Cached width of the "#0" column
+        self._logical_x = 0  # Horizontal offset over all logical columns
+        self._viewport_width = None  # Widget width from <Configure>
+
+        # Auto-fit state
+        self.autofit_on_heading_double_click = True
+        self._autofit_widths = {}  # Column ID -> width set by auto-fit
+        self._autofit_fonts = None  # Cached (cell font, heading font) names
+        self._autofit_job = None  # Running time-sliced auto-fit generator
+        self._autofit_after_id = None
+        self._column_window_after_id = None
+
+        # Data source state
+        self._data_source = None  # Paged source of rows, loaded on demand
+        self._source_items = {}  # Inserted row ID -> (parent, position)
+        self._source_open = {}  # Opened row ID -> (parent, position)
+        self._source_sizes = {}  # Row ID -> displayed rows below it
+        self._source_rules = {}  # Row ID -> SourceRow with cell rules
+        self._source_top = 0  # Source row at the top of the view
+        self._source_window = None  # (start, stop, ancestor rows) inserted
+        self._source_direction = 1  # Last scrolling direction, 1 or -1
+        self._open_bound = False  # <<TreeviewOpen>> handler installed
+        self._source_after_id = None
+        self._source_prefetch_after_id = None
+        self._source_flush_after_id = None
+        self._viewport_height = None  # Widget height from <Configure>
+
+        # Drag-and-drop state
+        self._drag_enabled = False
+        self._drag_reparent = True  # Rows may be dropped onto other rows
+        self._drop_validator = None
+        self._drag_bound = False  # Drag handlers installed
+        self._drag_press = None  # (row, x, y, selection kept) of a press
+        self._drag_items = None  # Dragged rows in display order
+        self._drag_set = frozenset()
+        self._drag_y = 0  # Latest pointer y during a drag
+        self._drop_row = ""  # Row highlighted as the drop parent
+        self._drop_indicator = None  # Line between rows, created on demand
+        self._drag_after_id = None
+
+        # Edit validation state
+        self._validator = None  # Callable(cell_id_pair, value) -> bool
+        self._batch_validator = None  # Callable(items) -> list of bool
+        self._validation_runner = None
+        self._validation_jobs = {}  # Token -> [cells, single, left, call]
+        self._pending_cells = {}  # Cell -> (token, old, new, typed, source)
+        self._pending_rows = {}  # Row ID -> number of pending cells
+        self._validation_after_id = None
+
+        # Asyncio state
+        self._children_provider = None  # Callable(item_id) -> rows
+        self._children_tasks = {}  # Item ID -> task loading its children
+        self.combobox_column_providers = {}  # Column ID -> values provider
+        self._combobox_task = None  # Task filling the active combobox
 
         # Other initialization
         self.frame = Frame(master=master)
         super().__init__(self.frame, **kwargs)
 
-        # Create the Entry widget as a member
-        self.entry = Entry(self)
-        self.entry.bind("<Return>", self._on_return)
-        self.entry.bind("<FocusOut>", self._on_focus_out)
-        self.entry.bind("<Escape>", self._on_escape)
-
-        # Create the Combobox widget as a member
-        self.combobox = Combobox(self)
-        self.combobox.bind("<Return>", self._on_return)
-        self.combobox.bind("<Escape>", self._on_escape)
-        self.combobox.bind("<<ComboboxSelected>>", self._on_combobox_selected)
+        # Editors and the context menu are created on first use
+        self._entry = None
+        self._combobox = None
+        self._context_menu = None
+        self._shared_editors = shared_editors
+        self._editor_pool = None  # Looked up when first needed
 
         # Create a vertical scrollbar and connect it
         self.scrollbar_y = Scrollbar(
             self.frame, orient=VERTICAL, command=self._on_scroll_y
         )
-        self.configure(yscrollcommand=self.scrollbar_y.set)
+        self.configure(yscrollcommand=self._on_treeview_yscroll)
 
         # Create a horizontal scrollbar and connect it
         self.scrollbar_x = Scrollbar(
             self.frame, orient=HORIZONTAL, command=self._on_scroll_x
         )
-        self.configure(xscrollcommand=self.scrollbar_x.set)
+        self.configure(xscrollcommand=self._on_treeview_xscroll)
 
         super().grid(row=0, column=0, sticky="nsew")
         self.scrollbar_y.grid(row=0, column=1, sticky="ns")
@@ -107,16 +586,44 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         # Bind additional behavior for the <Double-1> event
         self._additional_bind_double_click()
 
-        # Bind the mouse wheel event
+        # Scroll requests are applied once per frame
+        self._scroll_y = _ScrollCoalescer(
+            self, self.yview, kinetic_scroll, self._schedule_editor_reposition
+        )
+        self._scroll_x = _ScrollCoalescer(
+            self, self.xview, kinetic_scroll, self._schedule_editor_reposition
+        )
+        self._windowing_system = self.tk.call("tk", "windowingsystem")
+
+        # Bind the mouse wheel events (X11 reports the wheel as buttons 4/5)
         self.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.bind("<Shift-MouseWheel>", self._on_shift_mouse_wheel)
+        self.bind("<Button-4>", self._on_mouse_wheel)
+        self.bind("<Button-5>", self._on_mouse_wheel)
+        self.bind("<Shift-Button-4>", self._on_shift_mouse_wheel)
+        self.bind("<Shift-Button-5>", self._on_shift_mouse_wheel)
         super().bind("<Button-3>", self._on_right_click, add="+")
+        super().bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+        # Keep the editor on its cell when the layout changes
+        super().bind("<ButtonRelease-1>", self._on_button_release, add="+")
+        for sequence in (
+            "<Configure>",
+            "<<TreeviewOpen>>",
+            "<<TreeviewClose>>",
+        ):
+            super().bind(sequence, self._on_layout_change, add="+")
 
         self._context_menu_target_item = ""
-        self.context_menu = self._create_context_menu()
 
         # Variables to keep editing state
         self._editing_cell = None
         self._editing_combobox_values = None  # Values for active combobox edit
+        self._editing_widget = None  # Entry or Combobox of the active edit
+        self._editor_geometry = None  # Last placed (x, y, width, height)
+        self._editor_hidden = False  # Editor hidden while cell is off-screen
+        self._editor_after_id = None
+        self._editor_last_reposition = 0.0
 
     def _on_scroll_y(self, *args):
         """
@@ -132,9 +639,7 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         None.
 
         """
-        if self._editing_cell:
-            self.cancel_edit()
-        self.yview(*args)
+        self._scroll_y.command(*args)
 
     def _on_scroll_x(self, *args):
         """
@@ -150,9 +655,7 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         None.
 
         """
-        if self._editing_cell:
-            self.cancel_edit()
-        self.xview(*args)
+        self._scroll_x.command(*args)
 
     def _on_mouse_wheel(self, event):
         """
@@ -163,16 +666,530 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         event : Event
             Mouse wheel event.
 
+        Returns
+        -------
+        str
+            "break" to stop the class binding from scrolling again.
+
+        """
+        # Queue vertical scrolling; Shift+wheel scrolls horizontally
+        if isinstance(event.state, int) and event.state & _SHIFT_MASK:
+            self._scroll_x.scroll_units(self._wheel_units(event))
+        else:
+            self._scroll_y.scroll_units(self._wheel_units(event))
+        return "break"
+
+    def _on_shift_mouse_wheel(self, event):
+        """
+        Handle Shift + mouse wheel events.
+
+        Parameters
+        ----------
+        event : Event
+            Mouse wheel event.
+
+        Returns
+        -------
+        str
+            "break" to stop the class binding from scrolling again.
+
+        """
+        # Queue horizontal scrolling
+        self._scroll_x.scroll_units(self._wheel_units(event))
+        return "break"
+
+    def _wheel_units(self, event) -> float:
+        """
+        Convert a wheel event to scroll units.
+
+        Parameters
+        ----------
+        event : Event
+            <MouseWheel> or <Button-4>/<Button-5> event.
+
+        Returns
+        -------
+        float
+            Units to scroll; fractional for high-resolution wheels.
+
+        """
+        if event.num == 4:
+            return -1.0
+        if event.num == 5:
+            return 1.0
+        if self._windowing_system == "aqua":
+            # macOS reports one unit per delta step
+            return -float(event.delta)
+        return -event.delta / _WHEEL_DELTA
+
+    @property
+    def entry(self) -> Entry:
+        """Entry used to edit cells, created on first use."""
+        if self._entry is None:
+            if self._shared_editors:
+                self._entry = self._shared_pool().entry
+            else:
+                self._entry = _create_editor(
+                    Entry, self, _ENTRY_EVENTS, partial(getattr, self)
+                )
+        return self._entry
+
+    @entry.setter
+    def entry(self, widget) -> None:
+        self._entry = widget
+
+    @property
+    def combobox(self) -> Combobox:
+        """Combobox used to edit combobox cells, created on first use."""
+        if self._combobox is None:
+            if self._shared_editors:
+                self._combobox = self._shared_pool().combobox
+            else:
+                self._combobox = _create_editor(
+                    Combobox, self, _COMBOBOX_EVENTS, partial(getattr, self)
+                )
+        return self._combobox
+
+    @combobox.setter
+    def combobox(self, widget) -> None:
+        self._combobox = widget
+
+    @property
+    def context_menu(self) -> Menu:
+        """Popup menu of expandable rows, created on first use."""
+        if self._context_menu is None:
+            if self._shared_editors:
+                self._context_menu = self._shared_pool().context_menu
+            else:
+                self._context_menu = _create_context_menu(
+                    self, partial(getattr, self)
+                )
+        return self._context_menu
+
+    @context_menu.setter
+    def context_menu(self, menu) -> None:
+        self._context_menu = menu
+
+    def _shared_pool(self) -> _EditorPool:
+        """Return the editor pool of the toplevel, looking it up once."""
+        if self._editor_pool is None:
+            self._editor_pool = _EditorPool.for_widget(self)
+        return self._editor_pool
+
+    def _place_editor(self, widget, bbox) -> None:
+        """Place an editor widget over a cell."""
+        x, y, width, height = bbox
+        if self._editor_pool is None:
+            widget.place(x=x, y=y, width=width, height=height)
+        else:
+            # Shared editors are children of the toplevel
+            widget.place(in_=self, x=x, y=y, width=width, height=height)
+
+    def _on_layout_change(self, event):
+        """Handle layout events that may move the edited cell."""
+        if isinstance(getattr(event, "width", None), int) and event.width > 1:
+            self._viewport_width = event.width
+        if isinstance(getattr(event, "height", None), int) and event.height > 1:
+            self._viewport_height = event.height
+        if self._column_window is not None:
+            self._schedule_column_window()
+        if self._data_source is not None and self._source_after_id is None:
+            self._source_after_id = self.after_idle(self._check_source_pages)
+        self._schedule_editor_reposition()
+
+    def _on_button_release(self, event: Event) -> None:
+        """Handle the end of clicks and heading separator drags."""
+        if (
+            self._column_window is not None
+            and self.identify_region(event.x, event.y) == "separator"
+        ):
+            # A column was resized by dragging its heading separator
+            self._column_offsets = None
+            self._schedule_column_window()
+        self._schedule_editor_reposition()
+
+    def _schedule_editor_reposition(self) -> None:
+        """
+        Schedule moving the editor to its cell, at most once per frame.
+
         Returns
         -------
         None.
 
         """
-        if self._editing_cell:
-            self.cancel_edit()
+        if not self._editing_cell or self._editor_after_id is not None:
+            return
+        elapsed_ms = (time.monotonic() - self._editor_last_reposition) * 1000
+        if elapsed_ms >= _FRAME_MS:
+            self._editor_after_id = self.after_idle(self._reposition_editor)
+        else:
+            self._editor_after_id = self.after(
+                int(_FRAME_MS - elapsed_ms) + 1, self._reposition_editor
+            )
+
+    def _reposition_editor(self) -> None:
+        """
+        Move the active editor to its cell with a single bbox query.
+
+        The editor is hidden, not cancelled, while the cell is scrolled
+        out of view, and shown again when it comes back.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._editor_after_id = None
+        self._editor_last_reposition = time.monotonic()
+        if not self._editing_cell or self._editing_widget is None:
+            return
+
+        try:
+            bbox = self._cell_bbox(self._editing_cell)
+        except TclError:  # The edited row was deleted
+            bbox = ""
+        widget = self._editing_widget
+        if not bbox:
+            if not self._editor_hidden:
+                self._editor_hidden = True
+                self._editor_geometry = None
+                widget.place_forget()
+            return
+
+        geometry = tuple(bbox)
+        if geometry != self._editor_geometry:
+            self._place_editor(widget, geometry)
+            self._editor_geometry = geometry
+        if self._editor_hidden:
+            self._editor_hidden = False
+            widget.focus_set()
+
+    def destroy(self):
+        """
+        Override destroy.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._scroll_y.cancel()
+        self._scroll_x.cancel()
+        if self._data_source is not None:
+            self._data_source.flush()
+        for after_id in (
+            self._editor_after_id,
+            self._column_window_after_id,
+            self._autofit_after_id,
+            self._source_after_id,
+            self._source_prefetch_after_id,
+            self._source_flush_after_id,
+            self._validation_after_id,
+            self._changes_after_id,
+            self._drag_after_id,
+            self._style_after_id,
+        ):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        if self._validation_runner is not None:
+            self._validation_runner.shutdown()
+        for task in list(self._children_tasks.values()):
+            task.cancel()
+        if self._editor_pool is not None:
+            if self._editor_pool.owner is self:
+                self.cancel_edit()  # Hide the shared editor
+            self._editor_pool.release(self)
+        if self._combobox_task is not None:
+            self._combobox_task.cancel()
+        for loader in list(self._file_loaders):
+            loader.cancel()
+        self._editor_after_id = None
+        self._column_window_after_id = None
+        self._autofit_after_id = None
+        self._autofit_job = None
+        self._source_after_id = None
+        self._source_prefetch_after_id = None
+        self._source_flush_after_id = None
+        self._validation_after_id = None
+        self._changes_after_id = None
+        self._drag_after_id = None
+        self._style_after_id = None
+        super().destroy()
+
+    def configure(self, cnf=None, **kw):
+        """
+        Override configure.
+
+        Parameters
+        ----------
+        cnf : dict or str, optional
+            Same as the cnf argument of Treeview.configure().
+        **kw : dict
+            Same as the keyword arguments of Treeview.configure().
+
+        Returns
+        -------
+        Any
+            Return value from Treeview.configure().
+
+        """
+        result = super().configure(cnf, **kw)
+        options = dict(cnf, **kw) if isinstance(cnf, dict) else kw
+        if "columns" in options or "show" in options:
+            self._column_offsets = None
+            if self._column_window is not None:
+                self._schedule_column_window()
+        return result
+
+    config = configure
+
+    def set_column_virtualization(
+        self, enabled: bool = True, overscan: int = 2
+    ) -> None:
+        """
+        Display only the columns inside the horizontal viewport.
+
+        While enabled, displaycolumns is driven by the widget and the
+        horizontal scrollbar covers all logical columns. Column IDs in
+        the public methods always refer to logical columns.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            True to enable, False to display all columns again.
+            The default is True.
+        overscan : int, optional
+            Extra columns displayed on each side of the viewport.
+            The default is 2.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._column_overscan = max(0, overscan)
+        self._column_offsets = None
+        if enabled:
+            if self._column_window is None:
+                self._logical_x = 0
+                self._column_window = (0, -1)
+            self._update_column_window()
+        elif self._column_window is not None:
+            self._column_window = None
+            super().configure(displaycolumns="#all")
+            super().xview("moveto", 0)
+        self._schedule_editor_reposition()
+
+    def xview(self, *args):
+        """
+        Override xview.
+
+        Parameters
+        ----------
+        *args : tuple
+            Same as the arguments of Treeview.xview().
+
+        Returns
+        -------
+        Any
+            Return value from Treeview.xview(); logical fractions of the
+            full column range when column virtualization is enabled.
+
+        """
+        if self._column_window is None:
+            return super().xview(*args)
+
+        total, viewport = self._logical_extent()
+        if not args:
+            return self._logical_fractions(total, viewport)
+        if args[0] == "moveto":
+            self._logical_x = int(float(args[1]) * total)
+        elif args[0] == "scroll" and str(args[2]).startswith("page"):
+            self._logical_x += int(args[1]) * viewport
+        elif args[0] == "scroll":
+            self._logical_x += int(args[1]) * _XSCROLL_UNIT
+        self._update_column_window()
+        return None
+
+    def yview(self, *args):
+        """
+        Override yview.
+
+        Parameters
+        ----------
+        *args : tuple
+            Same as the arguments of Treeview.yview().
+
+        Returns
+        -------
+        Any
+            Return value from Treeview.yview(); fractions of all rows of
+            the data source when one is set.
+
+        """
+        if self._data_source is None or self._source_window is None:
+            return super().yview(*args)
+
+        total = max(1, self._source_size())
+        view = self._source_view_rows()
+        if not args:
+            return (
+                self._source_top / total,
+                min(1.0, (self._source_top + view) / total),
+            )
+        top = self._source_top
+        if args[0] == "moveto":
+            top = int(float(args[1]) * total + 0.5)
+        elif args[0] == "scroll" and str(args[2]).startswith("page"):
+            top += int(args[1]) * view
+        elif args[0] == "scroll":
+            top += int(args[1])
+        if top != self._source_top:
+            self._source_direction = 1 if top > self._source_top else -1
+        self._source_top = top
+        self._update_source_window()
+        start, _, ancestors = self._source_window
+        return super().yview(
+            "moveto",
+            (ancestors + self._source_top - start)
+            / max(1, len(self._source_items)),
+        )
+
+    def _on_treeview_xscroll(self, first, last) -> None:
+        """Forward the Treeview horizontal position to the scrollbar."""
+        # With column virtualization the scrollbar shows logical fractions
+        if self._column_window is None:
+            self.scrollbar_x.set(first, last)
+
+    def _schedule_column_window(self) -> None:
+        """Schedule a column window update on the next idle time."""
+        if self._column_window_after_id is None:
+            self._column_window_after_id = self.after_idle(
+                self._update_column_window
+            )
+
+    def _column_layout(self) -> list:
+        """Return the cached start position of every logical column."""
+        if self._column_offsets is None:
+            columns = super().cget("columns")
+            widths = [
+                int(super(TreeviewEx, self).column(index, "width"))
+                for index in range(len(self.tk.splitlist(columns)))
+            ]
+            show = self.tk.splitlist(super().cget("show"))
+            self._tree_column_width = (
+                int(super().column("#0", "width")) if "tree" in show else 0
+            )
+            self._column_offsets = list(
+                accumulate(widths, initial=self._tree_column_width)
+            )
+        return self._column_offsets
+
+    def _logical_extent(self) -> tuple:
+        """Return (total width of all columns, viewport width)."""
+        offsets = self._column_layout()
+        return offsets[-1], max(1, self._viewport_width or self.winfo_width())
+
+    def _logical_fractions(self, total: int, viewport: int) -> tuple:
+        """Return scrollbar fractions for the logical offset."""
+        if total <= 0:
+            return (0.0, 1.0)
+        return (
+            self._logical_x / total,
+            min(1.0, (self._logical_x + viewport) / total),
+        )
+
+    def _update_column_window(self) -> None:
+        """
+        Display the columns inside the viewport and position the view.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._column_window_after_id = None
+        if self._column_window is None:
+            return
+        total, viewport = self._logical_extent()
+        offsets = self._column_offsets
+        count = len(offsets) - 1
+        self._logical_x = max(0, min(self._logical_x, total - viewport))
+        if count == 0:
+            self.scrollbar_x.set(0.0, 1.0)
+            return
+
+        # Columns overlapping [logical_x, logical_x + viewport)
+        first = max(0, bisect_right(offsets, self._logical_x) - 1)
+        last = bisect_left(offsets, self._logical_x + viewport) - 1
+        last = min(count - 1, max(first, last))
+        window = (
+            max(0, first - self._column_overscan),
+            min(count - 1, last + self._column_overscan),
+        )
+        if window != self._column_window:
+            super().configure(
+                displaycolumns=list(range(window[0], window[1] + 1))
+            )
+            self._column_window = window
+
+        # Scroll the displayed subset so the viewport matches logical_x
+        hidden = offsets[window[0]] - self._tree_column_width
+        shown = offsets[window[1] + 1] - hidden
+        super().xview("moveto", (self._logical_x - hidden) / max(1, shown))
+        self.scrollbar_x.set(*self._logical_fractions(total, viewport))
+        self._schedule_editor_reposition()
+
+    def _see_column(self, column_id: str) -> None:
+        """Scroll the column window so a logical column is displayed."""
+        if self._column_window is None or column_id in ("", "#0"):
+            return
+        total, viewport = self._logical_extent()
+        offsets = self._column_offsets
+        index = _colid2colindex(column_id)
+        left, right = offsets[index], offsets[index + 1]
+        if left < self._logical_x:
+            self._logical_x = left
+        elif right > self._logical_x + viewport:
+            self._logical_x = min(left, right - viewport)
+        self._update_column_window()
+
+    def _display_to_logical_column(self, column_id: str) -> str:
+        """Convert a display column ID ("#n") to a logical column ID."""
+        if self._column_window is None or column_id in ("", "#0"):
+            return column_id
+        index = _colid2colindex(column_id) + self._column_window[0]
+        return f"#{index + 1}"
+
+    def _logical_to_display_column(self, column_id: str) -> str | None:
+        """Convert a logical column ID to a display one (None if hidden)."""
+        if self._column_window is None or column_id == "#0":
+            return column_id
+        first, last = self._column_window
+        index = _colid2colindex(column_id)
+        if not first <= index <= last:
+            return None
+        return f"#{index - first + 1}"
+
+    def _data_column(self, column):
+        """Return a Tk column identifier for a logical column argument."""
+        # Tk reads "#n" as a display column; pass the data index instead
+        if (
+            self._column_window is None
+            or not isinstance(column, str)
+            or not column.startswith("#")
+            or column == "#0"
+        ):
+            return column
+        return _colid2colindex(column)
 
-        # Run vertical scrolling
-        self.yview_scroll(-1 * (event.delta // 120), "units")
+    def _cell_bbox(self, cell_id_pair: tuple):
+        """Return the bbox of a logical cell, or "" when not displayed."""
+        row_id, column_id = cell_id_pair
+        display_id = self._logical_to_display_column(column_id)
+        if display_id is None:
+            return ""
+        return self.bbox(row_id, display_id)
 
     def _additional_bind_double_click(self):
         """
@@ -210,62 +1227,52 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
             return
 
         self._context_menu_target_item = item_id
-        self.selection_set(item_id)
+        self._select_only(item_id)
         self.focus(item_id)
+        if self._shared_editors:
+            self._shared_pool().menu_owner = self
         self.context_menu.tk_popup(event.x_root, event.y_root)
 
     def _expand_descendants(self, item_id: str, expand: bool = True) -> None:
         """Expand or collapse the node and all descendants."""
+        if expand:
+            self._load_lazy_children(item_id)
         self.item(item_id, open=expand)
         for child_id in self.get_children(item_id):
             self.item(child_id, open=expand)
             self._expand_descendants(child_id, expand=expand)
 
-    def _create_context_menu(self) -> Menu:
-        """Create the standard popup menu for tree items."""
-        menu = Menu(self, tearoff=0)
-
-        menu.add_command(
-            label="Expand this node",
-            command=self._expand_current_node,
-        )
-        menu.add_command(
-            label="Collapse this node",
-            command=self._collapse_current_node,
-        )
-        menu.add_separator()
-        menu.add_command(
-            label="Expand all children recursively",
-            command=self._expand_all_children,
-        )
-        menu.add_command(
-            label="Collapse all children recursively",
-            command=self._collapse_all_children,
-        )
-        return menu
-
     def _get_context_menu_target_item(self) -> str:
         """Return the item clicked for the popup menu."""
         if self._context_menu_target_item:
             return self._context_menu_target_item
-        selected = self.selection()
-        if selected:
-            return selected[0]
-        return ""
+        selected = self.selected_items()
+        if not selected:
+            return ""
+        focus = self.focus()
+        if focus in selected:
+            return focus
+        return self.selection()[0]  # First selected item in tree order
+
+    def _select_only(self, item_id: str) -> None:
+        """Select just one item, skipping Tk when it already is."""
+        if self.selected_items() != {item_id}:
+            self.selection_set(item_id)
 
     def _expand_current_node(self) -> None:
         """Expand the clicked item."""
         item_id = self._get_context_menu_target_item()
         if item_id:
-            self.selection_set(item_id)
+            self._select_only(item_id)
             self.focus(item_id)
+            self._load_lazy_children(item_id)
             self.item(item_id, open=True)
 
     def _collapse_current_node(self) -> None:
         """Collapse the clicked item."""
         item_id = self._get_context_menu_target_item()
         if item_id:
-            self.selection_set(item_id)
+            self._select_only(item_id)
             self.focus(item_id)
             self.item(item_id, open=False)
 
@@ -273,7 +1280,7 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         """Expand all descendants of the clicked item."""
         item_id = self._get_context_menu_target_item()
         if item_id:
-            self.selection_set(item_id)
+            self._select_only(item_id)
             self.focus(item_id)
             self._expand_descendants(item_id, expand=True)
 
@@ -281,7 +1288,7 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         """Collapse all descendants of the clicked item."""
         item_id = self._get_context_menu_target_item()
         if item_id:
-            self.selection_set(item_id)
+            self._select_only(item_id)
             self.focus(item_id)
             self._expand_descendants(item_id, expand=False)
 
@@ -320,6 +1327,16 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
             return super().bind(sequence, combined_handler, add=add)
         if sequence == "<Button-3>":
             return super().bind(sequence, func, add=add)
+        if sequence == "<<CellsChanged>>" and func is not None:
+            self._change_event_bound = True
+        if sequence == "<<TreeviewSelect>>" and func is not None and not add:
+            # The binding replaces the one keeping the selection copy
+
+            def select_handler(event):
+                self._on_select(event)
+                return func(event)
+
+            return super().bind(sequence, select_handler, add=add)
         return super().bind(sequence, func, add=add)
 
     def pack(self, **kwargs):
@@ -375,57 +1392,408 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         """
         if option is None and "stretch" not in kw:
             kw["stretch"] = False
-        return super().column(column, option, **kw)
+        if "width" in kw:
+            self._column_offsets = None
+            if self._column_window is not None:
+                self._schedule_column_window()
+        return super().column(self._data_column(column), option, **kw)
 
-    def get_clicked_cell_id_pair(self, event: Event) -> tuple:
+    def heading(self, column: str, option=None, **kw):
         """
-        Get the cell IDs at the clicked position.
+        Override heading.
 
         Parameters
         ----------
-        event : Event
-            Click event.
+        column : str
+            Column ID.
+        option : str, optional
+            Heading option. The default is None.
+        **kw : dict
+            Additional keyword arguments.
 
         Returns
         -------
-        tuple
-            Pair of (row ID, column ID).
+        Any
+            Return value from Treeview.heading().
 
         """
-        cell_id_pair = ("", "")
-        region = self.identify_region(event.x, event.y)
-        if region != "cell":
-            return ("", "")
-        cell_id_pair = (
-            self.identify_row(event.y),
-            self.identify_column(event.x),
-        )
-        return cell_id_pair
+        return super().heading(self._data_column(column), option, **kw)
 
-    def on_double_click(self, event: Event) -> str | None:
+    def insert(self, parent, index, iid=None, lazy: bool = False, **kw):
         """
-        Handle double-click action.
+        Override insert.
 
         Parameters
         ----------
-        event : Event
-            Event object.
+        parent : str
+            Parent item ID.
+        index : int or str
+            Position among the parent's children.
+        iid : str, optional
+            Item ID. The default is None.
+        lazy : bool, optional
+            Show the item as expandable and load its children from the
+            children provider when it is opened. The default is False.
+        **kw : dict
+            Additional keyword arguments.
 
         Returns
         -------
-        str or None
-            "break" when editing started, to stop the default
-            expand/collapse toggle binding from also firing.
+        str
+            Item ID of the new item.
 
         """
-        cell_id_pair = self.get_clicked_cell_id_pair(event)
-        if cell_id_pair != ("", "") and self.is_valid_cell(cell_id_pair):
-            if self.start_edit(cell_id_pair):
-                # Give editing priority over the row expand/collapse toggle
-                return "break"
-        return None
-
-    def get_cell_value(self, cell_id_pair: tuple) -> str:
+        if iid is not None and self._typed_cache:
+            self._typed_cache.pop(str(iid), None)
+        styles = ()
+        if self._style_rules or self._readonly_style:
+            styles = self._insert_style_tags(iid, kw)
+        iid = super().insert(parent, index, iid, **kw)
+        if parent:
+            self._parent_ids.add(parent)
+        if styles:
+            self._row_styles[iid] = styles
+        elif self._row_styles:
+            self._row_styles.pop(iid, None)
+        if lazy:
+            super().insert(iid, "end", iid + _PLACEHOLDER_SUFFIX)
+            self._parent_ids.add(iid)
+        if self._tracking_changes:
+            self._record_change("insert", iid, None, None, kw.get("values"))
+        return iid
+
+    def item(self, item, option=None, **kw):
+        """
+        Override item.
+
+        Parameters
+        ----------
+        item : str
+            Item ID.
+        option : str, optional
+            Item option. The default is None.
+        **kw : dict
+            Additional keyword arguments.
+
+        Returns
+        -------
+        Any
+            Return value from Treeview.item().
+
+        """
+        if "tags" in kw:
+            self._row_styles.pop(item, None)  # The new tags replace styles
+        if "values" in kw or "tags" in kw:
+            self._queue_restyle((item,))
+        if "values" in kw:
+            if self._typed_cache:
+                self._typed_cache.pop(item, None)
+            if self._tracking_changes:
+                old = super().item(item, "values")
+                result = super().item(item, option, **kw)
+                self._record_value_changes(item, old, kw["values"])
+                self._item_opened(item, kw)
+                return result
+        result = super().item(item, option, **kw)
+        self._item_opened(item, kw)
+        return result
+
+    def _item_opened(self, item: str, kw: dict) -> None:
+        """Load or drop lazy children of a node opened by item()."""
+        if "open" not in kw:
+            return
+        # Opening by item() does not generate <<TreeviewOpen>>
+        if self.tk.getboolean(kw["open"]):
+            self._load_lazy_children(item)
+        elif self._data_source is not None:
+            self._open_source_node(item, opened=False)
+
+    def set(self, item, column=None, value=None):
+        """
+        Override set.
+
+        Parameters
+        ----------
+        item : str
+            Item ID.
+        column : str, optional
+            Column ID. The default is None.
+        value : Any, optional
+            New value. The default is None.
+
+        Returns
+        -------
+        Any
+            Return value from Treeview.set().
+
+        """
+        column = self._data_column(column)
+        if value is not None:
+            self._queue_restyle((item,))
+            if self._typed_cache:
+                self._typed_cache.pop(item, None)
+            if self._tracking_changes:
+                old = super().set(item, column)
+                result = super().set(item, column, value)
+                self._record_change(
+                    "cell", item, self._column_id(column), old, value
+                )
+                return result
+        return super().set(item, column, value)
+
+    def delete(self, *items):
+        """
+        Override delete.
+
+        Parameters
+        ----------
+        *items : str
+            Item IDs.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Descendants are deleted with their ancestors
+        removed = dict.fromkeys(items)
+        for item_id in items:
+            if item_id in self._parent_ids:
+                removed.update(dict.fromkeys(self._descendants(item_id)))
+        if self._typed_cache:
+            for item_id in removed:
+                self._typed_cache.pop(item_id, None)
+        if self._selected:
+            self._selection_dirty = True  # Deleted items leave the selection
+        if self._row_styles:
+            for item_id in removed:
+                self._row_styles.pop(item_id, None)
+        if self._source_items:
+            for item_id in removed:
+                self._source_items.pop(item_id, None)
+                self._source_rules.pop(item_id, None)
+        self._parent_ids.difference_update(removed)
+        if self._tracking_changes:
+            for item_id in removed:
+                old = super().item(item_id, "values")
+                self._record_change("delete", item_id, None, old, None)
+        super().delete(*items)
+
+    def move(self, item, parent, index):
+        """
+        Override move.
+
+        Parameters
+        ----------
+        item : str
+            Item ID.
+        parent : str
+            New parent item ID.
+        index : int or str
+            New position among the parent's children.
+
+        Returns
+        -------
+        None.
+
+        """
+        if parent:
+            self._parent_ids.add(parent)
+        if self._tracking_changes:
+            old = (self.parent(item), self.index(item))
+            super().move(item, parent, index)
+            self._record_change(
+                "move", item, None, old, (parent, self.index(item))
+            )
+        else:
+            super().move(item, parent, index)
+
+    reattach = move
+
+    def set_children(self, item, *newchildren):
+        """
+        Override set_children.
+
+        Parameters
+        ----------
+        item : str
+            Parent item ID.
+        *newchildren : str
+            New children of the item.
+
+        Returns
+        -------
+        None.
+
+        """
+        if item and newchildren:
+            self._parent_ids.add(item)
+        super().set_children(item, *newchildren)
+
+    def move_items(
+        self, items, parent: str = "", index="end", source: str = "api"
+    ) -> list:
+        """
+        Move several items under one parent with a single Tcl call.
+
+        The items keep their display order. Items inside other moved
+        items move with them. The moves are recorded in one transaction,
+        so subscribers receive them as one change set.
+
+        Parameters
+        ----------
+        items : iterable of str
+            Item IDs.
+        parent : str, optional
+            New parent item ID. The default is "" (top level).
+        index : int or str, optional
+            Position among the current children of parent before which
+            the items are placed, or "end". The default is "end".
+        source : str, optional
+            Source of the recorded changes. The default is "api".
+
+        Raises
+        ------
+        ValueError
+            If parent is one of the items or one of their descendants.
+
+        Returns
+        -------
+        list
+            Moved item IDs in their new order.
+
+        """
+        entries = self._top_level_items(items)
+        moving = {item_id for item_id, _, _ in entries}
+        ancestor = parent
+        while ancestor:
+            if ancestor in moving:
+                raise ValueError(f"Cannot move {ancestor} into itself")
+            ancestor = self.parent(ancestor)
+        if not entries:
+            return []
+        self._load_lazy_children(parent)
+        children = self.get_children(parent)
+        if index == "end":
+            index = len(children)
+        index = max(0, min(int(index), len(children)))
+        kept = [child for child in children if child not in moving]
+        position = index - sum(child in moving for child in children[:index])
+        moved = [item_id for item_id, _, _ in entries]
+        if parent:
+            self._parent_ids.add(parent)
+        super().set_children(parent, *kept[:position], *moved, *kept[position:])
+        if self._tracking_changes:
+            with self.transaction(source):
+                for offset, (item_id, old_parent, old_index) in enumerate(
+                    entries
+                ):
+                    self._record_change(
+                        "move",
+                        item_id,
+                        None,
+                        (old_parent, old_index),
+                        (parent, position + offset),
+                    )
+        return moved
+
+    def _top_level_items(self, items) -> list:
+        """
+        Return (item ID, parent, index) of items in display order.
+
+        Items inside other given items are left out.
+        """
+        given = set(items)
+        given.discard("")
+        siblings = {}  # Parent ID -> {child ID: index}
+        parents = {}  # Item ID -> parent ID learned from children lists
+        keyed = []
+        for item_id in given:
+            path = []
+            node, parent = item_id, None
+            while node:
+                up = parents.get(node)
+                if up is None:
+                    up = self.parent(node)
+                if up in given:
+                    break  # Moves together with its ancestor
+                if up not in siblings:
+                    children = self.get_children(up)
+                    siblings[up] = {
+                        child: index for index, child in enumerate(children)
+                    }
+                    parents.update(dict.fromkeys(children, up))
+                path.append(siblings[up][node])
+                if parent is None:
+                    parent = up
+                node = up
+            else:
+                keyed.append((path[::-1], item_id, parent))
+        keyed.sort()
+        return [(item_id, parent, path[-1]) for path, item_id, parent in keyed]
+
+    def get_clicked_cell_id_pair(self, event: Event) -> tuple:
+        """
+        Get the cell IDs at the clicked position.
+
+        Parameters
+        ----------
+        event : Event
+            Click event.
+
+        Returns
+        -------
+        tuple
+            Pair of (row ID, column ID).
+
+        """
+        cell_id_pair = ("", "")
+        region = self.identify_region(event.x, event.y)
+        if region != "cell":
+            return ("", "")
+        cell_id_pair = (
+            self.identify_row(event.y),
+            self._display_to_logical_column(self.identify_column(event.x)),
+        )
+        return cell_id_pair
+
+    def on_double_click(self, event: Event) -> str | None:
+        """
+        Handle double-click action.
+
+        Parameters
+        ----------
+        event : Event
+            Event object.
+
+        Returns
+        -------
+        str or None
+            "break" when editing started, to stop the default
+            expand/collapse toggle binding from also firing.
+
+        """
+        cell_id_pair = self.get_clicked_cell_id_pair(event)
+        if cell_id_pair != ("", "") and self.is_valid_cell(cell_id_pair):
+            if self.start_edit(cell_id_pair):
+                # Give editing priority over the row expand/collapse toggle
+                return "break"
+        elif self.autofit_on_heading_double_click:
+            region = self.identify_region(event.x, event.y)
+            if region in ("heading", "separator"):
+                # A separator belongs to the column on its left
+                x = event.x
+                if region == "separator":
+                    x -= _SEPARATOR_SLOP
+                column_id = self._display_to_logical_column(
+                    self.identify_column(x)
+                )
+                if column_id:
+                    self.autofit_columns([column_id])
+                    return "break"
+        return None
+
+    def get_cell_value(self, cell_id_pair: tuple) -> str:
         """
         Get a cell value.
 
@@ -456,23 +1824,27 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         if cell_type == CellType.READONLY:
             return False
 
+        if self._shared_editors:
+            self._shared_pool().acquire(self)
+
         # Continue with edit processing
-        self._editing_cell = cell_id_pair
         cell_value = self.get_cell_value(cell_id_pair)
 
         # Get the cell position and size
-        bbox = self.bbox(row_id, column_id)
+        self._see_column(column_id)
+        bbox = self._cell_bbox(cell_id_pair)
         if not bbox:
             raise ValueError(
                 f"Cannot determine the position of the cell: {cell_id_pair}"
             )
 
-        x, y, width, height = bbox
-
         # For combobox cells
         if cell_type == CellType.COMBOBOX:
             # Keep the current value list
-            if cell_id_pair in self.combobox_cell_values:
+            rule = self._source_rules.get(row_id)
+            if rule is not None and column_id in (rule.combobox_values or {}):
+                self._editing_combobox_values = rule.combobox_values[column_id]
+            elif cell_id_pair in self.combobox_cell_values:
                 self._editing_combobox_values = self.combobox_cell_values[
                     cell_id_pair
                 ]
@@ -489,15 +1861,25 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
             self.combobox.delete(0, "end")
             self.combobox.insert(0, cell_value)
             self.combobox["values"] = self._editing_combobox_values
+            provider = self.combobox_column_providers.get(column_id)
+            if provider is not None:
+                self._combobox_task = AsyncioBridge.for_widget(
+                    self
+                ).create_task(self._fill_combobox(cell_id_pair, provider))
 
-            self.combobox.place(x=x, y=y, width=width, height=height)
-            self.combobox.focus_set()
+            self._editing_widget = self.combobox
         elif cell_type == CellType.ENTRY:
             # Configure the Entry widget
             self.entry.delete(0, "end")
             self.entry.insert(0, cell_value)
-            self.entry.place(x=x, y=y, width=width, height=height)
-            self.entry.focus_set()
+            self._editing_widget = self.entry
+        self._editing_cell = cell_id_pair
+        self._place_editor(self._editing_widget, bbox)
+        if self._editor_pool is not None:
+            self._editing_widget.lift()  # Above the other trees
+        self._editing_widget.focus_set()
+        self._editor_geometry = tuple(bbox)
+        self._editor_hidden = False
 
         return True
 
@@ -529,15 +1911,22 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
 
     def _on_return(self, event):  # pylint: disable=unused-argument
         """Handle the <Return> event."""
-        if self._editing_cell:
+        if self._editing_cell_exists():
             widget = event.widget
             self.update_cell(self._editing_cell, widget)
 
     def _on_focus_out(self, event):  # pylint: disable=unused-argument
         """Handle the <FocusOut> event."""
-        if self._editing_cell:
-            widget = event.widget
-            self.update_cell(self._editing_cell, widget)
+        # Losing focus while hidden off-screen keeps the edit pending
+        if self._editing_cell and not self._editor_hidden:
+            self._end_edit(event.widget)
+
+    def _end_edit(self, widget=None) -> None:
+        """Commit the active edit, reverting invalid input."""
+        if widget is None:
+            widget = self._editing_widget
+        if not self.update_cell(self._editing_cell, widget):
+            self.cancel_edit()
 
     def _on_escape(self, event):  # pylint: disable=unused-argument
         """Handle the <Escape> event."""
@@ -545,10 +1934,19 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
 
     def _on_combobox_selected(self, event):  # pylint: disable=unused-argument
         """Handle combobox selection events."""
-        if self._editing_cell:
+        if self._editing_cell_exists():
             widget = event.widget
             self.update_cell(self._editing_cell, widget)
 
+    def _editing_cell_exists(self) -> bool:
+        """Return True if a cell is edited; end edits of deleted rows."""
+        if not self._editing_cell:
+            return False
+        if not self.exists(self._editing_cell[0]):
+            self.cancel_edit()
+            return False
+        return True
+
     def _get_cell_type(self, cell_id_pair: tuple) -> CellType:
         """
         Determine a cell type.
@@ -568,12 +1966,21 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
 
         # Check read-only settings
         if (
-            row_id in self.readonly_rows
+            row_id.endswith(_PLACEHOLDER_SUFFIX)
+            or row_id in self.readonly_rows
             or column_id in self.readonly_columns
             or cell_id_pair in self.readonly_cells
         ):
             return CellType.READONLY
 
+        # Check rules read from the data source
+        rule = self._source_rules.get(row_id)
+        if rule is not None:
+            if rule.readonly or column_id in rule.readonly_columns:
+                return CellType.READONLY
+            if column_id in (rule.combobox_values or {}):
+                return CellType.COMBOBOX
+
         # Check combobox settings
         if (
             row_id in self.combobox_rows
@@ -586,8 +1993,22 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
 
     def update_cell(
         self, cell_id_pair: tuple, widget: Union[Entry, Combobox]
-    ) -> None:
-        """Update a cell value."""
+    ) -> bool:
+        """
+        Update a cell value.
+
+        If the column has a type set with set_column_type, the input is
+        parsed first. Invalid input is rejected without writing the cell
+        and the editor stays open. With a validator set by set_validator,
+        the new value is shown as pending and committed or reverted when
+        the validator finishes.
+
+        Returns
+        -------
+        bool
+            False if the input was rejected, otherwise True.
+
+        """
         if not self.is_valid_cell(cell_id_pair):
             raise ValueError(f"Invalid cell specified: {cell_id_pair}")
 
@@ -596,20 +2017,106 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         # Do not update when the cell is read-only
         if cell_type == CellType.READONLY:
             self.cancel_edit()
-            return
+            return True
 
         # Update value for ENTRY or COMBOBOX cells
         if cell_type == CellType.ENTRY or cell_type == CellType.COMBOBOX:
             # Get the new value
             new_value = widget.get()
+            typed_value = new_value
+            row_id, column_id = cell_id_pair
+            column_type = self.column_types.get(column_id)
+            if column_type is not None:
+                try:
+                    typed_value = column_type.parse(new_value)
+                except ValueError:
+                    self.bell()
+                    return False
+                new_value = column_type.format(typed_value)
             # Update only when the value changed
             if new_value != self.get_cell_value(cell_id_pair):
-                values = list(self.item(cell_id_pair[0], "values"))
-                col_index = _colid2colindex(cell_id_pair[1])
-                values[col_index] = new_value
-                self.item(cell_id_pair[0], values=values)
+                if self._validator is not None:
+                    self._submit_validation(
+                        {cell_id_pair: (new_value, typed_value)}, "edit"
+                    )
+                else:
+                    previous = self._write_cells({cell_id_pair: new_value})
+                    self._commit_cell(
+                        cell_id_pair,
+                        new_value,
+                        typed_value,
+                        previous.get(cell_id_pair),
+                        "edit",
+                    )
+            elif column_type is not None:
+                self._typed_cache.setdefault(row_id, {})[
+                    column_id
+                ] = typed_value
 
         self.cancel_edit()
+        return True
+
+    def _write_cells(self, texts: dict) -> dict:
+        """
+        Write cell texts with one item() call per row.
+
+        Parameters
+        ----------
+        texts : dict
+            Map of (row ID, column ID) to text.
+
+        Returns
+        -------
+        dict
+            Map of the written cells to their previous values.
+
+        """
+        by_row = {}
+        for (row_id, column_id), text in texts.items():
+            by_row.setdefault(row_id, []).append((column_id, text))
+        previous = {}
+        for row_id, cells in by_row.items():
+            try:
+                values = list(self.item(row_id, "values"))
+            except TclError:  # The row was deleted
+                continue
+            for column_id, text in cells:
+                col_index = _colid2colindex(column_id)
+                values.extend([""] * (col_index + 1 - len(values)))
+                previous[(row_id, column_id)] = values[col_index]
+                values[col_index] = text
+            if self._typed_cache:
+                self._typed_cache.pop(row_id, None)
+            super().item(row_id, values=values)
+        self._queue_restyle(by_row)
+        return previous
+
+    def _commit_cell(
+        self,
+        cell_id_pair: tuple,
+        text,
+        typed_value,
+        old,
+        source: str,
+        refits: dict | None = None,
+    ) -> None:
+        """
+        Apply the side effects of a written cell value.
+
+        When ``refits`` is given, texts of auto-fitted columns are
+        collected in it for one _refit_columns() call by the caller.
+        """
+        row_id, column_id = cell_id_pair
+        if self._tracking_changes:
+            self._record_change("cell", row_id, column_id, old, text, source)
+        self._queue_source_write(row_id, _colid2colindex(column_id), text)
+        if column_id in self._autofit_widths:
+            if refits is None:
+                self._refit_columns({column_id: [text]})
+            else:
+                refits.setdefault(column_id, []).append(text)
+        if column_id in self.column_types:
+            self._typed_cache.setdefault(row_id, {})[column_id] = typed_value
 
     def cancel_edit(self):
         """
@@ -620,22 +2127,43 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         None.
 
         """
-        self.entry.place_forget()  # Hide Entry
-        self.combobox.place_forget()  # Hide Combobox
+        # Shared editors may be showing another tree's edit
+        if self._editor_pool is None or self._editor_pool.owner is self:
+            for widget in (self._entry, self._combobox):
+                if widget is not None:
+                    widget.place_forget()
+        if self._combobox_task is not None:
+            self._combobox_task.cancel()  # Values are no longer needed
+            self._combobox_task = None
         self._editing_cell = None
         self._editing_combobox_values = None
+        self._editing_widget = None
+        self._editor_geometry = None
+        self._editor_hidden = False
 
     def set_readonly_row(self, row_id: str, readonly: bool = True) -> None:
         """Set a row as read-only."""
+        self._record_rule(
+            "readonly", row_id, None, row_id in self.readonly_rows, readonly
+        )
         if readonly:
             self.readonly_rows.add(row_id)
         else:
             self.readonly_rows.discard(row_id)
+        if self._readonly_style:
+            self._queue_restyle((row_id,))
 
     def set_readonly_column(
         self, column_id: str, readonly: bool = True
     ) -> None:
         """Set a column as read-only."""
+        self._record_rule(
+            "readonly",
+            None,
+            column_id,
+            column_id in self.readonly_columns,
+            readonly,
+        )
         if readonly:
             self.readonly_columns.add(column_id)
         else:
@@ -645,6 +2173,12 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         self, cell_id_pair: tuple, readonly: bool = True
     ) -> None:
         """Set a cell as read-only."""
+        self._record_rule(
+            "readonly",
+            *cell_id_pair,
+            cell_id_pair in self.readonly_cells,
+            readonly,
+        )
         if readonly:
             self.readonly_cells.add(cell_id_pair)
         else:
@@ -654,6 +2188,9 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         self, row_id: str, values: list | None = None, is_combobox: bool = True
     ) -> None:
         """Set a row to use a combobox."""
+        self._record_rule(
+            "combobox", row_id, None, row_id in self.combobox_rows, is_combobox
+        )
         if is_combobox:
             self.combobox_rows.add(row_id)
             if values is not None:
@@ -669,6 +2206,13 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         is_combobox: bool = True,
     ) -> None:
         """Set a column to use a combobox."""
+        self._record_rule(
+            "combobox",
+            None,
+            column_id,
+            column_id in self.combobox_columns,
+            is_combobox,
+        )
         if is_combobox:
             self.combobox_columns.add(column_id)
             if values is not None:
@@ -684,6 +2228,12 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         is_combobox: bool = True,
     ) -> None:
         """Set a cell to use a combobox."""
+        self._record_rule(
+            "combobox",
+            *cell_id_pair,
+            cell_id_pair in self.combobox_cells,
+            is_combobox,
+        )
         if is_combobox:
             self.combobox_cells.add(cell_id_pair)
             if values is not None:
@@ -691,3 +2241,1793 @@ class TreeviewEx(Treeview):  # pylint: disable=too-many-ancestors
         else:
             self.combobox_cells.discard(cell_id_pair)
             self.combobox_cell_values.pop(cell_id_pair, None)
+
+    def set_column_type(self, column_id: str, column_type) -> None:
+        """
+        Set the type of a data column.
+
+        Parameters
+        ----------
+        column_id : str
+            Column ID ("#n").
+        column_type : ColumnType or None
+            Type such as INT, FLOAT, DECIMAL, date_type() or enum_type().
+            None removes the type.
+
+        Returns
+        -------
+        None.
+
+        """
+        if column_type is None:
+            self.column_types.pop(column_id, None)
+        else:
+            self.column_types[column_id] = column_type
+        for cached in self._typed_cache.values():
+            cached.pop(column_id, None)
+
+    def get_typed_value(self, cell_id_pair: tuple):
+        """
+        Return the parsed value of a cell in a typed column.
+
+        Values are parsed once and cached per cell until the cell is
+        written through update_cell, item(values=...), set or insert.
+
+        Parameters
+        ----------
+        cell_id_pair : tuple
+            Pair of (row ID, column ID).
+
+        Raises
+        ------
+        KeyError
+            If the column has no type.
+
+        Returns
+        -------
+        Any
+            Parsed value, or None if the cell text is not valid.
+
+        """
+        row_id, column_id = cell_id_pair
+        column_type = self.column_types[column_id]
+        cached = self._typed_cache.setdefault(row_id, {})
+        if column_id not in cached:
+            try:
+                cached[column_id] = column_type.parse(
+                    self.get_cell_value(cell_id_pair)
+                )
+            except ValueError:
+                cached[column_id] = None
+        return cached[column_id]
+
+    def set_validator(
+        self,
+        validator: Callable | None,
+        batch_validator: Callable | None = None,
+        max_concurrent: int = 4,
+        executor=None,
+    ) -> None:
+        """
+        Validate committed edits without blocking the UI.
+
+        The validator is called as ``validator(cell_id_pair, value)``
+        with the parsed value for typed columns and the text otherwise,
+        and returns True to accept the edit. A coroutine function runs on
+        an asyncio loop; any other callable runs on a thread pool. While
+        it runs, the row is tagged "pending" and shows the new value;
+        the edit is then committed, or reverted with a bell. Editing the
+        cell again cancels the earlier validation.
+
+        Parameters
+        ----------
+        validator : Callable or None
+            Validator, or None to commit edits immediately again.
+        batch_validator : Callable, optional
+            Called as ``batch_validator(items)`` with a list of
+            (cell_id_pair, value) for paste_cells and returns a list of
+            bools. The default runs the validator for each item.
+        max_concurrent : int, optional
+            Validation jobs running at the same time. The default is 4.
+        executor : concurrent.futures.Executor, optional
+            Executor for plain callables. The default is a thread pool
+            created on first use. Passing a different executor later
+            restarts unfinished validations on it.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._validator = validator
+        self._batch_validator = batch_validator
+        if validator is None:
+            return
+        runner = self._validation_runner
+        if runner is None:
+            self._validation_runner = ValidationRunner(max_concurrent, executor)
+            self.tag_configure(_PENDING_TAG, foreground="gray")
+        elif executor is not runner.executor:
+            # Jobs still waiting are validated again on the new executor
+            self._validation_runner = ValidationRunner(max_concurrent, executor)
+            runner.shutdown()
+            self._resubmit_validation_jobs()
+        else:
+            runner.max_concurrent = max_concurrent
+
+    def paste_cells(self, texts: dict) -> list:
+        """
+        Write many cells at once, for example from a paste.
+
+        Rows are written with one item() call each. Read-only cells,
+        cells of missing rows and input rejected by a column type are
+        skipped. With a validator, the cells are validated in batches.
+
+        Parameters
+        ----------
+        texts : dict
+            Map of (row ID, column ID) to text.
+
+        Returns
+        -------
+        list
+            Cells that were skipped.
+
+        """
+        edits = {}
+        skipped = []
+        existing = {}
+        for cell_id_pair, text in texts.items():
+            row_id, column_id = cell_id_pair
+            if row_id not in existing:
+                existing[row_id] = self.exists(row_id)
+            if (
+                not existing[row_id]
+                or self._get_cell_type(cell_id_pair) == CellType.READONLY
+            ):
+                skipped.append(cell_id_pair)
+                continue
+            typed_value = text
+            column_type = self.column_types.get(column_id)
+            if column_type is not None:
+                try:
+                    typed_value = column_type.parse(text)
+                except ValueError:
+                    skipped.append(cell_id_pair)
+                    continue
+                text = column_type.format(typed_value)
+            edits[cell_id_pair] = (text, typed_value)
+
+        if self._validator is not None:
+            self._submit_validation(edits, "paste")
+            return skipped
+        previous = self._write_cells(
+            {cell: text for cell, (text, _) in edits.items()}
+        )
+        refits = {}
+        with self.transaction("paste"):
+            for cell_id_pair, (text, typed_value) in edits.items():
+                self._commit_cell(
+                    cell_id_pair,
+                    text,
+                    typed_value,
+                    previous.get(cell_id_pair),
+                    "paste",
+                    refits,
+                )
+        self._refit_columns(refits)
+        return skipped
+
+    def _submit_validation(self, edits: dict, source: str) -> None:
+        """Show edits as pending and queue their validation."""
+        if not edits:
+            return
+        previous = self._write_cells(
+            {cell: text for cell, (text, _) in edits.items()}
+        )
+        new_rows = []
+        for cell_id_pair in edits:
+            pending = self._pending_cells.pop(cell_id_pair, None)
+            if pending is not None:
+                # Re-edited: keep the committed value and drop the old job
+                previous[cell_id_pair] = pending[1]
+                self._release_validation_job(pending[0])
+            else:
+                row_id = cell_id_pair[0]
+                if row_id not in self._pending_rows:
+                    self._pending_rows[row_id] = 0
+                    new_rows.append(row_id)
+                self._pending_rows[row_id] += 1
+        if new_rows:
+            self.tk.call(self._w, "tag", "add", _PENDING_TAG, new_rows)
+
+        items = list(edits.items())
+        single = len(items) == 1
+        for start in range(0, len(items), _VALIDATION_BATCH):
+            chunk = items[start : start + _VALIDATION_BATCH]
+            values = [(cell, typed) for cell, (_, typed) in chunk]
+            if single:
+                call = (self._validator, *values[0])
+            elif self._batch_validator is not None:
+                call = (self._batch_validator, values)
+            elif inspect.iscoroutinefunction(self._validator):
+                call = (validate_each_async, self._validator, values)
+            else:
+                call = (validate_each, self._validator, values)
+            token = self._validation_runner.submit(*call)
+            cells = [cell for cell, _ in chunk]
+            self._validation_jobs[token] = [cells, single, len(cells), call]
+            for cell_id_pair, (text, typed_value) in chunk:
+                self._pending_cells[cell_id_pair] = (
+                    token,
+                    previous.get(cell_id_pair, ""),
+                    text,
+                    typed_value,
+                    source,
+                )
+        self._schedule_validation_poll()
+
+    def _resubmit_validation_jobs(self) -> None:
+        """Submit the unfinished jobs again to a new validation runner."""
+        jobs, self._validation_jobs = self._validation_jobs, {}
+        for old_token, job in jobs.items():
+            token = self._validation_runner.submit(*job[3])
+            self._validation_jobs[token] = job
+            for cell_id_pair in job[0]:
+                pending = self._pending_cells.get(cell_id_pair)
+                if pending is not None and pending[0] == old_token:
+                    self._pending_cells[cell_id_pair] = (token, *pending[1:])
+        if jobs:
+            self._schedule_validation_poll()
+
+    def _release_validation_job(self, token: int) -> None:
+        """Cancel a job once none of its cells still waits for it."""
+        job = self._validation_jobs.get(token)
+        if job is None:
+            return
+        job[2] -= 1
+        if job[2] <= 0:
+            del self._validation_jobs[token]
+            self._validation_runner.cancel(token)
+
+    def _schedule_validation_poll(self) -> None:
+        """Check for validation results on the next frame."""
+        if self._validation_after_id is None:
+            self._validation_after_id = self.after(
+                _FRAME_MS, self._poll_validations
+            )
+
+    def _poll_validations(self) -> None:
+        """Commit or revert the edits whose validation finished."""
+        self._validation_after_id = None
+        runner = self._validation_runner
+        commits = {}
+        reverts = {}
+        for token, result, error in runner.poll():
+            job = self._validation_jobs.pop(token, None)
+            if job is None:
+                continue
+            cells, single, _, _ = job
+            if error is not None:
+                results = []
+            elif single:
+                results = [bool(result)]
+            else:
+                results = list(result)
+            results += [False] * (len(cells) - len(results))
+            for cell_id_pair, accepted in zip(cells, results):
+                pending = self._pending_cells.get(cell_id_pair)
+                if pending is None or pending[0] != token:
+                    continue  # Edited again since this job started
+                del self._pending_cells[cell_id_pair]
+                if accepted:
+                    commits[cell_id_pair] = pending
+                else:
+                    reverts[cell_id_pair] = pending[1]
+
+        if reverts:
+            self._write_cells(reverts)
+            self.bell()
+        refits = {}
+        for cell_id_pair, (_, old, text, typed, source) in commits.items():
+            self._commit_cell(cell_id_pair, text, typed, old, source, refits)
+        self._refit_columns(refits)
+        done_rows = []
+        for row_id, _ in list(commits) + list(reverts):
+            self._pending_rows[row_id] -= 1
+            if not self._pending_rows[row_id]:
+                del self._pending_rows[row_id]
+                done_rows.append(row_id)
+        if done_rows:
+            try:
+                self.tk.call(self._w, "tag", "remove", _PENDING_TAG, done_rows)
+            except TclError:  # Some rows were deleted
+                for row_id in done_rows:
+                    if self.exists(row_id):
+                        self.tk.call(
+                            self._w, "tag", "remove", _PENDING_TAG, row_id
+                        )
+        if runner.busy:
+            self._schedule_validation_poll()
+
+    def autofit_columns(
+        self,
+        columns=None,
+        sample: int = 2000,
+        on_done: Callable | None = None,
+    ) -> None:
+        """
+        Fit column widths to their content without blocking the UI.
+
+        The work runs in short time slices on the event loop. The
+        lengths of all strings are compared without measuring them; the
+        heading, the longest strings and a few strings of a random
+        sample of rows are measured. Measurements are cached per (font
+        configuration, text).
+
+        Parameters
+        ----------
+        columns : iterable of str, optional
+            Column IDs ("#0" or "#n") to fit. The default fits "#0" and
+            all data columns.
+        sample : int, optional
+            Number of rows sampled at random for strings that are
+            measured besides the longest ones. The default is 2000.
+        on_done : Callable, optional
+            Called with a dict of column ID -> width when finished.
+
+        Returns
+        -------
+        None.
+
+        """
+        if columns is None:
+            count = len(self.tk.splitlist(super().cget("columns")))
+            columns = ["#0"] + [f"#{index + 1}" for index in range(count)]
+        self._cancel_autofit()
+        self._autofit_job = self._autofit_steps(list(columns), sample, on_done)
+        self._autofit_after_id = self.after_idle(self._run_autofit)
+
+    def _cancel_autofit(self) -> None:
+        """Stop a running auto-fit."""
+        if self._autofit_after_id is not None:
+            self.after_cancel(self._autofit_after_id)
+            self._autofit_after_id = None
+        self._autofit_job = None
+
+    def _run_autofit(self) -> None:
+        """Run auto-fit steps until the time budget of this slice is used."""
+        self._autofit_after_id = None
+        job = self._autofit_job
+        if job is None:
+            return
+        deadline = time.perf_counter() + _AUTOFIT_BUDGET_MS / 1000
+        while time.perf_counter() < deadline:
+            if next(job, None) is None:
+                self._autofit_job = None
+                return
+        self._autofit_after_id = self.after(1, self._run_autofit)
+
+    @staticmethod
+    def _column_ref(column_id: str):
+        """Return the identifier passed to column()/heading() for an ID."""
+        # Data column indexes stay logical even when virtualized
+        return column_id if column_id == "#0" else _colid2colindex(column_id)
+
+    def _get_autofit_fonts(self) -> tuple:
+        """Return the actual (cell font, heading font) of the Treeview."""
+        if self._autofit_fonts is None:
+            style = self.cget("style") or "Treeview"
+            cell_font = self.tk.call("ttk::style", "lookup", style, "-font")
+            heading_font = self.tk.call(
+                "ttk::style", "lookup", f"{style}.Heading", "-font"
+            )
+            self._autofit_fonts = (
+                str(cell_font) or "TkDefaultFont",
+                str(heading_font) or "TkHeadingFont",
+            )
+        return tuple(
+            _MEASURE_CACHE.font_key(self, font) for font in self._autofit_fonts
+        )
+
+    def _autofit_steps(self, columns: list, sample: int, on_done):
+        """Generate the time-sliced steps of an auto-fit run."""
+        # Collect rows with their depth; yield once per parent
+        rows = []
+        stack = [("", -1)]
+        while stack:
+            parent, depth = stack.pop()
+            try:
+                children = self.get_children(parent)
+            except TclError:  # The parent was deleted
+                continue
+            for child in children:
+                if child.endswith(_PLACEHOLDER_SUFFIX):
+                    continue
+                rows.append((child, depth + 1))
+                if child in self._parent_ids:  # Leaves are not listed
+                    stack.append((child, depth + 1))
+            yield True
+
+        # A fixed seed keeps repeated fits of the same data stable
+        picked = frozenset(
+            random.Random(0).sample(range(len(rows)), min(sample, len(rows)))
+        )
+
+        # Keep the longest strings of every row and the sampled strings
+        longest = {column_id: [] for column_id in columns}  # (len, text)
+        kept = {column_id: set() for column_id in columns}
+        sampled = {column_id: set() for column_id in columns}
+        max_depth = 0
+        with_text = "#0" in columns
+        for number, (row_id, depth) in enumerate(rows):
+            if with_text:
+                item = self.item(row_id)
+                values = item.get("values") or ()
+            else:
+                values = self.item(row_id, "values") or ()
+            max_depth = max(max_depth, depth)
+            for column_id in columns:
+                if column_id == "#0":
+                    text = str(item.get("text", ""))
+                else:
+                    index = _colid2colindex(column_id)
+                    if index >= len(values):
+                        continue
+                    text = str(values[index])
+                if number in picked:
+                    sampled[column_id].add(text)
+                if text in kept[column_id]:
+                    continue
+                heap = longest[column_id]
+                if len(heap) < _AUTOFIT_CANDIDATES:
+                    heapq.heappush(heap, (len(text), text))
+                    kept[column_id].add(text)
+                elif len(text) > heap[0][0]:
+                    kept[column_id].discard(
+                        heapq.heapreplace(heap, (len(text), text))[1]
+                    )
+                    kept[column_id].add(text)
+            if (number + 1) % _AUTOFIT_READ_BATCH == 0:
+                yield True
+
+        # Besides the longest strings, measure a few sampled ones, which
+        # can be wider in proportional fonts
+        texts = {}
+        for column_id in columns:
+            others = sorted(sampled[column_id] - kept[column_id])
+            texts[column_id] = kept[column_id].union(
+                random.Random(0).sample(
+                    others, min(_AUTOFIT_CANDIDATES, len(others))
+                )
+            )
+
+        # Measure the heading and the candidates of each column
+        cell_font, heading_font = self._get_autofit_fonts()
+        widths = {}
+        for column_id in columns:
+            ref = self._column_ref(column_id)
+            heading = str(self.heading(ref, "text"))
+            width = _MEASURE_CACHE.measure(self, heading_font, heading)
+            for text in texts[column_id]:
+                width = max(
+                    width, _MEASURE_CACHE.measure(self, cell_font, text)
+                )
+                yield True
+            if column_id == "#0":
+                width += (max_depth + 1) * _TREE_INDENT
+            widths[column_id] = width + _AUTOFIT_PADDING
+
+        for column_id, width in widths.items():
+            self.column(self._column_ref(column_id), width=width)
+        self._autofit_widths.update(widths)
+        self._schedule_editor_reposition()
+        if on_done is not None:
+            on_done(widths)
+
+    def _refit_columns(self, texts: dict) -> None:
+        """Widen auto-fitted columns whose new texts no longer fit."""
+        if not texts:
+            return
+        cell_font, _ = self._get_autofit_fonts()
+        for column_id, column_texts in texts.items():
+            width = _AUTOFIT_PADDING + max(
+                _MEASURE_CACHE.measure(self, cell_font, str(text))
+                for text in column_texts
+            )
+            if width > self._autofit_widths[column_id]:
+                self._autofit_widths[column_id] = width
+                self.column(self._column_ref(column_id), width=width)
+
+    def set_data_source(self, source) -> None:
+        """
+        Show rows from a paged data source such as SQLiteDataSource.
+
+        Only a window of rows around the view is kept in the Treeview:
+        the visible rows plus one page above and below. Scrolling moves
+        the window, deleting the rows that leave it and inserting the
+        rows that enter it from the source's page cache, and the page
+        beyond the window in the scrolling direction is fetched on idle.
+        The scrollbar covers all rows of the source, so any position can
+        be reached directly. Opened nodes show their children as part
+        of the window. Selections of rows that leave the window are
+        lost, and an edit in progress is committed when its row leaves.
+        Read-only and combobox rules stored with the rows are applied to
+        editing, and edited values are written back in batches.
+
+        Parameters
+        ----------
+        source : SQLiteDataSource or None
+            Data source. None detaches the current source.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cancel_edit()
+        if self._data_source is not None:
+            self.flush_data_source()
+        for after_id in (self._source_after_id, self._source_prefetch_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._source_after_id = None
+        self._source_prefetch_after_id = None
+
+        self._data_source = None
+        self.delete(*self.get_children())
+        self._source_items = {}
+        self._source_open = {}
+        self._source_sizes = {}
+        self._source_rules = {}
+        self._source_top = 0
+        self._source_window = None
+        self._source_direction = 1
+        self._data_source = source
+        if source is None:
+            return
+
+        if not self["columns"]:
+            self.configure(columns=source.value_columns)
+        self._bind_node_open()
+        self._update_source_window(force=True)
+
+    def flush_data_source(self) -> None:
+        """
+        Write edits queued for the data source now.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._source_flush_after_id is not None:
+            self.after_cancel(self._source_flush_after_id)
+            self._source_flush_after_id = None
+        if self._data_source is not None:
+            self._data_source.flush()
+
+    def _queue_source_write(self, row_id: str, col_index: int, value) -> None:
+        """Queue an edited value for the data source row it came from."""
+        if self._data_source is None or row_id not in self._source_items:
+            return
+        if self._data_source.queue_write(row_id, col_index, value):
+            self.flush_data_source()
+        elif self._source_flush_after_id is None:
+            self._source_flush_after_id = self.after(
+                _SOURCE_FLUSH_MS, self.flush_data_source
+            )
+
+    def _source_row(self, parent: str, position: int):
+        """Return the source row at a position among a parent's children."""
+        page, offset = divmod(position, self._data_source.page_size)
+        return self._data_source.get_page(parent or None, page)[offset]
+
+    def _source_opened(self, parent: str) -> list:
+        """Return (position, row ID) of the opened children of a row."""
+        return sorted(
+            (position, row_id)
+            for row_id, (row_parent, position) in self._source_open.items()
+            if row_parent == parent
+        )
+
+    def _source_size(self, parent: str = "") -> int:
+        """Return the number of displayed rows below a row."""
+        size = self._source_sizes.get(parent)
+        if size is None:
+            size = self._data_source.child_count(parent or None) + sum(
+                self._source_size(row_id)
+                for _, row_id in self._source_opened(parent)
+            )
+            self._source_sizes[parent] = size
+        return size
+
+    def _source_path(self, index: int) -> list:
+        """
+        Return the path to a displayed row of the source.
+
+        Returns
+        -------
+        list
+            [parent, position] pairs from the top level down to the row;
+            the pairs before the last one locate its opened ancestors.
+
+        """
+        path = []
+        parent = ""
+        descended = True
+        while descended:
+            descended = False
+            for position, row_id in self._source_opened(parent):
+                if index <= position:
+                    break
+                size = self._source_size(row_id)
+                if index <= position + size:
+                    path.append([parent, position])
+                    parent, index = row_id, index - position - 1
+                    descended = True
+                    break
+                index -= size
+        path.append([parent, index])
+        return path
+
+    def _iter_source_rows(self, path: list):
+        """Yield (row, parent, position) in display order from a path."""
+        source = self._data_source
+        while path:
+            parent, position = path[-1]
+            if position >= source.child_count(parent or None):
+                path.pop()
+                if path:
+                    path[-1][1] += 1
+                continue
+            row = self._source_row(parent, position)
+            yield row, parent, position
+            if row.row_id in self._source_open:
+                path.append([row.row_id, 0])
+            else:
+                path[-1][1] += 1
+
+    def _source_view_rows(self) -> int:
+        """Return the number of rows that fit in the view."""
+        height = self._viewport_height or self.winfo_height()
+        return max(1, height // _SOURCE_ROW_HEIGHT)
+
+    def _update_source_window(self, force: bool = False) -> None:
+        """Move the window of inserted rows to cover the view."""
+        source = self._data_source
+        total = self._source_size()
+        view = self._source_view_rows()
+        top = self._source_top = max(0, min(self._source_top, total - view))
+        margin = source.page_size // 2
+        window = self._source_window
+        if (
+            not force
+            and window is not None
+            and window[0] <= max(0, top - margin)
+            and min(total, top + view + margin) <= window[1]
+        ):
+            return
+        start = max(0, top - source.page_size)
+        stop = min(total, top + view + source.page_size)
+
+        path = self._source_path(start)
+        ancestors = [
+            (self._source_row(parent, position), parent, position)
+            for parent, position in path[:-1]
+        ]
+        rows = ancestors + list(
+            islice(self._iter_source_rows(path), stop - start)
+        )
+        self._sync_source_rows(rows)
+        self._source_window = (start, stop, len(ancestors))
+
+        # Show the top row and read ahead in the scrolling direction
+        if rows:
+            super().yview("moveto", (len(ancestors) + top - start) / len(rows))
+        ahead = stop if self._source_direction > 0 else start - 1
+        if 0 <= ahead < total:
+            parent, position = self._source_path(ahead)[-1]
+            if self._source_prefetch_after_id is not None:
+                self.after_cancel(self._source_prefetch_after_id)
+            self._source_prefetch_after_id = self.after_idle(
+                self._prefetch_source_page,
+                parent or None,
+                position // source.page_size,
+            )
+
+    def _sync_source_rows(self, rows: list) -> None:
+        """Make the inserted rows match (row, parent, position) entries."""
+        wanted = {row.row_id for row, _, _ in rows}
+        if (
+            self._editing_cell
+            and self._editing_cell[0] in self._source_items
+            and self._editing_cell[0] not in wanted
+        ):
+            # The edited row leaves the window; commit the edit first
+            self._end_edit()
+        gone = [
+            row_id
+            for row_id, (parent, _) in self._source_items.items()
+            if row_id not in wanted
+            and (parent not in self._source_items or parent in wanted)
+        ]
+        if gone:
+            # Deleting a row also deletes its children
+            try:
+                super().delete(*gone)
+            except TclError:  # Some rows were deleted by the application
+                super().delete(*filter(self.exists, gone))
+            if self._selected:
+                self._selection_dirty = True
+            for row_id in [r for r in self._source_items if r not in wanted]:
+                del self._source_items[row_id]
+                self._source_rules.pop(row_id, None)
+                self._row_styles.pop(row_id, None)
+                self._typed_cache.pop(row_id, None)
+                self._parent_ids.discard(row_id)
+
+        styled = self._style_rules or self._readonly_style
+        counts = {}  # Parent -> wanted children passed so far
+        kept = set()  # Parents whose passed children include kept rows
+        for row, parent, position in rows:
+            index = counts.get(parent, 0)
+            counts[parent] = index + 1
+            if row.row_id in self._source_items:
+                kept.add(parent)
+                continue
+            if row.has_rules:
+                self._source_rules[row.row_id] = row
+            opened = row.row_id in self._source_open
+            kw = {"text": row.text, "values": row.values, "open": opened}
+            if styled:
+                styles = self._insert_style_tags(row.row_id, kw)
+                if styles:
+                    self._row_styles[row.row_id] = styles
+            # Rows entering ahead of the kept rows go before them
+            # Rows read from the source are not reported as changes
+            super().insert(
+                parent,
+                "end" if parent in kept else index,
+                iid=row.row_id,
+                **kw,
+            )
+            self._source_items[row.row_id] = (parent, position)
+            if parent:
+                self._parent_ids.add(parent)
+            if row.has_children and not opened:
+                placeholder = row.row_id + _PLACEHOLDER_SUFFIX
+                super().insert(row.row_id, "end", iid=placeholder)
+                self._parent_ids.add(row.row_id)
+
+    def _prefetch_source_page(self, source_parent, page: int) -> None:
+        """Read a page into the source cache ahead of scrolling."""
+        self._source_prefetch_after_id = None
+        if self._data_source is not None:
+            self._data_source.prefetch(source_parent, page)
+
+    def _open_source_node(self, item_id: str, opened: bool = True) -> None:
+        """Show or hide the children of a source row in the window."""
+        if item_id not in self._source_items:
+            return
+        if opened == (item_id in self._source_open):
+            return
+        placeholder = item_id + _PLACEHOLDER_SUFFIX
+        if opened:
+            self._source_open[item_id] = self._source_items[item_id]
+            if self.exists(placeholder):
+                super().delete(placeholder)
+        else:
+            del self._source_open[item_id]
+        self._source_sizes = {}
+        self._update_source_window(force=True)
+        if not opened and item_id in self._source_items:
+            if self._source_row(*self._source_items[item_id]).has_children:
+                super().insert(item_id, "end", iid=placeholder)
+
+    def _load_lazy_children(self, item_id: str) -> None:
+        """Replace the placeholder of an unloaded node with its children."""
+        if self._data_source is not None:
+            self._open_source_node(item_id)
+            return
+        if self._children_provider is None:
+            return
+        if item_id in self._children_tasks:
+            return
+        placeholder = item_id + _PLACEHOLDER_SUFFIX
+        if not self.exists(placeholder):
+            return
+        self.item(placeholder, text="Loading...")
+        self._children_tasks[item_id] = AsyncioBridge.for_widget(
+            self
+        ).create_task(self._load_children_async(item_id))
+
+    def _bind_node_open(self) -> None:
+        """Install the <<TreeviewOpen>> handler for lazy nodes once."""
+        if not self._open_bound:
+            super().bind("<<TreeviewOpen>>", self._on_node_open, add="+")
+            super().bind("<<TreeviewClose>>", self._on_node_close, add="+")
+            self._open_bound = True
+
+    def _on_node_open(self, event):  # pylint: disable=unused-argument
+        """Load the children of a node opened by the user."""
+        self._load_lazy_children(self.focus())
+
+    def _on_node_close(self, event):  # pylint: disable=unused-argument
+        """Drop the children of a source node closed by the user."""
+        if self._data_source is not None:
+            self._open_source_node(self.focus(), opened=False)
+
+    def _on_treeview_yscroll(self, first, last) -> None:
+        """Update the scrollbar and check whether more rows are needed."""
+        if self._data_source is None or self._source_window is None:
+            self.scrollbar_y.set(first, last)
+            return
+        # Map the fractions of the inserted rows to all rows of the source
+        first_row = self._source_row_at(first)
+        last_row = first_row + (float(last) - float(first)) * (
+            len(self._source_items)
+        )
+        total = max(1, self._source_size())
+        if self._follow_source_view(first_row):
+            if self._source_after_id is None:
+                self._source_after_id = self.after_idle(
+                    self._check_source_pages
+                )
+        self.scrollbar_y.set(
+            max(0.0, first_row / total), min(1.0, last_row / total)
+        )
+
+    def _source_row_at(self, fraction) -> float:
+        """Return the source row at a fraction of the inserted rows."""
+        start, _, ancestors = self._source_window
+        return start - ancestors + float(fraction) * len(self._source_items)
+
+    def _follow_source_view(self, first_row: float) -> bool:
+        """Take the top row from the Treeview; return True if it moved."""
+        top = max(0, round(first_row))
+        if top == self._source_top:
+            return False
+        self._source_direction = 1 if top > self._source_top else -1
+        self._source_top = top
+        return True
+
+    def _check_source_pages(self) -> None:
+        """Move the window after the Treeview scrolled by itself."""
+        self._source_after_id = None
+        if self._data_source is None:
+            return
+        if self._source_window is not None and self._source_items:
+            # The scroll notification may still be pending
+            self._follow_source_view(self._source_row_at(super().yview()[0]))
+        self._update_source_window()
+
+    async def insert_stream(
+        self,
+        rows,
+        parent: str = "",
+        budget_ms: int = _STREAM_BUDGET_MS,
+    ) -> int:
+        """
+        Insert rows from an async (or plain) iterable, chunked per frame.
+
+        Rows are inserted as they arrive. After ``budget_ms`` of inserting,
+        the coroutine sleeps for a frame so Tk can redraw and handle
+        input. Run it on the loop of an AsyncioBridge.
+
+        Parameters
+        ----------
+        rows : async iterable or iterable
+            Each row is a dict of insert() keyword arguments (such as
+            iid, text, values or lazy) or a sequence of values.
+        parent : str, optional
+            Parent item ID. The default is "" (top level).
+        budget_ms : int, optional
+            Longest time spent inserting per frame. The default is 8.
+
+        Returns
+        -------
+        int
+            Number of inserted rows.
+
+        """
+        count = 0
+        deadline = time.monotonic() + budget_ms / 1000
+        async for row in _as_async_iter(rows):
+            if isinstance(row, dict):
+                self.insert(parent, "end", **row)
+            else:
+                self.insert(parent, "end", values=row)
+            count += 1
+            if time.monotonic() >= deadline:
+                await asyncio.sleep(_FRAME_MS / 1000)
+                deadline = time.monotonic() + budget_ms / 1000
+        return count
+
+    def load_file(self, path, parent: str = "", **options) -> FileLoader:
+        """
+        Load a CSV or JSON Lines file in the background.
+
+        The file is parsed in parallel and inserted in file order, a
+        batch per frame, with one change set per batch whose source is
+        "load". See FileLoader for the options.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            File to load.
+        parent : str, optional
+            Item under which top-level rows are inserted.
+            The default is "" (top level).
+        **options : dict
+            Keyword arguments for FileLoader, such as path_column,
+            parent_column, on_progress or on_done.
+
+        Returns
+        -------
+        FileLoader
+            Started loader; call its cancel() method to stop loading.
+
+        """
+        loader = FileLoader(self, path, parent=parent, **options)
+        self._file_loaders.add(loader)
+        loader.start()
+        return loader
+
+    def set_children_provider(self, provider: Callable | None) -> None:
+        """
+        Load the children of lazy items when they are opened.
+
+        Parameters
+        ----------
+        provider : Callable or None
+            Called as ``provider(item_id)`` for items inserted with
+            ``lazy=True``. It returns rows for insert_stream, directly,
+            through an awaitable or as an async iterable. Coroutines run
+            on the AsyncioBridge of the widget, which is started if
+            needed. If it fails, the error is reported like one from an
+            event binding and the item closes; opening it again retries.
+            None removes the provider.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._children_provider = provider
+        if provider is not None:
+            self._bind_node_open()
+
+    def set_combobox_provider(
+        self, column_id: str, provider: Callable | None
+    ) -> None:
+        """
+        Fetch the combobox values of a column when editing starts.
+
+        The combobox opens at once with any values set through
+        set_combobox_*, and the provider's values replace them when they
+        arrive, unless the edit has ended by then.
+
+        Parameters
+        ----------
+        column_id : str
+            Column ID ("#n"). The column is set to use a combobox.
+        provider : Callable or None
+            Called as ``provider(cell_id_pair)`` and returns a list of
+            values or an awaitable of one. None removes the provider.
+
+        Returns
+        -------
+        None.
+
+        """
+        if provider is None:
+            self.combobox_column_providers.pop(column_id, None)
+            return
+        self.combobox_column_providers[column_id] = provider
+        self.combobox_columns.add(column_id)
+
+    async def _load_children_async(self, item_id: str) -> None:
+        """Insert the children of a lazy item from the children provider."""
+        placeholder = item_id + _PLACEHOLDER_SUFFIX
+        try:
+            rows = self._children_provider(item_id)
+            if inspect.isawaitable(rows):
+                rows = await rows
+            super().delete(placeholder)
+            await self.insert_stream(rows, parent=item_id)
+        except Exception:  # pylint: disable=broad-exception-caught
+            if self.exists(item_id):
+                # Put the placeholder back so opening the item retries
+                if self.exists(placeholder):
+                    self.item(placeholder, text="")
+                else:
+                    self.delete(*self.get_children(item_id))
+                    super().insert(item_id, "end", placeholder)
+                self.item(item_id, open=False)
+            self._report_exception()  # Tk prints it like a binding error
+        finally:
+            self._children_tasks.pop(item_id, None)
+
+    async def _fill_combobox(self, cell_id_pair: tuple, provider) -> None:
+        """Show values from a combobox provider in the active editor."""
+        values = provider(cell_id_pair)
+        if inspect.isawaitable(values):
+            values = await values
+        if self._editing_cell == cell_id_pair:
+            self._editing_combobox_values = list(values)
+            self.combobox["values"] = self._editing_combobox_values
+
+    @property
+    def _tracking_changes(self) -> bool:
+        """Return True if anyone receives change sets."""
+        return bool(self._change_listeners) or self._change_event_bound
+
+    def subscribe(self, callback: Callable) -> None:
+        """
+        Receive change sets of cells, rows and rules.
+
+        Changes are collected and delivered together once per frame, or
+        when the outermost transaction() ends, as a tuple of Change
+        records. A <<CellsChanged>> virtual event is generated at the
+        same time; its change set is in ``last_change_set``. Nothing is
+        recorded while there are no subscribers and no binding for
+        <<CellsChanged>>. An exception raised by a callback is reported
+        like one from an event binding and does not stop the others.
+
+        Parameters
+        ----------
+        callback : Callable
+            Called with a tuple of Change records.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._change_listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Stop delivering change sets to a subscribed callback."""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    @contextmanager
+    def transaction(self, source: str = "api"):
+        """
+        Deliver all changes made inside the block as one change set.
+
+        Parameters
+        ----------
+        source : str, optional
+            Source recorded for changes made through the Treeview API
+            inside the block. The default is "api".
+
+        Yields
+        ------
+        TreeviewEx
+            This widget.
+
+        """
+        self._change_sources.append(source)
+        try:
+            yield self
+        finally:
+            self._change_sources.pop()
+            if not self._change_sources:
+                self.flush_changes()
+
+    def flush_changes(self) -> None:
+        """
+        Deliver the changes collected so far now.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._changes_after_id is not None:
+            self.after_cancel(self._changes_after_id)
+            self._changes_after_id = None
+        if not self._changes:
+            return
+        changes = tuple(self._changes)
+        self._changes = []
+        self.last_change_set = changes
+        for callback in list(self._change_listeners):
+            # A failing subscriber must not keep the others from running
+            try:
+                callback(changes)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self._report_exception()  # Tk prints it like a binding error
+        if self._change_event_bound:
+            self.event_generate("<<CellsChanged>>")
+
+    def _record_change(
+        self, kind: str, row, column, old, new, source: str | None = None
+    ) -> None:
+        """Collect a change and schedule delivery on the next frame."""
+        if source is None:
+            source = self._change_sources[-1] if self._change_sources else "api"
+        self._changes.append(Change(kind, row, column, old, new, source))
+        if not self._change_sources and self._changes_after_id is None:
+            self._changes_after_id = self.after(_FRAME_MS, self.flush_changes)
+
+    def _record_value_changes(self, row_id: str, old, new) -> None:
+        """Collect a cell change for each value that differs."""
+        old = () if old == "" else tuple(old)
+        new = (new,) if isinstance(new, str) else tuple(new)
+        for col_index in range(max(len(old), len(new))):
+            old_value = old[col_index] if col_index < len(old) else ""
+            new_value = new[col_index] if col_index < len(new) else ""
+            if str(old_value) != str(new_value):
+                self._record_change(
+                    "cell", row_id, f"#{col_index + 1}", old_value, new_value
+                )
+
+    def _record_rule(self, kind: str, row, column, old, new) -> None:
+        """Collect a read-only or combobox rule change."""
+        if self._tracking_changes and bool(old) != bool(new):
+            self._record_change(kind, row, column, bool(old), bool(new))
+
+    def _column_id(self, column) -> str:
+        """Return the "#n" ID of a data column given by ID, index or name."""
+        if isinstance(column, int):
+            return f"#{column + 1}"
+        if str(column).startswith("#"):
+            return str(column)
+        return f"#{list(self['columns']).index(column) + 1}"
+
+    def selection_set(self, *items):
+        """
+        Override selection_set.
+
+        Parameters
+        ----------
+        *items : str
+            Item IDs.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._selection_dirty = True
+        super().selection_set(*items)
+
+    def selection_add(self, *items):
+        """
+        Override selection_add.
+
+        Parameters
+        ----------
+        *items : str
+            Item IDs.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._selection_dirty = True
+        super().selection_add(*items)
+
+    def selection_remove(self, *items):
+        """
+        Override selection_remove.
+
+        Parameters
+        ----------
+        *items : str
+            Item IDs.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._selection_dirty = True
+        super().selection_remove(*items)
+
+    def selection_toggle(self, *items):
+        """
+        Override selection_toggle.
+
+        Parameters
+        ----------
+        *items : str
+            Item IDs.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._selection_dirty = True
+        super().selection_toggle(*items)
+
+    def selected_items(self) -> frozenset:
+        """
+        Return the selected item IDs as a set.
+
+        The selection is read from Tk at most once per selection change,
+        so repeated queries and membership tests are O(1).
+
+        Returns
+        -------
+        frozenset
+            Selected item IDs.
+
+        """
+        if self._selection_dirty:
+            self._selected = frozenset(super().selection())
+            self._selection_dirty = False
+        return self._selected
+
+    def is_selected(self, item_id: str) -> bool:
+        """Return True if the item is selected."""
+        return item_id in self.selected_items()
+
+    def select_range(self, first: str, last: str, mode: str = "set") -> int:
+        """
+        Select the displayed rows from one item to another.
+
+        Parameters
+        ----------
+        first : str
+            Item ID at one end of the range.
+        last : str
+            Item ID at the other end of the range.
+        mode : str, optional
+            "set", "add", "remove" or "toggle". The default is "set".
+
+        Returns
+        -------
+        int
+            Number of rows in the range.
+
+        """
+        parent = self.parent(first)
+        if parent == self.parent(last):
+            siblings = self.get_children(parent)
+            start, stop = sorted((siblings.index(first), siblings.index(last)))
+            items = siblings[start : stop + 1]
+        else:
+            items = []
+            ends = {first, last}
+            for item_id in self._displayed_rows():
+                if items or item_id in ends:
+                    items.append(item_id)
+                    if len(items) > 1 and item_id in ends:
+                        break
+        self._apply_selection(mode, items)
+        return len(items)
+
+    def select_subtree(
+        self, item_id: str, include_self: bool = True, mode: str = "set"
+    ) -> int:
+        """
+        Select an item and all of its descendants.
+
+        Parameters
+        ----------
+        item_id : str
+            Item ID.
+        include_self : bool, optional
+            Also select the item itself. The default is True.
+        mode : str, optional
+            "set", "add", "remove" or "toggle". The default is "set".
+
+        Returns
+        -------
+        int
+            Number of affected items.
+
+        """
+        items = self._descendants(item_id)
+        if include_self and item_id:
+            items.insert(0, item_id)
+        self._apply_selection(mode, items)
+        return len(items)
+
+    def select_where(
+        self, predicate: Callable, parent: str = "", mode: str = "set"
+    ) -> int:
+        """
+        Select the items for which ``predicate(item_id, values)`` is true.
+
+        Parameters
+        ----------
+        predicate : Callable
+            Called with each descendant of parent and its values.
+        parent : str, optional
+            Item whose descendants are tested. The default is "" (all).
+        mode : str, optional
+            "set", "add", "remove" or "toggle". The default is "set".
+
+        Returns
+        -------
+        int
+            Number of matching items.
+
+        """
+        items = [
+            item_id
+            for item_id in self._descendants(parent)
+            if predicate(item_id, self.item(item_id, "values"))
+        ]
+        self._apply_selection(mode, items)
+        return len(items)
+
+    def select_all(self, parent: str = "") -> int:
+        """Select every descendant of parent and return their number."""
+        return self.select_subtree(parent, include_self=False)
+
+    def invert_selection(self, parent: str = "") -> int:
+        """Toggle every descendant of parent; return the selection size."""
+        self._apply_selection("toggle", self._descendants(parent))
+        return len(self._selected)
+
+    def apply_to_selection(
+        self, func: Callable, source: str = "selection"
+    ) -> int:
+        """
+        Call ``func(item_id)`` for every selected item.
+
+        The calls run in one transaction, so subscribers receive their
+        changes as one change set. The order of the items is undefined.
+
+        Parameters
+        ----------
+        func : Callable
+            Called with each selected item ID.
+        source : str, optional
+            Source of the recorded changes. The default is "selection".
+
+        Returns
+        -------
+        int
+            Number of processed items.
+
+        """
+        selected = self.selected_items()
+        with self.transaction(source):
+            for item_id in selected:
+                func(item_id)
+        return len(selected)
+
+    def _on_select(self, event):  # pylint: disable=unused-argument
+        """Mark the Python-side selection stale."""
+        if self._own_select_events:
+            # The copy was already updated by _apply_selection
+            self._own_select_events -= 1
+            return
+        self._selection_dirty = True
+
+    def _apply_selection(self, mode: str, items) -> None:
+        """Change the selection with one Tcl call and update the copy."""
+        if mode not in _SELECTION_MODES:
+            raise ValueError(f"Invalid selection mode: {mode}")
+        current = self.selected_items()
+        items = tuple(items)
+        self.tk.call(self._w, "selection", mode, items)
+        if mode == "set":
+            self._selected = frozenset(items)
+        elif mode == "add":
+            self._selected = current.union(items)
+        elif mode == "remove":
+            self._selected = current.difference(items)
+        else:
+            self._selected = current.symmetric_difference(items)
+        self._selection_dirty = False
+        if self._selected != current:
+            # Tk queues <<TreeviewSelect>> for every change
+            self._own_select_events += 1
+
+    def _descendants(self, item_id: str) -> list:
+        """Return all descendants of an item, without lazy placeholders."""
+        result = []
+        pending = [item_id]
+        while pending:
+            children = [
+                child
+                for child in self.get_children(pending.pop())
+                if not child.endswith(_PLACEHOLDER_SUFFIX)
+            ]
+            result.extend(children)
+            # Leaves are not asked for their children
+            pending.extend(
+                child for child in children if child in self._parent_ids
+            )
+        return result
+
+    def _displayed_rows(self, parent: str = ""):
+        """Yield the rows under open nodes in display order."""
+        for item_id in self.get_children(parent):
+            if item_id.endswith(_PLACEHOLDER_SUFFIX):
+                continue
+            yield item_id
+            if self.item(item_id, "open"):
+                yield from self._displayed_rows(item_id)
+
+    def set_drag_and_drop(
+        self,
+        enabled: bool = True,
+        reparent: bool = True,
+        validator: Callable | None = None,
+    ) -> None:
+        """
+        Let the user move rows by dragging them.
+
+        Dragging a selected row moves every selected row. Read-only rows
+        are not dragged, rows cannot be dropped into their own subtree,
+        and the view scrolls while the pointer is near the top or bottom
+        edge. A drop moves all rows with one Tcl call and reports the
+        moves as one change set with the source "drag".
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            True to enable, False to disable. The default is True.
+        reparent : bool, optional
+            Allow dropping rows onto the middle of a row to make them its
+            children. The default is True.
+        validator : Callable, optional
+            Called as ``validator(items, parent, index)`` for each drop
+            position; a false result rejects it. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._drag_enabled = enabled
+        self._drag_reparent = reparent
+        self._drop_validator = validator
+        if not enabled:
+            self._cancel_drag()
+        elif not self._drag_bound:
+            super().bind("<ButtonPress-1>", self._on_drag_press, add="+")
+            super().bind("<B1-Motion>", self._on_drag_motion, add="+")
+            super().bind("<ButtonRelease-1>", self._on_drag_release, add="+")
+            super().bind("<Escape>", self._cancel_drag, add="+")
+            self.tag_configure(_DROP_TAG, background=_DROP_COLOR)
+            self._drag_bound = True
+
+    def _on_drag_press(self, event: Event):
+        """Remember a button press that may start a drag."""
+        self._drag_press = None
+        if not self._drag_enabled:
+            return None
+        if self.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None
+        if "indicator" in str(self.identify_element(event.x, event.y)):
+            return None
+        item_id = self.identify_row(event.y)
+        if not item_id:
+            return None
+        state = event.state if isinstance(event.state, int) else 0
+        keep = (
+            not state & _MODIFIER_MASK
+            and len(self.selected_items()) > 1
+            and self.is_selected(item_id)
+        )
+        self._drag_press = (item_id, event.x, event.y, keep)
+        # Keep a multiple selection so that all of it can be dragged
+        return "break" if keep else None
+
+    def _on_drag_motion(self, event: Event) -> None:
+        """Start a drag past the threshold and track the pointer."""
+        if self._drag_press is None:
+            return
+        self._drag_y = event.y
+        if self._drag_items is None:
+            item_id, x, y, _ = self._drag_press
+            if (
+                abs(event.x - x) < _DRAG_THRESHOLD
+                and abs(event.y - y) < _DRAG_THRESHOLD
+            ):
+                return
+            if not self._start_drag(item_id):
+                self._drag_press = None
+                return
+        if self._drag_after_id is None:
+            self._drag_after_id = self.after(_FRAME_MS, self._drag_frame)
+
+    def _on_drag_release(self, event: Event) -> None:
+        """Drop the dragged rows, or finish a click without a drag."""
+        press, self._drag_press = self._drag_press, None
+        if press is None:
+            return
+        item_id, _, _, keep = press
+        if self._drag_items is None:
+            if keep:
+                # The press kept the selection; a plain click selects one
+                self._select_only(item_id)
+                self.focus(item_id)
+            return
+        target = self._drop_target(event.y)
+        items = self._drag_items
+        self._cancel_drag()
+        if target is None:
+            return
+        parent, index, _, position = target
+        self.move_items(items, parent, index, source="drag")
+        if position == "into":
+            self.item(parent, open=True)
+        self.see(items[0])
+
+    def _start_drag(self, item_id: str) -> bool:
+        """Collect the rows dragged from a pressed row."""
+        selected = self.selected_items()
+        items = [
+            row_id
+            for row_id in (selected if item_id in selected else (item_id,))
+            if not self._is_readonly_row(row_id)
+        ]
+        entries = self._top_level_items(items)
+        if not entries:
+            return False
+        self._drag_items = [row_id for row_id, _, _ in entries]
+        self._drag_set = frozenset(self._drag_items)
+        return True
+
+    def _cancel_drag(self, event=None):  # pylint: disable=unused-argument
+        """Stop a drag without moving anything."""
+        if self._drag_after_id is not None:
+            self.after_cancel(self._drag_after_id)
+            self._drag_after_id = None
+        self._drag_press = None
+        self._drag_items = None
+        self._drag_set = frozenset()
+        self._show_drop_target(None)
+
+    def _drag_frame(self) -> None:
+        """Scroll near the edges and move the drop indicator."""
+        self._drag_after_id = None
+        if self._drag_items is None:
+            return
+        direction = 0
+        if (
+            self._drag_y < _DRAG_SCROLL_MARGIN
+            or self.identify_region(0, self._drag_y) == "heading"
+        ):
+            direction = -1
+        elif self._drag_y > self.winfo_height() - _DRAG_SCROLL_MARGIN:
+            direction = 1
+        if direction:
+            self.yview_scroll(direction, "units")
+            self._schedule_editor_reposition()
+        self._show_drop_target(self._drop_target(self._drag_y))
+        if direction:
+            # Keep scrolling while the pointer rests near the edge
+            self._drag_after_id = self.after(_DRAG_SCROLL_MS, self._drag_frame)
+
+    def _drop_target(self, y: int):
+        """
+        Return the drop position for a pointer position.
+
+        Returns
+        -------
+        tuple or None
+            (parent, index, row, position) where position is "before",
+            "after", "into" or "end", or None if the rows cannot be
+            dropped there.
+
+        """
+        row_id = self.identify_row(y)
+        if row_id.endswith(_PLACEHOLDER_SUFFIX):
+            return None
+        if not row_id:
+            if self.identify_region(0, y) != "nothing":
+                return None  # Over the heading
+            # Below the last row
+            parent, index, position = "", "end", "end"
+        else:
+            bbox = self.bbox(row_id)
+            if not bbox:
+                return None
+            _, top, _, height = bbox
+            offset = (y - top) / max(1, height)
+            if self._drag_reparent and 0.25 <= offset < 0.75:
+                parent, index, position = row_id, "end", "into"
+            else:
+                parent = self.parent(row_id)
+                index = self.index(row_id) + (offset >= 0.5)
+                position = "after" if offset >= 0.5 else "before"
+            ancestor = parent
+            while ancestor:
+                if ancestor in self._drag_set:
+                    return None  # Into the dragged rows' own subtree
+                ancestor = self.parent(ancestor)
+        if self._drop_validator is not None and not self._drop_validator(
+            tuple(self._drag_items), parent, index
+        ):
+            return None
+        return (parent, index, row_id, position)
+
+    def _show_drop_target(self, target) -> None:
+        """Highlight the target row or draw a line between rows."""
+        row_id = target[2] if target and target[3] == "into" else ""
+        if row_id != self._drop_row:
+            if self._drop_row and self.exists(self._drop_row):
+                self.tk.call(
+                    self._w, "tag", "remove", _DROP_TAG, self._drop_row
+                )
+            if row_id:
+                self.tk.call(self._w, "tag", "add", _DROP_TAG, row_id)
+            self._drop_row = row_id
+        bbox = self.bbox(target[2]) if target and target[2] else ""
+        if not bbox or target[3] not in ("before", "after"):
+            if self._drop_indicator is not None:
+                self._drop_indicator.place_forget()
+            return
+        _, top, _, height = bbox
+        y = top if target[3] == "before" else top + height
+        if self._drop_indicator is None:
+            # Created on the first drag; most trees are never dragged
+            self._drop_indicator = Frame(self, height=2, background=_DROP_COLOR)
+        self._drop_indicator.place(x=0, y=y - 1, relwidth=1.0, height=2)
+
+    def _is_readonly_row(self, row_id: str) -> bool:
+        """Return True if the whole row is read-only."""
+        if row_id in self.readonly_rows:
+            return True
+        rule = self._source_rules.get(row_id)
+        return rule is not None and rule.readonly
+
+    def add_style_rule(self, tag: str, predicate: Callable, **options):
+        """
+        Tag the rows whose values match a predicate.
+
+        Tags are computed when rows are inserted and recomputed only for
+        rows whose values change; the updates are applied in batches
+        once per frame. ttk.Treeview styles whole rows, so rules apply
+        to rows rather than single cells.
+
+        Parameters
+        ----------
+        tag : str
+            Tag added to matching rows. Adding a rule with the same tag
+            replaces the previous rule.
+        predicate : Callable
+            Called as ``predicate(values)`` with the row values. An
+            exception counts as no match.
+        **options : dict
+            Options for tag_configure(), e.g. background or font.
+
+        Returns
+        -------
+        None.
+
+        """
+        if options:
+            self.tag_configure(tag, **options)
+        self._style_rules[tag] = predicate
+        self.refresh_styles()
+
+    def remove_style_rule(self, tag: str) -> None:
+        """Remove a style rule and its tag from the rows."""
+        if self._style_rules.pop(tag, None) is not None:
+            self._queue_restyle(
+                row_id
+                for row_id, tags in self._row_styles.items()
+                if tag in tags
+            )
+
+    def set_readonly_style(self, enabled: bool = True, **options) -> None:
+        """
+        Style read-only rows with the "readonly" tag.
+
+        Rows set with set_readonly_row() and read-only rows of the data
+        source get the tag without further configuration.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            True to enable, False to remove the tag. The default is True.
+        **options : dict
+            Options for tag_configure(). The default is a light gray
+            background.
+
+        Returns
+        -------
+        None.
+
+        """
+        if enabled:
+            self.tag_configure(
+                _READONLY_TAG, **(options or {"background": _READONLY_COLOR})
+            )
+        if enabled == self._readonly_style:
+            return
+        self._readonly_style = enabled
+        self._queue_restyle(
+            row_id
+            for row_id in self.readonly_rows.union(self._source_rules)
+            if self._is_readonly_row(row_id)
+        )
+
+    def refresh_styles(self, rows=None) -> None:
+        """
+        Recompute the style tags of rows in batches.
+
+        Call this when rules depend on something other than row values,
+        such as the current date.
+
+        Parameters
+        ----------
+        rows : iterable of str, optional
+            Row IDs. The default is all rows.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._queue_restyle(self._descendants("") if rows is None else rows)
+
+    def _style_tags(self, row_id, values) -> tuple:
+        """Return the style tags matching a row."""
+        tags = []
+        for tag, predicate in self._style_rules.items():
+            try:
+                if predicate(values):
+                    tags.append(tag)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+        if self._readonly_style and self._is_readonly_row(row_id):
+            tags.append(_READONLY_TAG)
+        return tuple(tags)
+
+    def _insert_style_tags(self, iid, kw: dict) -> tuple:
+        """Add the style tags of a new row to its insert options."""
+        self._style_dirty.pop(iid, None)
+        styles = self._style_tags(iid, kw.get("values", ()))
+        if styles:
+            tags = kw.get("tags", ())
+            if isinstance(tags, str):
+                tags = self.tk.splitlist(tags)
+            kw["tags"] = (*tags, *styles)
+        return styles
+
+    def _queue_restyle(self, rows) -> None:
+        """Schedule recomputing the style tags of rows."""
+        if not (self._style_rules or self._readonly_style or self._row_styles):
+            return
+        self._style_dirty.update(dict.fromkeys(rows))
+        if self._style_dirty and self._style_after_id is None:
+            self._style_after_id = self.after(_FRAME_MS, self._apply_styles)
+
+    def _apply_styles(self) -> None:
+        """Apply the tag changes of one batch of rows."""
+        self._style_after_id = None
+        added = {}  # Tag -> rows
+        removed = {}
+        for row_id in list(islice(self._style_dirty, _STYLE_BATCH)):
+            del self._style_dirty[row_id]
+            try:
+                values = super().item(row_id, "values")
+            except TclError:  # The row was deleted
+                self._row_styles.pop(row_id, None)
+                continue
+            old = self._row_styles.get(row_id, ())
+            new = self._style_tags(row_id, values)
+            if new == old:
+                continue
+            for tag in new:
+                if tag not in old:
+                    added.setdefault(tag, []).append(row_id)
+            for tag in old:
+                if tag not in new:
+                    removed.setdefault(tag, []).append(row_id)
+            if new:
+                self._row_styles[row_id] = new
+            else:
+                del self._row_styles[row_id]
+        for tag, rows in removed.items():
+            self.tk.call(self._w, "tag", "remove", tag, rows)
+        for tag, rows in added.items():
+            self.tk.call(self._w, "tag", "add", tag, rows)
+        if self._style_dirty:
+            self._style_after_id = self.after(_FRAME_MS, self._apply_styles)
@@ -0,0 +1,271 @@
+# python3
+"""Background runner for edit validators of TreeviewEx."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import count
+from queue import Empty, SimpleQueue
+from typing import Callable
+
+__all__ = ["ValidationRunner"]
+
+
+class ValidationRunner:
+    """
+    Run validators off the Tk thread with a limit on concurrent jobs.
+
+    Plain callables run on a thread pool and coroutine functions run on
+    an asyncio event loop. Coroutine jobs share one semaphore on that
+    loop, and validate_each_async jobs take it for each call, so at most
+    max_concurrent coroutine validations run at once. Results are
+    collected with poll(), which must be called from the thread that
+    owns the widgets.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        executor: Executor | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        """
+        Initialize the runner.
+
+        Parameters
+        ----------
+        max_concurrent : int, optional
+            Jobs running at the same time; more are queued.
+            The default is 4.
+        executor : concurrent.futures.Executor, optional
+            Executor for plain callables. The default is a thread pool
+            created on first use.
+        loop : asyncio.AbstractEventLoop, optional
+            Running loop for coroutine functions. The default is a loop
+            on a daemon thread started on first use.
+
+        Returns
+        -------
+        None.
+
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self._max_concurrent = max_concurrent
+        self._semaphore = None  # Created on the loop by the first job
+        self._executor = executor
+        self._own_executor = executor is None
+        self._loop = loop
+        self._own_loop = loop is None
+        self._loop_thread = None
+        self._tokens = count(1)
+        self._queued = deque()  # (token, func, args) waiting for a slot
+        self._running = {}  # token -> concurrent.futures.Future
+        self._done = SimpleQueue()  # Finished (token, future) pairs
+
+    @property
+    def max_concurrent(self) -> int:
+        """Return the number of jobs or calls allowed at the same time."""
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if value != self._max_concurrent:
+            self._max_concurrent = value
+            self._semaphore = None  # Jobs started later use the new limit
+            self._start_queued()
+
+    @property
+    def executor(self) -> Executor | None:
+        """Return the executor passed in, or None for the own pool."""
+        return None if self._own_executor else self._executor
+
+    @property
+    def busy(self) -> bool:
+        """Return True while jobs are queued, running or not yet polled."""
+        return bool(self._queued or self._running)
+
+    def submit(self, func: Callable, *args) -> int:
+        """
+        Queue ``func(*args)`` and return a token identifying the job.
+
+        Parameters
+        ----------
+        func : Callable
+            Plain function or coroutine function.
+        *args : Any
+            Arguments passed to func.
+
+        Returns
+        -------
+        int
+            Job token.
+
+        """
+        token = next(self._tokens)
+        self._queued.append((token, func, args))
+        self._start_queued()
+        return token
+
+    def cancel(self, token: int) -> None:
+        """Drop a queued job or cancel a running one; it is never polled."""
+        future = self._running.pop(token, None)
+        if future is not None:
+            future.cancel()
+            self._start_queued()
+            return
+        for job in self._queued:
+            if job[0] == token:
+                self._queued.remove(job)
+                break
+
+    def poll(self) -> list:
+        """
+        Return finished jobs and start queued ones in their slots.
+
+        Returns
+        -------
+        list
+            (token, result, error) tuples; error is the exception raised
+            by the job, or None.
+
+        """
+        finished = []
+        while True:
+            try:
+                token, future = self._done.get_nowait()
+            except Empty:
+                break
+            if self._running.get(token) is not future:
+                continue  # Cancelled
+            del self._running[token]
+            error = future.exception()
+            result = None if error is not None else future.result()
+            finished.append((token, result, error))
+        self._start_queued()
+        return finished
+
+    def shutdown(self) -> None:
+        """
+        Cancel every job and stop the executor and loop owned here.
+
+        The private loop thread is joined and the loop closed; a
+        coroutine that blocks its loop delays the return.
+        """
+        self._queued.clear()
+        for future in self._running.values():
+            future.cancel()
+        self._running.clear()
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._own_loop and self._loop is not None:
+            loop, self._loop = self._loop, None
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join()
+            self._loop_thread = None
+            # Let cancelled coroutines finish before closing the loop
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            loop.close()
+
+    def _start_queued(self) -> None:
+        """Start queued jobs while slots are free."""
+        while self._queued and len(self._running) < self.max_concurrent:
+            token, func, args = self._queued.popleft()
+            future = self._start(func, args)
+            self._running[token] = future
+            future.add_done_callback(
+                lambda f, token=token: self._done.put((token, f))
+            )
+
+    def _start(self, func: Callable, args: tuple) -> Future:
+        """Start one job on the loop or the executor."""
+        if inspect.iscoroutinefunction(func):
+            return asyncio.run_coroutine_threadsafe(
+                self._run_limited(func, args), self._get_loop()
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent,
+                thread_name_prefix="treeviewex-validation",
+            )
+        return self._executor.submit(func, *args)
+
+    async def _run_limited(self, func: Callable, args: tuple):
+        """Run a coroutine job under the semaphore shared by all jobs."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        if func is validate_each_async:
+            # Batches take the semaphore per call, not for the whole job
+            return await func(*args, semaphore=self._semaphore)
+        async with self._semaphore:
+            return await func(*args)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop, starting a private one if needed."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="treeviewex-validation-loop",
+                daemon=True,
+            )
+            self._loop_thread.start()
+        return self._loop
+
+
+def validate_each(validator: Callable, items: list) -> list:
+    """
+    Run a plain validator over (cell_id_pair, value) items in order.
+
+    An exception rejects only the item that raised it.
+    """
+    results = []
+    for cell_id_pair, value in items:
+        try:
+            results.append(bool(validator(cell_id_pair, value)))
+        except Exception:  # pylint: disable=broad-exception-caught
+            results.append(False)
+    return results
+
+
+async def validate_each_async(
+    validator: Callable,
+    items: list,
+    max_concurrent: int = 4,
+    semaphore: asyncio.Semaphore | None = None,
+) -> list:
+    """
+    Run a coroutine validator over (cell_id_pair, value) concurrently.
+
+    At most max_concurrent calls run at the same time, or as many as
+    the given semaphore allows when it is shared with other jobs. An
+    exception rejects only the item that raised it.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def validate(cell_id_pair, value):
+        async with semaphore:
+            return await validator(cell_id_pair, value)
+
+    results = await asyncio.gather(
+        *(validate(cell_id_pair, value) for cell_id_pair, value in items),
+        return_exceptions=True,
+    )
+    return [
+        not isinstance(result, BaseException) and bool(result)
+        for result in results
+    ]
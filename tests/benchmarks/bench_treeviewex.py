@@ -0,0 +1,527 @@
+# python3
+"""
+Performance benchmarks for TreeviewEx.
+
+Run against a real Tk (headless with Xvfb)::
+
+    xvfb-run -a python tests/benchmarks/bench_treeviewex.py --output bench.json
+
+or against the call-counting fake backend, which needs no display::
+
+    python tests/benchmarks/bench_treeviewex.py --backend fake
+
+Compare a run with a stored baseline and fail on regressions::
+
+    python tests/benchmarks/bench_treeviewex.py --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_tk import FakeRoot, fire_event  # noqa: E402
+
+from treeviewex import TreeviewEx  # noqa: E402
+
+DEFAULT_THRESHOLD = 0.25
+FLAT_ROWS = 100_000
+DEEP_LEVELS = 10
+DEEP_BRANCHING = 3
+WIDE_COLUMNS = 500
+WIDE_ROWS = 1_000
+EDIT_CYCLES = 2_000
+CELL_TYPE_LOOKUPS = 100_000
+CELL_TYPE_RULES = 10_000
+SCROLL_STEPS = 2_000
+SELECTION_QUERIES = 100_000
+MOVED_ROWS = 5_000
+STYLED_EDITS = 5_000
+LOADED_ROWS = 100_000
+STARTUP_TREES = 60
+STARTUP_EDITED = 3
+FRAME_MS = 16
+
+
+class Benchmark:
+    """One named benchmark with optional setup."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable,
+        setup: Callable | None = None,
+    ):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+class Context:
+    """Owns the Tk root and the widget under test for one repeat."""
+
+    def __init__(self, backend: str, scale: float):
+        self.backend = backend
+        self.scale = scale
+        self.root = FakeRoot() if backend == "fake" else _create_tk_root()
+        self.tree = None
+
+    def scaled(self, count: int) -> int:
+        """Return ``count`` multiplied by the scale factor (at least 1)."""
+        return max(1, int(count * self.scale))
+
+    def new_tree(self, columns: int = 5) -> TreeviewEx:
+        """Create a fresh TreeviewEx with ``columns`` data columns."""
+        if self.tree is not None:
+            self.tree.frame.destroy()
+        self.tree = TreeviewEx(self.root)
+        self.tree.pack(fill="both", expand=True)
+        self.tree["columns"] = tuple(f"c{i}" for i in range(columns))
+        for column in self.tree["columns"]:
+            self.tree.column(column, width=80)
+        return self.tree
+
+    def calls(self) -> int | None:
+        """Return the Tcl call count, or None on a real Tk."""
+        if self.backend == "fake":
+            return self.root.tk.total_calls
+        return None
+
+    def idle(self) -> None:
+        """Let pending idle callbacks and redraws run."""
+        self.root.update_idletasks()
+
+    def frame(self) -> None:
+        """Let one display frame (16 ms) of timers and redraws run."""
+        if self.backend == "fake":
+            self.root.tk.run_timers(advance_ms=FRAME_MS)
+        else:
+            time.sleep(FRAME_MS / 1000)
+            self.root.update()
+
+    def close(self) -> None:
+        """Destroy the Tk root."""
+        self.root.destroy()
+
+
+def _create_tk_root():
+    from tkinter import Tk  # pylint: disable=import-outside-toplevel
+
+    root = Tk()
+    root.geometry("1000x600")
+    return root
+
+
+# Synthetic trees --------------------------------------------------------
+
+
+def build_flat(ctx: Context, rows: int | None = None) -> TreeviewEx:
+    """Insert a flat list of rows."""
+    tree = ctx.new_tree()
+    insert = tree.insert
+    for i in range(rows or ctx.scaled(FLAT_ROWS)):
+        insert("", "end", iid=f"r{i}", values=(i, f"name{i}", "a", "b", "c"))
+    return tree
+
+
+def build_deep(ctx: Context) -> TreeviewEx:
+    """Insert a tree ``DEEP_LEVELS`` levels deep."""
+    tree = ctx.new_tree()
+    branching = DEEP_BRANCHING if ctx.scale >= 0.5 else 2
+    levels = DEEP_LEVELS
+    parents = [""]
+    for level in range(levels):
+        children = []
+        for parent in parents:
+            for i in range(branching):
+                children.append(
+                    tree.insert(
+                        parent,
+                        "end",
+                        iid=f"{parent}/{i}" if parent else f"n{i}",
+                        values=(level, i, "", "", ""),
+                    )
+                )
+        parents = children
+    return tree
+
+
+def build_wide(ctx: Context) -> TreeviewEx:
+    """Insert rows into a tree with ``WIDE_COLUMNS`` columns."""
+    tree = ctx.new_tree(columns=WIDE_COLUMNS)
+    values = tuple(range(WIDE_COLUMNS))
+    for i in range(ctx.scaled(WIDE_ROWS)):
+        tree.insert("", "end", iid=f"w{i}", values=values)
+    return tree
+
+
+# Benchmarks -------------------------------------------------------------
+
+
+def _expand_collapse(ctx: Context) -> None:
+    tree = ctx.tree
+    for root_item in tree.get_children():
+        tree._context_menu_target_item = root_item
+        tree._expand_all_children()
+        tree._collapse_all_children()
+    ctx.idle()
+
+
+def _setup_edit(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(10_000))
+    ctx.idle()
+
+
+def _edit_cycles(ctx: Context) -> None:
+    tree = ctx.tree
+    rows = tree.get_children()[:10]
+    for i in range(ctx.scaled(EDIT_CYCLES)):
+        cell = (rows[i % len(rows)], f"#{i % 5 + 1}")
+        tree.start_edit(cell)
+        tree.entry.delete(0, "end")
+        tree.entry.insert(0, f"v{i}")
+        tree.update_cell(cell, tree.entry)
+    ctx.idle()
+
+
+def _setup_cell_type(ctx: Context) -> None:
+    tree = ctx.new_tree()
+    rules = ctx.scaled(CELL_TYPE_RULES)
+    for i in range(rules):
+        tree.set_readonly_cell((f"r{i}", "#1"))
+        tree.set_combobox_cell((f"r{i}", "#2"), values=["x", "y"])
+    for i in range(rules // 10):
+        tree.set_readonly_row(f"ro{i}")
+        tree.set_combobox_row(f"co{i}", values=["x"])
+
+
+def _cell_type(ctx: Context) -> None:
+    get_cell_type = ctx.tree._get_cell_type
+    rules = ctx.scaled(CELL_TYPE_RULES)
+    for i in range(ctx.scaled(CELL_TYPE_LOOKUPS)):
+        get_cell_type((f"r{i % (2 * rules)}", f"#{i % 5 + 1}"))
+
+
+def _setup_scroll(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(20_000))
+    ctx.idle()
+
+
+def _scroll(ctx: Context) -> None:
+    tree = ctx.tree
+    steps = ctx.scaled(SCROLL_STEPS)
+    for i in range(steps):
+        delta = -120 if i < steps // 2 else 120
+        if ctx.backend == "fake":
+            fire_event(tree, "<MouseWheel>", delta=delta)
+        else:
+            tree.event_generate("<MouseWheel>", delta=delta)
+        if i % 16 == 15:
+            ctx.frame()
+    ctx.frame()
+
+
+def _setup_scroll_editing(ctx: Context) -> None:
+    _setup_scroll(ctx)
+    ctx.tree.start_edit((ctx.tree.get_children()[0], "#1"))
+
+
+def _setup_hscroll(ctx: Context) -> None:
+    build_wide(ctx)
+    ctx.idle()
+
+
+def _setup_hscroll_virtual(ctx: Context) -> None:
+    build_wide(ctx)
+    ctx.tree.set_column_virtualization(True)
+    ctx.idle()
+
+
+def _hscroll(ctx: Context) -> None:
+    tree = ctx.tree
+    steps = ctx.scaled(SCROLL_STEPS)
+    for i in range(steps):
+        tree._on_scroll_x("moveto", str(i / steps))
+        ctx.frame()
+
+
+def _setup_autofit(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(FLAT_ROWS))
+    ctx.idle()
+
+
+def _autofit(ctx: Context) -> None:
+    tree = ctx.tree
+    tree.autofit_columns()
+    while tree._autofit_job is not None:
+        ctx.frame()
+
+
+def _setup_delete(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(20_000))
+
+
+def _delete(ctx: Context) -> None:
+    tree = ctx.tree
+    children = tree.get_children()
+    half = len(children) // 2
+    for item in children[:half]:
+        tree.delete(item)
+    tree.delete(*children[half:])
+    ctx.idle()
+
+
+def _setup_selection(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(20_000))
+
+
+def _selection(ctx: Context) -> None:
+    tree = ctx.tree
+    tree.select_all()
+    tree.select_where(lambda item_id, values: str(values[0]).endswith("7"))
+    tree.invert_selection()
+    is_selected = tree.is_selected
+    rows = ctx.scaled(20_000)
+    for i in range(ctx.scaled(SELECTION_QUERIES)):
+        is_selected(f"r{i % rows}")
+    ctx.idle()
+
+
+def _setup_move(ctx: Context) -> None:
+    build_flat(ctx, rows=ctx.scaled(4 * MOVED_ROWS))
+    ctx.tree.subscribe(lambda changes: None)
+
+
+def _move(ctx: Context) -> None:
+    tree = ctx.tree
+    items = tree.get_children()[::4]
+    tree.move_items(items, "", 0, source="drag")
+    ctx.idle()
+
+
+def _setup_styles(ctx: Context) -> None:
+    tree = ctx.new_tree()
+    tree.add_style_rule("odd", lambda values: int(values[0]) % 2 == 1)
+    for i in range(ctx.scaled(20_000)):
+        tree.insert("", "end", iid=f"r{i}", values=(i, f"name{i}", "a"))
+
+
+def _restyle(ctx: Context) -> None:
+    tree = ctx.tree
+    for i in range(ctx.scaled(STYLED_EDITS)):
+        tree.set(f"r{i}", "#1", i + 1)
+    while tree._style_dirty:
+        ctx.frame()
+
+
+def _setup_load_file(ctx: Context) -> None:
+    ctx.new_tree()
+    ctx.csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+    with ctx.csv_file as file:
+        file.write("id,parent,a,b,c\n")
+        for i in range(ctx.scaled(LOADED_ROWS)):
+            parent = f"r{i // 10}" if i % 10 else ""
+            file.write(f"r{i},{parent},{i},name{i},x\n")
+
+
+def _load_file(ctx: Context) -> None:
+    loader = ctx.tree.load_file(
+        ctx.csv_file.name, id_column="id", parent_column="parent"
+    )
+    while not loader.done:
+        ctx.frame()
+    Path(ctx.csv_file.name).unlink()
+
+
+def _startup(ctx: Context, shared: bool = False) -> None:
+    """Create many trees and edit a cell in a few of them."""
+    trees = []
+    for i in range(ctx.scaled(STARTUP_TREES)):
+        tree = TreeviewEx(ctx.root, shared_editors=shared)
+        tree.pack(fill="both", expand=True)
+        tree["columns"] = ("c0", "c1")
+        tree.insert("", "end", iid="r0", values=(i, f"name{i}"))
+        trees.append(tree)
+    for tree in trees[:STARTUP_EDITED]:
+        tree.start_edit(("r0", "#2"))
+        tree.cancel_edit()
+    ctx.idle()
+
+
+def _startup_shared(ctx: Context) -> None:
+    _startup(ctx, shared=True)
+
+
+BENCHMARKS = (
+    Benchmark("insert_flat", build_flat),
+    Benchmark("insert_deep", build_deep),
+    Benchmark("insert_wide", build_wide),
+    Benchmark("expand_collapse_recursive", _expand_collapse, build_deep),
+    Benchmark("edit_cycle", _edit_cycles, _setup_edit),
+    Benchmark("get_cell_type", _cell_type, _setup_cell_type),
+    Benchmark("scroll", _scroll, _setup_scroll),
+    Benchmark("scroll_while_editing", _scroll, _setup_scroll_editing),
+    Benchmark("hscroll_wide", _hscroll, _setup_hscroll),
+    Benchmark("hscroll_wide_virtual", _hscroll, _setup_hscroll_virtual),
+    Benchmark("autofit", _autofit, _setup_autofit),
+    Benchmark("delete", _delete, _setup_delete),
+    Benchmark("bulk_selection", _selection, _setup_selection),
+    Benchmark("move_items", _move, _setup_move),
+    Benchmark("style_rules", _restyle, _setup_styles),
+    Benchmark("load_file", _load_file, _setup_load_file),
+    Benchmark("startup", _startup),
+    Benchmark("startup_shared", _startup_shared),
+)
+
+
+# Runner -----------------------------------------------------------------
+
+
+def run_benchmarks(
+    backend: str = "tk",
+    scale: float = 1.0,
+    repeat: int = 3,
+    names: list | None = None,
+) -> dict:
+    """
+    Run the benchmark suite.
+
+    Parameters
+    ----------
+    backend : str, optional
+        ``"tk"`` for a real Tk or ``"fake"`` for the fake backend.
+    scale : float, optional
+        Multiplier applied to all data sizes. The default is 1.0.
+    repeat : int, optional
+        Number of timed repeats per benchmark. The default is 3.
+    names : list, optional
+        Run only these benchmarks. The default runs all.
+
+    Returns
+    -------
+    dict
+        JSON-serializable result document.
+
+    """
+    results = {}
+    for bench in BENCHMARKS:
+        if names and bench.name not in names:
+            continue
+        timings = []
+        calls = None
+        for _ in range(repeat):
+            ctx = Context(backend, scale)
+            try:
+                if bench.setup is not None:
+                    bench.setup(ctx)
+                before = ctx.calls()
+                start = time.perf_counter()
+                bench.run(ctx)
+                timings.append(time.perf_counter() - start)
+                if before is not None:
+                    calls = ctx.calls() - before
+            finally:
+                ctx.close()
+        results[bench.name] = {
+            "seconds": statistics.median(timings),
+            "min": min(timings),
+            "max": max(timings),
+            "repeat": repeat,
+            "tk_calls": calls,
+        }
+    return {
+        "meta": {
+            "backend": backend,
+            "scale": scale,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare two result documents.
+
+    Parameters
+    ----------
+    current : dict
+        Result document of this run.
+    baseline : dict
+        Stored result document.
+    threshold : float
+        Allowed relative slowdown, e.g. 0.25 for 25 %.
+
+    Returns
+    -------
+    list
+        One ``(name, metric, baseline, current, ratio)`` tuple for every
+        metric that regressed beyond the threshold.
+
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        for metric in ("seconds", "tk_calls"):
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1.0 + threshold:
+                regressions.append((name, metric, old, new, ratio))
+    return regressions
+
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("tk", "fake"), default="tk")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative slowdown before failing (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    result = run_benchmarks(args.backend, args.scale, args.repeat, args.only)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        for name, metric, old, new, ratio in regressions:
+            print(
+                f"REGRESSION {name} {metric}: {old:.6g} -> {new:.6g} "
+                f"({ratio:.2f}x)",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
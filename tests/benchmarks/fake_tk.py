@@ -0,0 +1,1051 @@
+# python3
+"""
+Fake Tk backend for headless benchmarks.
+
+The backend emulates the small subset of Tcl/Tk commands used by
+TreeviewEx (ttk::treeview, entry, combobox, scrollbar, menu, place,
+bind, after, winfo, font) in pure Python and counts every Tcl call.
+It lets the benchmark suite run without a display and report how many
+round-trips each operation costs, which is often a better regression
+signal than wall-clock time on noisy CI machines.
+"""
+
+from __future__ import annotations
+
+import re
+import tkinter
+from collections import Counter
+from tkinter import TclError
+
+__all__ = ["FakeTkApp", "FakeRoot", "fire_event"]
+
+_ROW_HEIGHT = 20
+_HEADING_HEIGHT = 20
+_DEFAULT_WIDTH = 800
+_DEFAULT_HEIGHT = 400
+_DEFAULT_COLUMN_WIDTH = 200
+_CHAR_WIDTH = 7
+
+_COMMAND_RE = re.compile(r"\[(\S+) %#")
+
+_SUBST_FIELDS = (
+    "%#",
+    "%b",
+    "%f",
+    "%h",
+    "%k",
+    "%s",
+    "%t",
+    "%w",
+    "%x",
+    "%y",
+    "%A",
+    "%E",
+    "%K",
+    "%N",
+    "%W",
+    "%T",
+    "%X",
+    "%Y",
+    "%D",
+)
+_EVENT_OPTIONS = {
+    "-x": "%x",
+    "-y": "%y",
+    "-rootx": "%X",
+    "-rooty": "%Y",
+    "-delta": "%D",
+    "-state": "%s",
+    "-button": "%b",
+    "-width": "%w",
+    "-height": "%h",
+    "-keysym": "%K",
+}
+
+
+class _FakeWidget:
+    """State of one emulated widget."""
+
+    def __init__(self, path: str, kind: str, options: dict):
+        self.path = path
+        self.kind = kind
+        self.options = options
+        self.text = ""
+        self.mapped = False
+        self.geometry = (0, 0, _DEFAULT_WIDTH, _DEFAULT_HEIGHT)
+
+
+class _FakeItem:
+    """State of one emulated treeview item."""
+
+    __slots__ = ("parent", "children", "options")
+
+    def __init__(self, parent: str):
+        self.parent = parent
+        self.children = []
+        self.options = {
+            "text": "",
+            "image": "",
+            "values": "",
+            "open": False,
+            "tags": "",
+        }
+
+
+class _FakeTree(_FakeWidget):
+    """State of one emulated ttk::treeview."""
+
+    def __init__(self, path: str, kind: str, options: dict):
+        super().__init__(path, kind, options)
+        self.items = {"": _FakeItem("")}
+        self.items[""].options["open"] = True
+        self.columns = ()
+        self.column_options = {"#0": {"width": _DEFAULT_COLUMN_WIDTH}}
+        self.heading_options = {}
+        self.selection = []
+        self.focus_item = ""
+        self.top = 0
+        self.left = 0
+        self.next_id = 1
+        self._visible = None
+        self.options.setdefault("displaycolumns", "#all")
+        self.options.setdefault("show", "tree headings")
+
+    # Structure helpers ---------------------------------------------------
+
+    def invalidate(self) -> None:
+        self._visible = None
+
+    def visible_rows(self) -> list:
+        if self._visible is None:
+            rows = []
+            stack = list(reversed(self.items[""].children))
+            while stack:
+                iid = stack.pop()
+                rows.append(iid)
+                item = self.items[iid]
+                if item.options["open"] and item.children:
+                    stack.extend(reversed(item.children))
+            self._visible = rows
+        return self._visible
+
+    def page_rows(self) -> int:
+        return max(1, (self.geometry[3] - _HEADING_HEIGHT) // _ROW_HEIGHT)
+
+    def display_columns(self) -> list:
+        display = self.options.get("displaycolumns", "#all")
+        if display in ("#all", ("#all",)) or display == "":
+            return list(self.columns)
+        result = []
+        for column in display:
+            result.append(self.data_column(column))
+        return result
+
+    def data_column(self, column) -> str:
+        column = str(column)
+        if column in self.columns:
+            return column
+        if column.isdigit():
+            return self.columns[int(column)]
+        raise TclError(f'Invalid column index "{column}"')
+
+    def resolve_column(self, column) -> str:
+        """Resolve a column identifier to a data column name or #0."""
+        column = str(column)
+        if column == "#0":
+            return "#0"
+        if column.startswith("#"):
+            display = self.display_columns()
+            index = int(column[1:]) - 1
+            if 0 <= index < len(display):
+                return display[index]
+            raise TclError(f'Column index "{column}" out of bounds')
+        return self.data_column(column)
+
+    def column_width(self, column: str) -> int:
+        options = self.column_options.setdefault(column, {})
+        return int(options.get("width", _DEFAULT_COLUMN_WIDTH))
+
+    def content_columns(self) -> list:
+        columns = []
+        if "tree" in str(self.options.get("show", "tree headings")):
+            columns.append("#0")
+        columns.extend(self.display_columns())
+        return columns
+
+    def content_width(self) -> int:
+        return sum(self.column_width(col) for col in self.content_columns())
+
+    def descendants(self, iid: str) -> list:
+        result = []
+        stack = list(self.items[iid].children)
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            stack.extend(self.items[child].children)
+        return result
+
+
+def _as_list(tcl, value) -> tuple:
+    if isinstance(value, (tuple, list)):
+        return tuple(str(v) for v in value)
+    if value is None:
+        return ()
+    return tuple(str(v) for v in tcl.splitlist(str(value)))
+
+
+class FakeTkApp:
+    """Pure-Python stand-in for the ``_tkinter`` application object."""
+
+    def __init__(self):
+        self._tcl = tkinter.Tcl().tk
+        self.calls = Counter()
+        self.created = Counter()
+        self.commands = {}
+        self.widgets = {}
+        self.bindings = {}
+        self.focus_widget = ""
+        self.clock_ms = 0
+        self._after_seq = 0
+        self._timers = {}
+        self._dirty_scroll = set()
+
+    # Counting helpers -----------------------------------------------------
+
+    @property
+    def total_calls(self) -> int:
+        """Return the number of Tcl calls made so far."""
+        return sum(self.calls.values())
+
+    @property
+    def live_widgets(self) -> int:
+        """Return the number of widgets that currently exist."""
+        return len(self.widgets)
+
+    def reset_counts(self) -> None:
+        """Reset call and creation counters."""
+        self.calls.clear()
+        self.created.clear()
+
+    # _tkinter API ---------------------------------------------------------
+
+    def wantobjects(self) -> int:
+        return 1
+
+    def createcommand(self, name, func) -> None:
+        self.commands[name] = func
+
+    def deletecommand(self, name) -> None:
+        if name not in self.commands:
+            raise TclError(f"can't delete \"{name}\": command doesn't exist")
+        del self.commands[name]
+
+    def splitlist(self, value):
+        return self._tcl.splitlist(value)
+
+    def split(self, value):
+        return self._tcl.splitlist(value)
+
+    def getboolean(self, value):
+        return self._tcl.getboolean(value)
+
+    def getint(self, value):
+        return self._tcl.getint(value)
+
+    def getdouble(self, value):
+        return self._tcl.getdouble(value)
+
+    def getvar(self, name):
+        return self._tcl.getvar(name)
+
+    def setvar(self, name, value):
+        return self._tcl.setvar(name, value)
+
+    globalgetvar = getvar
+    globalsetvar = setvar
+
+    def eval(self, script):
+        self.calls["eval"] += 1
+        return ""
+
+    def mainloop(self, n=0):
+        self.run_timers()
+
+    def dooneevent(self, flags=0):
+        return int(self.run_timers(limit=1) > 0)
+
+    def quit(self):
+        pass
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        args = tuple(a for a in args if a is not None)
+        head = args[0]
+        if isinstance(head, str) and head.startswith("."):
+            widget = self.widgets.get(head)
+            if widget is None:
+                if head == ".":
+                    return ""
+                raise TclError(f'invalid command name "{head}"')
+            self.calls[f"{widget.kind} {args[1]}"] += 1
+            return self._widget_command(widget, args[1], args[2:])
+        key = head if len(args) < 2 else f"{head} {args[1]}"
+        self.calls[key] += 1
+        handler = getattr(self, "_cmd_" + head.replace("::", "_"), None)
+        if handler is not None:
+            return handler(args[1:])
+        if head.startswith("ttk::") and len(args) > 1 and args[1][:1] == ".":
+            return self._create_widget(head, args[1], args[2:])
+        if head in ("frame", "entry", "menu", "toplevel", "label", "canvas"):
+            return self._create_widget(head, args[1], args[2:])
+        return ""
+
+    # Timers ---------------------------------------------------------------
+
+    def run_timers(self, advance_ms: int = 0, limit: int | None = None) -> int:
+        """Run due ``after`` callbacks, advancing the fake clock."""
+        self.clock_ms += advance_ms
+        ran = 0
+        while True:
+            due = [
+                (when, seq, timer_id)
+                for timer_id, (when, seq, _name) in self._timers.items()
+                if when <= self.clock_ms
+            ]
+            if not due:
+                break
+            _when, _seq, timer_id = min(due)
+            _when, _seq, name = self._timers.pop(timer_id)
+            func = self.commands.get(name)
+            if func is not None:
+                func()
+            ran += 1
+            if limit is not None and ran >= limit:
+                break
+        self._flush_scroll_commands()
+        return ran
+
+    def pending_timers(self) -> int:
+        """Return the number of scheduled ``after`` callbacks."""
+        return len(self._timers)
+
+    def _cmd_after(self, args):
+        if args[0] == "info":
+            if args[1] not in self._timers:
+                raise TclError(f'event "{args[1]}" doesn\'t exist')
+            return (self._timers[args[1]][2], "timer")
+        if args[0] == "cancel":
+            self._timers.pop(args[1], None)
+            return ""
+        if len(args) == 1:
+            self.clock_ms += int(args[0])
+            return ""
+        delay = 0 if args[0] == "idle" else int(args[0])
+        self._after_seq += 1
+        timer_id = f"after#{self._after_seq}"
+        self._timers[timer_id] = (
+            self.clock_ms + delay,
+            self._after_seq,
+            args[1],
+        )
+        return timer_id
+
+    def _cmd_update(self, args):
+        self.run_timers()
+        return ""
+
+    # Events ---------------------------------------------------------------
+
+    def _cmd_bind(self, args):
+        tag, sequence = args[0], args[1] if len(args) > 1 else None
+        if sequence is None:
+            return tuple(seq for (t, seq) in self.bindings if t == tag)
+        if len(args) == 2:
+            return self.bindings.get((tag, sequence), "")
+        script = args[2]
+        if script.startswith("+"):
+            previous = self.bindings.get((tag, sequence), "")
+            script = previous + "\n" + script[1:]
+        self.bindings[(tag, sequence)] = script
+        return ""
+
+    def _cmd_event(self, args):
+        if args[0] != "generate":
+            return ""
+        path, sequence = args[1], args[2]
+        fields = {}
+        options = args[3:]
+        for option, value in zip(options[::2], options[1::2]):
+            if option in _EVENT_OPTIONS:
+                fields[_EVENT_OPTIONS[option]] = str(value)
+        self.dispatch(path, sequence, fields)
+        return ""
+
+    def dispatch(self, path: str, sequence: str, fields=None) -> str:
+        """Invoke the scripts bound to ``sequence`` on ``path``."""
+        fields = dict(fields or {})
+        fields.setdefault("%#", "0")
+        fields.setdefault("%W", path)
+        fields.setdefault("%T", "35")
+        script = self.bindings.get((path, sequence), "")
+        for name in _COMMAND_RE.findall(script):
+            func = self.commands.get(name)
+            if func is None:
+                continue
+            result = func(*(fields.get(f, "??") for f in _SUBST_FIELDS))
+            if result == "break":
+                return "break"
+        return ""
+
+    # Geometry and window info -------------------------------------------
+
+    def _cmd_place(self, args):
+        if args[0] == "forget":
+            self.widgets[args[1]].mapped = False
+            return ""
+        if args[0] == "configure":
+            args = args[1:]
+        widget = self.widgets[args[0]]
+        options = dict(zip(args[1::2], args[2::2]))
+        x, y, width, height = widget.geometry
+        widget.geometry = (
+            int(options.get("-x", x)),
+            int(options.get("-y", y)),
+            int(options.get("-width", width)),
+            int(options.get("-height", height)),
+        )
+        widget.mapped = True
+        return ""
+
+    def _cmd_grid(self, args):
+        if args and args[0] == "configure":
+            self.widgets[args[1]].mapped = True
+        return ""
+
+    def _cmd_pack(self, args):
+        if args and args[0] == "configure":
+            self.widgets[args[1]].mapped = True
+        return ""
+
+    def _cmd_winfo(self, args):
+        kind, path = args[0], args[1] if len(args) > 1 else "."
+        widget = self.widgets.get(path)
+        if kind == "exists":
+            return int(widget is not None or path == ".")
+        if kind == "toplevel":
+            return "."
+        if kind == "children":
+            prefix = "." if path == "." else path + "."
+            return tuple(
+                p
+                for p in self.widgets
+                if p.startswith(prefix) and "." not in p[len(prefix) :]
+            )
+        if widget is None:
+            return 0
+        if kind == "ismapped":
+            return int(widget.mapped)
+        if kind == "width":
+            return widget.geometry[2]
+        if kind == "height":
+            return widget.geometry[3]
+        if kind == "class":
+            return widget.kind
+        return 0
+
+    def _cmd_focus(self, args):
+        if not args:
+            return self.focus_widget
+        self.focus_widget = args[-1]
+        return ""
+
+    def _cmd_destroy(self, args):
+        for path in args:
+            for name in list(self.widgets):
+                if name == path or name.startswith(path + "."):
+                    self.dispatch(name, "<Destroy>", {"%T": "17"})
+                    del self.widgets[name]
+            for key in [k for k in self.bindings if k[0] == path]:
+                del self.bindings[key]
+        return ""
+
+    def _cmd_font(self, args):
+        if args[0] == "names":
+            return ("TkDefaultFont", "TkTextFont", "TkHeadingFont")
+        if args[0] == "measure":
+            return _CHAR_WIDTH * len(str(args[-1]))
+        if args[0] == "metrics":
+            return 15
+        if args[0] == "create":
+            return args[1] if len(args) > 1 else "font1"
+        if args[0] == "actual":
+            return ("-family", "fake", "-size", 10)
+        return ""
+
+    def _cmd_ttk_style(self, args):
+        return ""
+
+    # Widgets --------------------------------------------------------------
+
+    def _create_widget(self, kind, path, args):
+        options = {}
+        for key, value in zip(args[::2], args[1::2]):
+            options[key[1:]] = value
+        cls = _FakeTree if kind == "ttk::treeview" else _FakeWidget
+        widget = cls(path, kind, options)
+        if isinstance(widget, _FakeTree):
+            self._configure_tree(widget, options)
+        self.widgets[path] = widget
+        self.created[kind] += 1
+        return path
+
+    def _widget_command(self, widget, command, args):
+        if isinstance(widget, _FakeTree):
+            handler = getattr(self, "_tree_" + command, None)
+            if handler is None:
+                raise TclError(f'bad command "{command}"')
+            return handler(widget, args)
+        if command == "configure":
+            return self._configure_plain(widget, args)
+        if command == "cget":
+            return widget.options.get(args[0][1:], "")
+        if command == "get":
+            return widget.text
+        if command == "delete":
+            widget.text = ""
+            return ""
+        if command == "insert":
+            index, text = args[0], str(args[1])
+            if index in (0, "0"):
+                widget.text = text + widget.text
+            else:
+                widget.text += text
+            return ""
+        if command == "set" and widget.kind == "ttk::combobox":
+            widget.text = str(args[0])
+            return ""
+        return ""
+
+    def _configure_plain(self, widget, args):
+        if len(args) == 1:
+            key = args[0][1:]
+            return (args[0], "", "", "", widget.options.get(key, ""))
+        for key, value in zip(args[::2], args[1::2]):
+            widget.options[key[1:]] = value
+        return ""
+
+    # Treeview -------------------------------------------------------------
+
+    def _configure_tree(self, tree, options):
+        if "columns" in options:
+            tree.columns = _as_list(self._tcl, options["columns"])
+            tree.options["displaycolumns"] = "#all"
+        if "displaycolumns" in options:
+            value = _as_list(self._tcl, options["displaycolumns"])
+            tree.options["displaycolumns"] = (
+                "#all" if value in ((), ("#all",)) else value
+            )
+        for key in ("yscrollcommand", "xscrollcommand", "show", "height"):
+            if key in options:
+                tree.options[key] = options[key]
+        if "height" in options:
+            tree.geometry = tree.geometry[:3] + (
+                _HEADING_HEIGHT + int(options["height"]) * _ROW_HEIGHT,
+            )
+        tree.invalidate()
+
+    def _tree_configure(self, tree, args):
+        if len(args) == 1:
+            return (args[0], "", "", "", self._tree_cget(tree, args))
+        options = {k[1:]: v for k, v in zip(args[::2], args[1::2])}
+        self._configure_tree(tree, options)
+        return ""
+
+    def _tree_cget(self, tree, args):
+        key = args[0][1:]
+        if key == "columns":
+            return tree.columns
+        if key == "displaycolumns":
+            value = tree.options.get("displaycolumns", "#all")
+            return ("#all",) if value == "#all" else value
+        return tree.options.get(key, "")
+
+    def _tree_insert(self, tree, args):
+        parent, index = str(args[0]), args[1]
+        options = dict(zip(args[2::2], args[3::2]))
+        if parent not in tree.items:
+            raise TclError(f"Item {parent} not found")
+        iid = options.pop("-id", None)
+        if iid is None:
+            while True:
+                iid = "I%03X" % tree.next_id
+                tree.next_id += 1
+                if iid not in tree.items:
+                    break
+        iid = str(iid)
+        if iid in tree.items:
+            raise TclError(f"Item {iid} already exists")
+        item = _FakeItem(parent)
+        self._set_item_options(tree, item, options)
+        tree.items[iid] = item
+        siblings = tree.items[parent].children
+        if index == "end":
+            siblings.append(iid)
+        else:
+            siblings.insert(max(0, int(index)), iid)
+        tree.invalidate()
+        self._scroll_dirty(tree)
+        return iid
+
+    def _set_item_options(self, tree, item, options):
+        for key, value in options.items():
+            name = key[1:]
+            if name == "values":
+                value = _as_list(self._tcl, value)
+                value = value if value else ""
+            elif name == "tags":
+                value = _as_list(self._tcl, value)
+            elif name == "open":
+                value = bool(self._tcl.getboolean(value))
+                tree.invalidate()
+            item.options[name] = value
+
+    def _item(self, tree, iid):
+        iid = str(iid)
+        if iid not in tree.items or iid == "":
+            raise TclError(f"Item {iid} not found")
+        return tree.items[iid]
+
+    def _tree_item(self, tree, args):
+        item = self._item(tree, args[0])
+        options = args[1:]
+        if not options:
+            flat = []
+            for key, value in item.options.items():
+                flat.extend(("-" + key, value))
+            return tuple(flat)
+        if len(options) == 1:
+            return item.options.get(options[0][1:], "")
+        self._set_item_options(
+            tree, item, dict(zip(options[::2], options[1::2]))
+        )
+        if "-open" in options:
+            self._scroll_dirty(tree)
+        return ""
+
+    def _tree_set(self, tree, args):
+        item = self._item(tree, args[0])
+        values = list(item.options["values"] or ())
+        if len(args) == 1:
+            flat = []
+            for index, column in enumerate(tree.columns):
+                flat.extend(
+                    (column, values[index] if index < len(values) else "")
+                )
+            return tuple(flat)
+        column = tree.resolve_column(args[1])
+        index = tree.columns.index(column)
+        if len(args) == 2:
+            return values[index] if index < len(values) else ""
+        values.extend([""] * (index + 1 - len(values)))
+        values[index] = str(args[2])
+        item.options["values"] = tuple(values)
+        return ""
+
+    def _tree_children(self, tree, args):
+        iid = str(args[0])
+        item = tree.items[iid] if iid == "" else self._item(tree, iid)
+        if len(args) == 1:
+            return tuple(item.children)
+        for child in item.children:
+            tree.items[child].parent = None
+        item.children = list(_as_list(self._tcl, args[1]))
+        for child in item.children:
+            old_parent = self._item(tree, child).parent
+            if old_parent is not None and old_parent != iid:
+                # Like Tk, new children are detached from their old parent
+                tree.items[old_parent].children.remove(child)
+            tree.items[child].parent = iid
+        tree.invalidate()
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_delete(self, tree, args):
+        items = _as_list(self._tcl, args[0])
+        for iid in items:
+            if iid not in tree.items:
+                raise TclError(f"Item {iid} not found")
+        for iid in items:
+            if iid not in tree.items:
+                continue
+            doomed = [iid] + tree.descendants(iid)
+            parent = tree.items[iid].parent
+            if parent is not None:
+                tree.items[parent].children.remove(iid)
+            for name in doomed:
+                del tree.items[name]
+            gone = set(doomed)
+            if tree.selection:
+                tree.selection = [s for s in tree.selection if s not in gone]
+            if tree.focus_item in gone:
+                tree.focus_item = ""
+        tree.invalidate()
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_detach(self, tree, args):
+        for iid in _as_list(self._tcl, args[0]):
+            item = self._item(tree, iid)
+            if item.parent is not None:
+                tree.items[item.parent].children.remove(iid)
+                item.parent = None
+        tree.invalidate()
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_move(self, tree, args):
+        iid, parent, index = str(args[0]), str(args[1]), args[2]
+        item = self._item(tree, iid)
+        if parent != "" and parent not in tree.items:
+            raise TclError(f"Item {parent} not found")
+        ancestor = parent
+        while ancestor:
+            if ancestor == iid:
+                raise TclError(f"Cannot insert {iid} as descendant of itself")
+            ancestor = tree.items[ancestor].parent or ""
+        if item.parent is not None:
+            tree.items[item.parent].children.remove(iid)
+        siblings = tree.items[parent].children
+        if index == "end":
+            siblings.append(iid)
+        else:
+            siblings.insert(max(0, int(index)), iid)
+        item.parent = parent
+        tree.invalidate()
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_exists(self, tree, args):
+        return int(str(args[0]) in tree.items)
+
+    def _tree_focus(self, tree, args):
+        if args:
+            tree.focus_item = str(args[0])
+            return ""
+        return tree.focus_item
+
+    def _tree_parent(self, tree, args):
+        return self._item(tree, args[0]).parent or ""
+
+    def _tree_index(self, tree, args):
+        item = self._item(tree, args[0])
+        if item.parent is None:
+            return 0
+        return tree.items[item.parent].children.index(str(args[0]))
+
+    def _sibling(self, tree, iid, offset):
+        item = self._item(tree, iid)
+        if item.parent is None:
+            return ""
+        siblings = tree.items[item.parent].children
+        index = siblings.index(str(iid)) + offset
+        if 0 <= index < len(siblings):
+            return siblings[index]
+        return ""
+
+    def _tree_next(self, tree, args):
+        return self._sibling(tree, args[0], 1)
+
+    def _tree_prev(self, tree, args):
+        return self._sibling(tree, args[0], -1)
+
+    def _tree_see(self, tree, args):
+        iid = str(args[0])
+        ancestor = self._item(tree, iid).parent
+        while ancestor:
+            tree.items[ancestor].options["open"] = True
+            ancestor = tree.items[ancestor].parent
+        tree.invalidate()
+        rows = tree.visible_rows()
+        index = rows.index(iid)
+        page = tree.page_rows()
+        if index < tree.top:
+            tree.top = index
+        elif index >= tree.top + page:
+            tree.top = index - page + 1
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_selection(self, tree, args):
+        if not args:
+            if len(tree.selection) < 2:
+                return tuple(tree.selection)
+            # Like Tk, report the selection in tree order
+            selected = set(tree.selection)
+            ordered = []
+            stack = list(reversed(tree.items[""].children))
+            while stack:
+                iid = stack.pop()
+                if iid in selected:
+                    ordered.append(iid)
+                stack.extend(reversed(tree.items[iid].children))
+            return tuple(ordered)
+        operation = args[0]
+        items = _as_list(self._tcl, args[1]) if len(args) > 1 else ()
+        for iid in items:
+            self._item(tree, iid)
+        if operation == "set":
+            tree.selection = list(dict.fromkeys(items))
+        elif operation == "add":
+            current = set(tree.selection)
+            tree.selection.extend(i for i in items if i not in current)
+        elif operation == "remove":
+            gone = set(items)
+            tree.selection = [i for i in tree.selection if i not in gone]
+        elif operation == "toggle":
+            current = set(tree.selection)
+            toggled = set(items)
+            tree.selection = [i for i in tree.selection if i not in toggled]
+            tree.selection.extend(i for i in items if i not in current)
+        return ""
+
+    def _column_like(self, store, tree, args, defaults):
+        column = tree.resolve_column(args[0])
+        options = store.setdefault(column, dict(defaults))
+        rest = args[1:]
+        if not rest:
+            flat = []
+            for key, value in options.items():
+                flat.extend(("-" + key, value))
+            return tuple(flat)
+        if len(rest) == 1:
+            return options.get(rest[0][1:], "")
+        for key, value in zip(rest[::2], rest[1::2]):
+            options[key[1:]] = value
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_column(self, tree, args):
+        return self._column_like(
+            tree.column_options,
+            tree,
+            args,
+            {"width": _DEFAULT_COLUMN_WIDTH, "minwidth": 20, "stretch": 1},
+        )
+
+    def _tree_heading(self, tree, args):
+        return self._column_like(
+            tree.heading_options, tree, args, {"text": "", "command": ""}
+        )
+
+    def _tree_tag(self, tree, args):
+        if args[0] == "has":
+            tag = str(args[1])
+            if len(args) > 2:
+                return int(tag in self._item(tree, args[2]).options["tags"])
+            return tuple(
+                iid
+                for iid, item in tree.items.items()
+                if iid and tag in item.options["tags"]
+            )
+        if args[0] in ("add", "remove"):
+            tag = str(args[1])
+            for iid in _as_list(self._tcl, args[2]):
+                item = self._item(tree, iid)
+                tags = list(item.options["tags"] or ())
+                if args[0] == "add" and tag not in tags:
+                    tags.append(tag)
+                elif args[0] == "remove" and tag in tags:
+                    tags.remove(tag)
+                item.options["tags"] = tuple(tags)
+            return ""
+        return ""
+
+    def _row_y(self, tree, iid):
+        rows = tree.visible_rows()
+        try:
+            index = rows.index(iid)
+        except ValueError:
+            return None
+        if not tree.top <= index < tree.top + tree.page_rows():
+            return None
+        return _HEADING_HEIGHT + (index - tree.top) * _ROW_HEIGHT
+
+    def viewable(self, path: str) -> bool:
+        """Return True if ``path`` and all of its ancestors are mapped."""
+        while path and path != ".":
+            widget = self.widgets.get(path)
+            if widget is None or not widget.mapped:
+                return False
+            path = path.rsplit(".", 1)[0]
+        return True
+
+    def _tree_bbox(self, tree, args):
+        iid = str(args[0])
+        self._item(tree, iid)
+        if not self.viewable(tree.path):
+            return ""
+        y = self._row_y(tree, iid)
+        if y is None:
+            return ""
+        if len(args) == 1:
+            return (0, y, tree.geometry[2], _ROW_HEIGHT)
+        column = tree.resolve_column(args[1])
+        x = -tree.left
+        for name in tree.content_columns():
+            width = tree.column_width(name)
+            if name == column:
+                if x + width <= 0 or x >= tree.geometry[2]:
+                    return ""
+                return (x, y, width, _ROW_HEIGHT)
+            x += width
+        return ""
+
+    def _tree_identify(self, tree, args):
+        component, x, y = args[0], int(args[1]), int(args[2])
+        if not self.viewable(tree.path):
+            return "nothing" if component == "region" else ""
+        if component == "region":
+            if y < _HEADING_HEIGHT:
+                return "heading"
+            return (
+                "cell"
+                if self._tree_identify(tree, ("row", x, y))
+                else "nothing"
+            )
+        if component in ("row", "item"):
+            if y < _HEADING_HEIGHT:
+                return ""
+            index = tree.top + (y - _HEADING_HEIGHT) // _ROW_HEIGHT
+            rows = tree.visible_rows()
+            return rows[index] if index < len(rows) else ""
+        if component == "column":
+            position = x + tree.left
+            for number, name in enumerate(tree.content_columns()):
+                position -= tree.column_width(name)
+                if position < 0:
+                    if name == "#0":
+                        return "#0"
+                    offset = 0 if "#0" in tree.content_columns() else 1
+                    return f"#{number + offset}"
+            return ""
+        return ""
+
+    def _tree_yview(self, tree, args):
+        rows = len(tree.visible_rows())
+        page = tree.page_rows()
+        if not args:
+            if rows == 0:
+                return (0.0, 1.0)
+            return (tree.top / rows, min(1.0, (tree.top + page) / rows))
+        if args[0] == "moveto":
+            tree.top = int(float(args[1]) * rows + 0.5)
+        elif args[0] == "scroll":
+            step = page if str(args[2]).startswith("page") else 1
+            tree.top += int(args[1]) * step
+        tree.top = max(0, min(tree.top, max(0, rows - page)))
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_xview(self, tree, args):
+        total = tree.content_width()
+        width = tree.geometry[2]
+        if not args:
+            if total == 0:
+                return (0.0, 1.0)
+            return (tree.left / total, min(1.0, (tree.left + width) / total))
+        if args[0] == "moveto":
+            tree.left = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = width if str(args[2]).startswith("page") else 20
+            tree.left += int(args[1]) * step
+        tree.left = max(0, min(tree.left, max(0, total - width)))
+        self._scroll_dirty(tree)
+        return ""
+
+    def _tree_instate(self, tree, args):
+        return 0
+
+    def _tree_state(self, tree, args):
+        return ()
+
+    def _scroll_dirty(self, tree):
+        self._dirty_scroll.add(tree.path)
+
+    def _flush_scroll_commands(self):
+        dirty, self._dirty_scroll = self._dirty_scroll, set()
+        for path in dirty:
+            tree = self.widgets.get(path)
+            if tree is None:
+                continue
+            for key, view in (
+                ("yscrollcommand", self._tree_yview),
+                ("xscrollcommand", self._tree_xview),
+            ):
+                command = tree.options.get(key)
+                if not command:
+                    continue
+                name = str(command).split()[0]
+                func = self.commands.get(name)
+                if func is not None:
+                    func(*view(tree, ()))
+
+
+class FakeRoot(tkinter.Tk):
+    """Tk root window backed by :class:`FakeTkApp`."""
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        self.master = None
+        self.children = {}
+        self._tkloaded = True
+        self._tclCommands = []
+        self._last_child_ids = None
+        self.tk = FakeTkApp()
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        self.tk.dispatch(".", "<Destroy>", {"%T": "17"})
+        tkinter.Misc.destroy(self)
+
+    def update(self):
+        self.tk.run_timers()
+
+    def update_idletasks(self):
+        self.tk.run_timers()
+
+
+def fire_event(widget, sequence: str, **fields) -> str:
+    """
+    Deliver an event to the Python handlers bound on ``widget``.
+
+    Parameters
+    ----------
+    widget : tkinter.Misc
+        Widget created on a :class:`FakeRoot`.
+    sequence : str
+        Event sequence, e.g. ``"<MouseWheel>"``.
+    **fields : dict
+        Event fields (``x``, ``y``, ``delta``, ``x_root``, ``y_root``...).
+
+    Returns
+    -------
+    str
+        ``"break"`` if a handler stopped propagation, otherwise ``""``.
+
+    """
+    names = {
+        "x": "%x",
+        "y": "%y",
+        "x_root": "%X",
+        "y_root": "%Y",
+        "delta": "%D",
+        "state": "%s",
+        "num": "%b",
+        "width": "%w",
+        "height": "%h",
+        "keysym": "%K",
+    }
+    values = {names[key]: str(value) for key, value in fields.items()}
+    return widget.tk.dispatch(widget._w, sequence, values)
@@ -0,0 +1,155 @@
+import asyncio
+import gc
+import sys
+import time
+import unittest
+import weakref
+from pathlib import Path
+from tkinter import TclError, Tk
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from treeviewex import AsyncioBridge, TreeviewEx
+
+
+def _can_use_tk():
+    try:
+        Tk()
+    except (TclError, OSError):
+        return False
+    return True
+
+
+def _run_until(bridge, done, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        bridge._step()
+        bridge.stop()
+        time.sleep(0.001)
+
+
+class TestAsyncioBridge(unittest.TestCase):
+    def setUp(self):
+        if not _can_use_tk():
+            self.skipTest("Tk is not available in this environment")
+        self.root = Tk()
+        self.root.withdraw()
+        self.treeview_ex = TreeviewEx(self.root)
+        self.treeview_ex["columns"] = ("#1",)
+        self.bridge = AsyncioBridge.for_widget(self.treeview_ex)
+
+    def tearDown(self):
+        self.bridge.close()
+        self.treeview_ex.destroy()
+        self.root.destroy()
+
+    def test_bridge_is_shared_per_root(self):
+        self.assertIs(AsyncioBridge.for_widget(self.root), self.bridge)
+
+    def test_coroutines_run_with_timers(self):
+        async def work():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        task = self.bridge.create_task(work())
+        _run_until(self.bridge, task.done)
+        self.assertEqual(task.result(), "done")
+
+    def test_idle_bridge_stops_stepping(self):
+        task = self.bridge.create_task(asyncio.sleep(0))
+        _run_until(self.bridge, task.done)
+        self.bridge._step()
+        self.assertIsNone(self.bridge._after_id)
+        task = self.bridge.create_task(asyncio.sleep(0.01))
+        self.assertIsNotNone(self.bridge._after_id)
+        self.bridge._step()
+        self.assertIsNotNone(self.bridge._after_id)
+        _run_until(self.bridge, task.done)
+
+    def test_bridge_is_closed_with_its_root(self):
+        root = Tk()
+        root.withdraw()
+        bridge = AsyncioBridge.for_widget(root)
+        loop = bridge.loop
+        bridge = weakref.ref(bridge)
+        root.destroy()
+        del root
+        gc.collect()
+        self.assertTrue(loop.is_closed())
+        self.assertIsNone(bridge())
+
+    def test_insert_stream_inserts_rows_across_frames(self):
+        async def rows():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield {"iid": f"r{i}", "values": (i,)}
+
+        task = self.bridge.create_task(
+            self.treeview_ex.insert_stream(rows(), budget_ms=0)
+        )
+        _run_until(self.bridge, task.done)
+        self.assertEqual(task.result(), 5)
+        self.assertEqual(
+            self.treeview_ex.get_children(), ("r0", "r1", "r2", "r3", "r4")
+        )
+        task = self.bridge.create_task(
+            self.treeview_ex.insert_stream([("x",), ("y",)], parent="r0")
+        )
+        _run_until(self.bridge, task.done)
+        self.assertEqual(len(self.treeview_ex.get_children("r0")), 2)
+
+    def test_children_provider_loads_lazy_items(self):
+        async def provider(item_id):
+            await asyncio.sleep(0)
+            return [{"iid": f"{item_id}.child", "lazy": True}]
+
+        self.treeview_ex.set_children_provider(provider)
+        self.treeview_ex.insert("", "end", iid="node", lazy=True)
+        self.assertEqual(
+            self.treeview_ex.get_children("node"), ("node::placeholder",)
+        )
+        self.treeview_ex._load_lazy_children("node")
+        self.assertEqual(
+            self.treeview_ex.item("node::placeholder", "text"), "Loading..."
+        )
+        _run_until(self.bridge, lambda: not self.treeview_ex._children_tasks)
+        self.assertEqual(self.treeview_ex.get_children("node"), ("node.child",))
+        self.assertEqual(
+            self.treeview_ex.get_children("node.child"),
+            ("node.child::placeholder",),
+        )
+
+    def test_failed_children_provider_can_retry(self):
+        async def provider(item_id):
+            raise RuntimeError("offline")
+
+        errors = []
+        self.root.report_callback_exception = lambda *exc: errors.append(exc)
+        self.treeview_ex.set_children_provider(provider)
+        self.treeview_ex.insert("", "end", iid="node", lazy=True, open=True)
+        self.treeview_ex._load_lazy_children("node")
+        _run_until(self.bridge, lambda: not self.treeview_ex._children_tasks)
+        self.assertEqual(self.treeview_ex.item("node::placeholder", "text"), "")
+        self.assertFalse(self.treeview_ex.item("node", "open"))
+        self.assertEqual([type(exc[1]) for exc in errors], [RuntimeError])
+
+    def test_children_provider_failing_midway_can_retry(self):
+        async def rows():
+            yield {"iid": "node.child"}
+            raise RuntimeError("offline")
+
+        errors = []
+        self.root.report_callback_exception = lambda *exc: errors.append(exc)
+        self.treeview_ex.set_children_provider(lambda item_id: rows())
+        self.treeview_ex.insert("", "end", iid="node", lazy=True, open=True)
+        self.treeview_ex._load_lazy_children("node")
+        _run_until(self.bridge, lambda: not self.treeview_ex._children_tasks)
+        self.assertEqual(
+            self.treeview_ex.get_children("node"), ("node::placeholder",)
+        )
+        self.assertFalse(self.treeview_ex.item("node", "open"))
+        self.assertEqual(len(errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "benchmarks"))
+
+import bench_treeviewex  # noqa: E402
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_fake_backend_runs_all_benchmarks(self):
+        result = bench_treeviewex.run_benchmarks(
+            backend="fake", scale=0.002, repeat=1
+        )
+        self.assertEqual(result["meta"]["backend"], "fake")
+        names = {bench.name for bench in bench_treeviewex.BENCHMARKS}
+        self.assertEqual(set(result["results"]), names)
+        for entry in result["results"].values():
+            self.assertGreaterEqual(entry["seconds"], 0.0)
+            self.assertIsNotNone(entry["tk_calls"])
+
+    def test_compare_reports_regressions_over_threshold(self):
+        baseline = {
+            "results": {
+                "a": {"seconds": 1.0, "tk_calls": 100},
+                "b": {"seconds": 1.0, "tk_calls": None},
+            }
+        }
+        current = {
+            "results": {
+                "a": {"seconds": 1.1, "tk_calls": 200},
+                "b": {"seconds": 2.0, "tk_calls": None},
+                "c": {"seconds": 9.0, "tk_calls": 1},
+            }
+        }
+        regressions = bench_treeviewex.compare(current, baseline, 0.25)
+        self.assertEqual(
+            [(name, metric) for name, metric, *_ in regressions],
+            [("a", "tk_calls"), ("b", "seconds")],
+        )
@@ -0,0 +1,240 @@
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from tkinter import TclError, Tk
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from treeviewex import FileLoader, TreeviewEx
+from treeviewex.ingest import _ChunkSpec, _parse_chunk
+
+
+def _can_use_tk():
+    try:
+        Tk()
+    except (TclError, OSError):
+        return False
+    return True
+
+
+def _write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(text)
+    return path
+
+
+def _pump(loader, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not loader.done and time.monotonic() < deadline:
+        if loader._after_id is not None:
+            loader.widget.after_cancel(loader._after_id)
+            loader._after_id = None
+        wait([future for future, _ in loader._in_flight], timeout=1)
+        loader._step()
+    if loader._after_id is not None:
+        loader.widget.after_cancel(loader._after_id)
+
+
+class TestParseChunk(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv_rows_with_paths(self):
+        path = _write(
+            self.directory.name,
+            "tree.csv",
+            'path,size\na,1\na/b,"2,5"\n/a/b/c/,3\n',
+        )
+        spec = _ChunkSpec(
+            "csv",
+            "utf-8",
+            ",",
+            ("path", "size"),
+            ("size",),
+            None,
+            None,
+            None,
+            "path",
+            "/",
+        )
+        start = len("path,size\n")
+        self.assertEqual(
+            _parse_chunk(path, start, os.path.getsize(path), spec),
+            [
+                ("a", "", "a", ("1",)),
+                ("a/b", "a", "b", ("2,5",)),
+                ("a/b/c", "a/b", "c", ("3",)),
+            ],
+        )
+
+    def test_jsonl_rows_with_parent_ids_in_a_process(self):
+        records = [
+            {"id": 1, "parent": None, "name": "root", "n": 5},
+            {"id": 2, "parent": 1, "name": "leaf"},
+        ]
+        path = _write(
+            self.directory.name,
+            "tree.jsonl",
+            "\n".join(json.dumps(record) for record in records) + "\n\n",
+        )
+        spec = _ChunkSpec(
+            "jsonl",
+            "utf-8",
+            ",",
+            (),
+            ("n",),
+            "name",
+            "id",
+            "parent",
+            None,
+            "/",
+        )
+        with ProcessPoolExecutor(1) as executor:
+            rows = executor.submit(
+                _parse_chunk, path, 0, os.path.getsize(path), spec
+            ).result()
+        self.assertEqual(
+            rows,
+            [("1", "", "root", (5,)), ("2", "1", "leaf", ("",))],
+        )
+
+    def test_json_arrays_and_unknown_formats_are_rejected(self):
+        path = _write(self.directory.name, "rows.json", '[{"a": 1}]\n')
+        with self.assertRaises(ValueError):
+            FileLoader(None, path, file_format="jsonl")
+        with self.assertRaises(ValueError):
+            FileLoader(None, path)
+
+
+class TestFileLoader(unittest.TestCase):
+    def setUp(self):
+        if not _can_use_tk():
+            self.skipTest("Tk is not available in this environment")
+        self.root = Tk()
+        self.root.withdraw()
+        self.treeview_ex = TreeviewEx(self.root)
+        self.treeview_ex["columns"] = ("#1",)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.root.destroy()
+        self.directory.cleanup()
+        # Free the Tcl interpreter here, not in a parser thread
+        del self.root, self.treeview_ex
+        gc.collect()
+
+    def test_chunks_are_inserted_in_order_with_parents(self):
+        lines = ["id,parent,name,value"]
+        lines.append("c0,p,child0,x")  # Before its parent
+        lines.extend(f"r{i},,row{i},{i}" for i in range(50))
+        lines.append("p,r3,parent,y")
+        lines.append("lost,missing,orphan,z")
+        path = _write(self.directory.name, "rows.csv", "\n".join(lines))
+        progress = []
+        done = []
+        change_sets = []
+        self.treeview_ex.subscribe(change_sets.append)
+
+        loader = self.treeview_ex.load_file(
+            path,
+            id_column="id",
+            parent_column="parent",
+            text_column="name",
+            chunk_bytes=64,
+            max_in_flight=2,
+            processes=False,
+            on_progress=lambda rows, fraction: progress.append(fraction),
+            on_done=lambda rows, error: done.append((rows, error)),
+        )
+        self.assertLessEqual(len(loader._in_flight), 2)
+        _pump(loader)
+
+        self.assertEqual(done, [(53, None)])
+        self.assertEqual(loader.progress, 1.0)
+        self.assertEqual(progress[-1], 1.0)
+        self.assertEqual(
+            self.treeview_ex.get_children()[:3], ("r0", "r1", "r2")
+        )
+        self.assertEqual(self.treeview_ex.get_children()[-1], "lost")
+        self.assertEqual(self.treeview_ex.get_children("r3"), ("p",))
+        self.assertEqual(self.treeview_ex.get_children("p"), ("c0",))
+        self.assertEqual(self.treeview_ex.item("c0", "text"), "child0")
+        self.assertEqual(
+            {change.source for changes in change_sets for change in changes},
+            {"load"},
+        )
+        self.assertFalse(self.treeview_ex._file_loaders)
+
+    def test_paths_create_missing_ancestors(self):
+        path = _write(
+            self.directory.name, "tree.csv", "path,size\na/b/c,3\na/b,2\n"
+        )
+        loader = self.treeview_ex.load_file(
+            path, path_column="path", processes=False
+        )
+        _pump(loader)
+        self.assertEqual(self.treeview_ex.get_children(), ("a",))
+        self.assertEqual(self.treeview_ex.get_children("a/b"), ("a/b/c",))
+        self.assertEqual(
+            [str(value) for value in self.treeview_ex.item("a/b", "values")],
+            ["2"],
+        )
+        self.assertEqual(self.treeview_ex.item("a/b/c", "text"), "c")
+
+    def test_duplicate_ids_are_skipped(self):
+        self.treeview_ex.insert("", "end", iid="r1", values=("old",))
+        path = _write(
+            self.directory.name,
+            "rows.csv",
+            "id,parent,value\nr0,,a\nr1,,b\nr1,,c\nc1,r1,d\n",
+        )
+        loader = FileLoader(
+            self.treeview_ex,
+            path,
+            id_column="id",
+            parent_column="parent",
+            processes=False,
+        )
+        self.assertIsNone(loader._file)  # Opened only while loading
+        loader.start()
+        _pump(loader)
+        self.assertIsNone(loader.error)
+        self.assertIsNone(loader._file)
+        self.assertEqual(loader.skipped, ["r1", "r1"])
+        self.assertEqual(loader.rows_inserted, 2)
+        self.assertEqual(self.treeview_ex.get_children(), ("r1", "r0"))
+        self.assertEqual(self.treeview_ex.get_children("r1"), ("c1",))
+
+    def test_cancel_stops_loading(self):
+        path = _write(
+            self.directory.name,
+            "rows.csv",
+            "value\n" + "\n".join(str(i) for i in range(1000)),
+        )
+        done = []
+        loader = self.treeview_ex.load_file(
+            path,
+            chunk_bytes=100,
+            processes=False,
+            on_done=lambda rows, error: done.append(rows),
+        )
+        loader.cancel()
+        self.assertTrue(loader.done)
+        self.assertTrue(loader.cancelled)
+        self.assertFalse(loader._in_flight)
+        self.assertEqual(done, [])
+        self.assertEqual(self.treeview_ex.get_children(), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import unittest
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from treeviewex import DECIMAL, FLOAT, INT, ColumnType, date_type, enum_type
+
+
+class TestColumnTypes(unittest.TestCase):
+    def test_builtin_types_round_trip(self):
+        self.assertEqual(INT.parse(" 42 "), 42)
+        self.assertEqual(INT.format(42), "42")
+        self.assertEqual(FLOAT.parse("1.5"), 1.5)
+        self.assertEqual(DECIMAL.parse("1.50"), Decimal("1.50"))
+        self.assertEqual(DECIMAL.format(Decimal("1.50")), "1.50")
+
+    def test_invalid_text_raises_value_error(self):
+        for column_type, text in (
+            (INT, "1.5"),
+            (FLOAT, "abc"),
+            (DECIMAL, "abc"),
+            (DECIMAL, "NaN"),
+        ):
+            with self.subTest(type=column_type, text=text):
+                with self.assertRaises(ValueError):
+                    column_type.parse(text)
+
+    def test_date_type_uses_format(self):
+        column_type = date_type("%d/%m/%Y")
+        self.assertEqual(column_type.parse("31/12/2024"), date(2024, 12, 31))
+        self.assertEqual(column_type.format(date(2024, 1, 2)), "02/01/2024")
+        with self.assertRaises(ValueError):
+            column_type.parse("2024-12-31")
+
+    def test_enum_type_accepts_only_choices(self):
+        column_type = enum_type(["low", "high"])
+        self.assertEqual(column_type.choices, ("low", "high"))
+        self.assertEqual(column_type.parse("low"), "low")
+        with self.assertRaises(ValueError):
+            column_type.parse("medium")
+
+    def test_custom_type_errors_become_value_errors(self):
+        column_type = ColumnType(lambda text: 1 / len(text), name="inverse")
+        self.assertEqual(column_type.parse("ab"), 0.5)
+        with self.assertRaises(ValueError):
+            column_type.parse("")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import json
+import sqlite3
+import sys
+import unittest
+from pathlib import Path
+from tkinter import Event, TclError, Tk
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from treeviewex import CellType, SQLiteDataSource, TreeviewEx
+
+
+def _can_use_tk():
+    try:
+        Tk()
+    except (TclError, OSError):
+        return False
+    return True
+
+
+def _make_database(top=10, children=3):
+    connection = sqlite3.connect(":memory:")
+    SQLiteDataSource.create_table(connection, value_columns=("a", "b"))
+    rows = []
+    for i in range(top):
+        rows.append((i + 1, None, i, f"top{i}", f"A{i}", f"B{i}"))
+    for j in range(children):
+        rows.append((10000 + j, 1, j, f"child{j}", f"a{j}", f"b{j}"))
+    connection.executemany(
+        "INSERT INTO nodes (id, parent_id, position, text, a, b) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    connection.execute("UPDATE nodes SET readonly = 1 WHERE id = 2")
+    connection.execute(
+        "UPDATE nodes SET readonly_columns = '#2', combobox_values = ? "
+        "WHERE id = 3",
+        (json.dumps({"#1": ["x", "y"]}),),
+    )
+    return connection
+
+
+class TestSQLiteDataSource(unittest.TestCase):
+    def setUp(self):
+        self.connection = _make_database()
+        self.source = SQLiteDataSource(
+            self.connection, page_size=4, cache_pages=2, write_batch=3
+        )
+
+    def test_value_columns_default_to_non_structure_columns(self):
+        self.assertEqual(self.source.value_columns, ["a", "b"])
+
+    def test_pages_and_child_counts(self):
+        self.assertEqual(self.source.child_count(None), 10)
+        self.assertEqual(self.source.child_count("1"), 3)
+        page = self.source.get_page(None, 2)
+        self.assertEqual([row.row_id for row in page], ["9", "10"])
+        first = self.source.get_page(None, 0)[0]
+        self.assertEqual(first.text, "top0")
+        self.assertEqual(first.values, ("A0", "B0"))
+        self.assertTrue(first.has_children)
+        self.assertFalse(first.has_rules)
+
+    def test_rules_are_read_from_rule_columns(self):
+        rows = self.source.get_page(None, 0)
+        self.assertTrue(rows[1].readonly)
+        self.assertEqual(rows[2].readonly_columns, frozenset({"#2"}))
+        self.assertEqual(rows[2].combobox_values, {"#1": ["x", "y"]})
+
+    def test_page_cache_is_lru(self):
+        first = self.source.get_page(None, 0)
+        self.source.get_page(None, 1)
+        self.assertIs(self.source.get_page(None, 0), first)
+        self.source.get_page(None, 2)  # Evicts page 1, not page 0
+        self.assertIs(self.source.get_page(None, 0), first)
+        self.assertNotIn((None, 1), self.source._pages)
+
+    def test_writes_are_batched(self):
+        self.source.get_page(None, 0)
+        self.assertFalse(self.source.queue_write("1", 0, "new"))
+        self.assertFalse(self.source.queue_write("1", 0, "newer"))
+        self.assertEqual(self.source.get_page(None, 0)[0].values[0], "newer")
+        (stored,) = self.connection.execute(
+            "SELECT a FROM nodes WHERE id = 1"
+        ).fetchone()
+        self.assertEqual(stored, "A0")
+
+        self.assertFalse(self.source.queue_write("2", 1, "b"))
+        self.assertTrue(self.source.queue_write("3", 1, "c"))
+        self.source.flush()
+        self.assertEqual(self.source.pending_writes, 0)
+        self.assertEqual(
+            self.connection.execute(
+                "SELECT a, b FROM nodes WHERE id IN (1, 2, 3) ORDER BY id"
+            ).fetchall(),
+            [("newer", "B0"), ("A1", "b"), ("A2", "c")],
+        )
+
+    def test_missing_table_raises(self):
+        with self.assertRaises(ValueError):
+            SQLiteDataSource(self.connection, table="missing")
+
+
+class TestTreeviewExDataSource(unittest.TestCase):
+    def setUp(self):
+        if not _can_use_tk():
+            self.skipTest("Tk is not available in this environment")
+        self.root = Tk()
+        self.root.withdraw()
+        self.treeview_ex = TreeviewEx(self.root, height=2)
+        self.treeview_ex._viewport_height = 40  # Two rows in view
+        self.source = SQLiteDataSource(_make_database(top=1000), page_size=4)
+        self.treeview_ex.set_data_source(self.source)
+
+    def tearDown(self):
+        self.treeview_ex.destroy()
+        self.root.destroy()
+
+    def test_only_a_window_of_rows_is_inserted(self):
+        self.assertEqual(
+            self.treeview_ex.get_children(), ("1", "2", "3", "4", "5", "6")
+        )
+        self.assertEqual(self.treeview_ex["columns"], ("a", "b"))
+        self.assertEqual(
+            self.treeview_ex.get_children("1"), ("1::placeholder",)
+        )
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("1::placeholder", "#1")),
+            CellType.READONLY,
+        )
+
+    def test_scrollbar_covers_all_rows(self):
+        self.assertEqual(self.treeview_ex.yview(), (0.0, 0.002))
+        self.treeview_ex.yview("moveto", 0.5)
+        self.assertEqual(self.treeview_ex.yview(), (0.5, 0.502))
+        self.assertEqual(
+            self.treeview_ex.get_children(),
+            tuple(str(i) for i in range(497, 507)),
+        )
+
+    def test_rows_leaving_the_window_are_deleted(self):
+        for _ in range(50):
+            self.treeview_ex.yview("scroll", 1, "pages")
+        self.assertEqual(
+            self.treeview_ex.get_children(),
+            tuple(str(i) for i in range(97, 107)),
+        )
+        self.assertFalse(self.treeview_ex.exists("1"))
+
+    def test_scrolling_up_prefetches_the_previous_page(self):
+        self.treeview_ex.yview("moveto", 0.5)
+        self.root.update_idletasks()
+        with patch.object(self.source, "prefetch") as prefetch:
+            self.treeview_ex.yview("scroll", -4, "units")
+            self.root.update_idletasks()
+        prefetch.assert_called_once_with(None, 122)
+
+    def test_item_open_loads_children(self):
+        self.treeview_ex.item("1", open=True)
+        self.assertEqual(
+            self.treeview_ex.get_children("1"), ("10000", "10001", "10002")
+        )
+        self.assertEqual(self.treeview_ex.yview()[1], 2 / 1003)
+        self.treeview_ex.item("1", open=False)
+        self.assertEqual(
+            self.treeview_ex.get_children("1"), ("1::placeholder",)
+        )
+
+    def test_edit_of_a_row_scrolled_away_is_committed(self):
+        self.treeview_ex.bbox = lambda item, column=None: (0, 0, 100, 20)
+        self.treeview_ex.start_edit(("4", "#1"))
+        self.treeview_ex.entry.delete(0, "end")
+        self.treeview_ex.entry.insert(0, "edited")
+        self.treeview_ex.yview("moveto", 0.5)
+        self.assertFalse(self.treeview_ex.exists("4"))
+        self.assertIsNone(self.treeview_ex._editing_cell)
+        self.assertEqual(self.source.pending_writes, 1)
+
+        event = Event()
+        event.widget = self.treeview_ex.entry
+        self.treeview_ex._on_return(event)  # No edit is left to commit
+        self.treeview_ex.yview("moveto", 0)
+        self.assertEqual(self.treeview_ex.item("4", "values")[0], "edited")
+
+    def test_return_after_the_edited_row_was_deleted(self):
+        self.treeview_ex.bbox = lambda item, column=None: (0, 0, 100, 20)
+        self.treeview_ex.start_edit(("4", "#1"))
+        self.treeview_ex.delete("4")
+        event = Event()
+        event.widget = self.treeview_ex.entry
+        self.treeview_ex._on_return(event)
+        self.assertIsNone(self.treeview_ex._editing_cell)
+
+    def test_pending_edits_survive_scrolling(self):
+        self.treeview_ex.entry.delete(0, "end")
+        self.treeview_ex.entry.insert(0, "edited")
+        self.treeview_ex.update_cell(("4", "#1"), self.treeview_ex.entry)
+        self.source._pages.clear()
+        self.source._row_pages.clear()
+        self.treeview_ex.yview("moveto", 0.5)
+        self.treeview_ex.yview("moveto", 0)
+        self.assertEqual(self.treeview_ex.item("4", "values")[0], "edited")
+
+    def test_children_are_loaded_when_expanded(self):
+        self.treeview_ex._expand_descendants("1")
+        self.assertEqual(
+            self.treeview_ex.get_children("1"), ("10000", "10001", "10002")
+        )
+
+    def test_source_rules_set_cell_types(self):
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("2", "#1")), CellType.READONLY
+        )
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("3", "#2")), CellType.READONLY
+        )
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("3", "#1")), CellType.COMBOBOX
+        )
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("4", "#1")), CellType.ENTRY
+        )
+
+    def test_edits_are_written_back(self):
+        self.treeview_ex.item("4", values=("A3", "B3"))
+        self.treeview_ex.entry.delete(0, "end")
+        self.treeview_ex.entry.insert(0, "edited")
+        self.treeview_ex.update_cell(("4", "#1"), self.treeview_ex.entry)
+        self.assertEqual(self.source.pending_writes, 1)
+        self.treeview_ex.flush_data_source()
+        (stored,) = self.source.connection.execute(
+            "SELECT a FROM nodes WHERE id = 4"
+        ).fetchone()
+        self.assertEqual(stored, "edited")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,19 @@
+import asyncio
+import gc
 import sys
+import threading
+import time
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tkinter import Event, TclError, Tk
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from treeviewex import CellType, TreeviewEx
+from treeviewex import INT, AsyncioBridge, CellType, Change, TreeviewEx
+from treeviewex.treeviewex import _TextMeasureCache
 
 
 def _can_use_tk():
@@ -220,3 +227,855 @@ class TestTreeviewEx(unittest.TestCase):
         self.assertEqual(
             self.treeview_ex.get_cell_value(("row1", "#1")), "Updated"
         )
+
+    def test_mouse_wheel_events_are_coalesced_per_frame(self):
+        self.treeview_ex._scroll_y.view = MagicMock()
+        for _ in range(3):
+            event = MagicMock(num="??", delta=-120, state=0)
+            self.assertEqual(self.treeview_ex._on_mouse_wheel(event), "break")
+        event = MagicMock(num=5, delta=0, state=0)
+        self.treeview_ex._on_mouse_wheel(event)
+
+        self.treeview_ex._scroll_y.view.assert_not_called()
+        self.treeview_ex._scroll_y.flush()
+        self.treeview_ex._scroll_y.view.assert_called_once_with(
+            "scroll", 4, "units"
+        )
+
+    def test_high_resolution_wheel_deltas_accumulate(self):
+        self.treeview_ex._scroll_y.view = MagicMock()
+        event = MagicMock(num="??", delta=-60, state=0)
+        self.treeview_ex._on_mouse_wheel(event)
+        self.treeview_ex._scroll_y.flush()
+        self.treeview_ex._scroll_y.view.assert_not_called()
+
+        self.treeview_ex._on_mouse_wheel(event)
+        self.treeview_ex._scroll_y.flush()
+        self.treeview_ex._scroll_y.view.assert_called_once_with(
+            "scroll", 1, "units"
+        )
+
+    def test_shift_wheel_scrolls_horizontally(self):
+        self.treeview_ex._scroll_x.view = MagicMock()
+        event = MagicMock(num=4, delta=0, state=1)
+        self.treeview_ex._on_mouse_wheel(event)
+        self.treeview_ex._scroll_x.flush()
+        self.treeview_ex._scroll_x.view.assert_called_once_with(
+            "scroll", -1, "units"
+        )
+
+    def test_scrollbar_bursts_apply_latest_position_once(self):
+        self.treeview_ex._scroll_y.view = MagicMock()
+        self.treeview_ex._on_scroll_y("scroll", "1", "units")
+        self.treeview_ex._on_scroll_y("moveto", "0.25")
+        self.treeview_ex._on_scroll_y("moveto", "0.5")
+        self.treeview_ex._scroll_y.flush()
+        self.treeview_ex._scroll_y.view.assert_called_once_with("moveto", 0.5)
+
+    def test_kinetic_scroll_coasts_after_input(self):
+        scroll = self.treeview_ex._scroll_y
+        scroll.kinetic = True
+        scroll.view = MagicMock()
+        scroll.scroll_units(4)
+        scroll.flush()
+        scroll.flush()
+        self.assertEqual(
+            scroll.view.call_args_list[1].args, ("scroll", 3, "units")
+        )
+        for _ in range(50):
+            scroll.flush()
+        self.assertEqual(scroll.velocity, 0.0)
+
+    def test_scrolling_keeps_editor_and_follows_cell(self):
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex._scroll_y.view = MagicMock()
+        self.treeview_ex._on_scroll_y("scroll", "1", "units")
+        self.treeview_ex._scroll_y.flush()
+        self.assertEqual(self.treeview_ex._editing_cell, ("row1", "#1"))
+
+        self.treeview_ex.bbox = MagicMock(return_value=(0, 40, 100, 20))
+        self.treeview_ex._reposition_editor()
+        self.treeview_ex.bbox.assert_called_once_with("row1", "#1")
+        self.treeview_ex.entry.place.assert_called_with(
+            x=0, y=40, width=100, height=20
+        )
+
+    def test_editor_hidden_while_cell_offscreen(self):
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.bbox = MagicMock(return_value="")
+        self.treeview_ex._reposition_editor()
+        self.assertTrue(self.treeview_ex._editor_hidden)
+        self.treeview_ex.entry.place_forget.assert_called()
+
+        # Focus loss while hidden must not commit or cancel the edit
+        event = MagicMock()
+        event.widget = self.treeview_ex.entry
+        self.treeview_ex._on_focus_out(event)
+        self.assertEqual(self.treeview_ex._editing_cell, ("row1", "#1"))
+
+        self.treeview_ex.bbox = MagicMock(return_value=(0, 20, 100, 20))
+        self.treeview_ex._reposition_editor()
+        self.assertFalse(self.treeview_ex._editor_hidden)
+        self.treeview_ex.entry.focus_set.assert_called()
+
+    def test_editor_reposition_is_throttled(self):
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.after_idle = MagicMock(return_value="idle#1")
+        self.treeview_ex.after = MagicMock(return_value="after#1")
+        for _ in range(10):
+            self.treeview_ex._schedule_editor_reposition()
+        scheduled = (
+            self.treeview_ex.after_idle.call_count
+            + self.treeview_ex.after.call_count
+        )
+        self.assertEqual(scheduled, 1)
+
+    def test_column_virtualization_displays_viewport_columns(self):
+        columns = tuple(f"c{i}" for i in range(300))
+        self.treeview_ex["columns"] = columns
+        for col in columns:
+            self.treeview_ex.column(col, width=50)
+        self.treeview_ex.column("#0", width=200)
+        self.treeview_ex.winfo_width = MagicMock(return_value=500)
+
+        self.treeview_ex.set_column_virtualization(True, overscan=1)
+        self.assertEqual(self.treeview_ex._column_window, (0, 6))
+        self.assertEqual(len(self.treeview_ex["displaycolumns"]), 7)
+
+        self.treeview_ex.xview("moveto", 0.5)
+        first, last = self.treeview_ex._column_window
+        self.assertEqual((first, last), (147, 158))
+        self.assertAlmostEqual(self.treeview_ex.xview()[0], 0.5, places=2)
+
+        self.treeview_ex.set_column_virtualization(False)
+        self.assertIsNone(self.treeview_ex._column_window)
+        self.assertEqual(tuple(self.treeview_ex["displaycolumns"]), ("#all",))
+
+    def test_virtualized_column_ids_stay_logical(self):
+        self.treeview_ex._column_window = (10, 20)
+        self.assertEqual(
+            self.treeview_ex._display_to_logical_column("#1"), "#11"
+        )
+        self.assertEqual(
+            self.treeview_ex._logical_to_display_column("#12"), "#2"
+        )
+        self.assertIsNone(self.treeview_ex._logical_to_display_column("#5"))
+        self.assertEqual(
+            self.treeview_ex._display_to_logical_column("#0"), "#0"
+        )
+
+        event = MagicMock(x=10, y=30)
+        self.treeview_ex.identify_region = MagicMock(return_value="cell")
+        self.treeview_ex.identify_row = MagicMock(return_value="row1")
+        self.treeview_ex.identify_column = MagicMock(return_value="#3")
+        self.assertEqual(
+            self.treeview_ex.get_clicked_cell_id_pair(event), ("row1", "#13")
+        )
+        self.treeview_ex._column_window = None
+
+    def test_context_menu_falls_back_to_first_selected_item(self):
+        self.treeview_ex.insert("", "end", iid="row3", values=("", "", ""))
+        self.treeview_ex.selection_set("row3", "row2", "row1")
+        self.treeview_ex.focus("")
+        self.treeview_ex._context_menu_target_item = None
+        self.assertEqual(
+            self.treeview_ex._get_context_menu_target_item(), "row1"
+        )
+
+    def _virtualize_columns(self) -> None:
+        columns = tuple(f"c{i}" for i in range(300))
+        self.treeview_ex["columns"] = columns
+        for col in columns:
+            self.treeview_ex.column(col, width=50)
+        self.treeview_ex.item("row1", values=columns)
+        self.treeview_ex.winfo_width = MagicMock(return_value=500)
+        self.treeview_ex.set_column_virtualization(True, overscan=1)
+
+    def test_set_while_columns_are_scrolled_uses_logical_column(self):
+        self._virtualize_columns()
+        self.treeview_ex.xview("moveto", 0.5)
+        change_sets = []
+        self.treeview_ex.subscribe(change_sets.append)
+
+        self.treeview_ex.set("row1", "#200", "X")
+        self.treeview_ex.heading("#200", text="Heading")
+        self.treeview_ex.flush_changes()
+
+        self.assertEqual(self.treeview_ex.item("row1", "values")[199], "X")
+        self.assertEqual(self.treeview_ex.set("row1", "#200"), "X")
+        self.assertEqual(self.treeview_ex.heading("c199", "text"), "Heading")
+        self.assertEqual(
+            change_sets, [(Change("cell", "row1", "#200", "c199", "X", "api"),)]
+        )
+
+    def test_start_edit_scrolls_hidden_column_into_view(self):
+        self._virtualize_columns()
+        self.assertTrue(self.treeview_ex.start_edit(("row1", "#200")))
+        first, last = self.treeview_ex._column_window
+        self.assertTrue(first <= 199 <= last)
+        self.assertEqual(self.treeview_ex._editing_cell, ("row1", "#200"))
+        self.assertIs(self.treeview_ex._editing_widget, self.treeview_ex.entry)
+
+    def test_failed_start_edit_leaves_no_editing_cell(self):
+        self.treeview_ex.bbox = MagicMock(return_value="")
+        with self.assertRaises(ValueError):
+            self.treeview_ex.start_edit(("row1", "#1"))
+        self.assertIsNone(self.treeview_ex._editing_cell)
+
+    def test_autofit_columns_uses_heading_and_longest_text(self):
+        self.treeview_ex.heading("#2", text="A long heading")
+        self.treeview_ex.insert(
+            "", "end", iid="row3", values=("A much longer value", "B", "C")
+        )
+        widths = []
+        with patch.object(
+            _TextMeasureCache,
+            "measure",
+            side_effect=lambda widget, font, text: len(text) * 10,
+        ):
+            self.treeview_ex.autofit_columns(
+                ["#1", "#2"], on_done=widths.append
+            )
+            while self.treeview_ex._autofit_job is not None:
+                self.treeview_ex._run_autofit()
+
+        self.assertEqual(widths, [{"#1": 206, "#2": 156}])
+        self.assertEqual(self.treeview_ex.column("#1", "width"), 206)
+        self.assertEqual(self.treeview_ex.column("#2", "width"), 156)
+
+    def test_autofit_measures_longest_text_outside_sample(self):
+        for index in range(50):
+            self.treeview_ex.insert(
+                "row1", "end", iid=f"leaf{index}", values=("x", "", "")
+            )
+        self.treeview_ex.insert(
+            "", "end", iid="outlier", values=("An outlier value", "", "")
+        )
+        get_children = MagicMock(wraps=self.treeview_ex.get_children)
+        self.treeview_ex.get_children = get_children
+        widths = []
+        with patch.object(
+            _TextMeasureCache,
+            "measure",
+            side_effect=lambda widget, font, text: len(text) * 10,
+        ):
+            self.treeview_ex.autofit_columns(
+                ["#1"], sample=1, on_done=widths.append
+            )
+            while self.treeview_ex._autofit_job is not None:
+                self.treeview_ex._run_autofit()
+
+        self.assertEqual(widths, [{"#1": 176}])
+        # Only the root and row1 are asked for their children
+        self.assertEqual(
+            sorted(call.args[0] for call in get_children.call_args_list),
+            ["", "row1"],
+        )
+
+    def test_update_cell_widens_autofitted_column(self):
+        self.treeview_ex._autofit_widths["#1"] = 50
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "Updated value")
+        with patch.object(
+            _TextMeasureCache,
+            "measure",
+            side_effect=lambda widget, font, text: len(text) * 10,
+        ):
+            self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        self.assertEqual(self.treeview_ex._autofit_widths["#1"], 146)
+        self.assertEqual(self.treeview_ex.column("#1", "width"), 146)
+
+    def test_paste_refits_each_autofitted_column_once(self):
+        for index in range(50):
+            self.treeview_ex.insert(
+                "", "end", iid=f"r{index}", values=("", "", "")
+            )
+        self.treeview_ex.exists = MagicMock(return_value=True)
+        self.treeview_ex._autofit_widths["#1"] = 50
+        texts = {(f"r{index}", "#1"): "x" * index for index in range(50)}
+        self.treeview_ex.column = MagicMock()
+        with (
+            patch.object(
+                _TextMeasureCache,
+                "measure",
+                side_effect=lambda widget, font, text: len(text) * 10,
+            ),
+            patch.object(
+                self.treeview_ex,
+                "_get_autofit_fonts",
+                return_value=("cell", "heading"),
+            ) as get_fonts,
+        ):
+            self.treeview_ex.paste_cells(texts)
+        get_fonts.assert_called_once()
+        self.treeview_ex.column.assert_called_once_with(0, width=506)
+        self.assertEqual(self.treeview_ex._autofit_widths["#1"], 506)
+
+    def test_update_cell_rejects_invalid_typed_input(self):
+        self.treeview_ex.set_column_type("#1", INT)
+        self.treeview_ex.bell = MagicMock()
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "abc")
+        self.assertFalse(
+            self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        )
+        self.treeview_ex.bell.assert_called_once()
+        self.assertEqual(self.treeview_ex.get_cell_value(("row1", "#1")), "A1")
+        self.assertEqual(self.treeview_ex._editing_cell, ("row1", "#1"))
+
+        self.treeview_ex.entry.insert(0, " 007 ")
+        self.assertTrue(
+            self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        )
+        self.assertEqual(self.treeview_ex.get_cell_value(("row1", "#1")), "7")
+        with patch.object(INT, "parse") as parse:
+            self.assertEqual(
+                self.treeview_ex.get_typed_value(("row1", "#1")), 7
+            )
+        parse.assert_not_called()
+
+    def test_typed_value_cache_is_invalidated_on_write(self):
+        self.treeview_ex.set_column_type("#1", INT)
+        self.treeview_ex.item("row1", values=("5", "B1", "C1"))
+        self.assertEqual(self.treeview_ex.get_typed_value(("row1", "#1")), 5)
+        with patch.object(INT, "parse") as parse:
+            self.treeview_ex.get_typed_value(("row1", "#1"))
+        parse.assert_not_called()
+
+        self.treeview_ex.set("row1", "#1", "6")
+        self.assertEqual(self.treeview_ex.get_typed_value(("row1", "#1")), 6)
+        self.treeview_ex.item("row1", values=("x", "B1", "C1"))
+        self.assertIsNone(self.treeview_ex.get_typed_value(("row1", "#1")))
+        with self.assertRaises(KeyError):
+            self.treeview_ex.get_typed_value(("row1", "#2"))
+
+    def _finish_validations(self):
+        deadline = time.monotonic() + 5
+        while self.treeview_ex._pending_cells and time.monotonic() < deadline:
+            time.sleep(0.005)
+            after_id = self.treeview_ex._validation_after_id
+            if after_id is not None:
+                self.treeview_ex.after_cancel(after_id)
+            self.treeview_ex._poll_validations()
+
+    def test_validator_commits_or_reverts_pending_edits(self):
+        release = threading.Event()
+
+        def validator(cell_id_pair, value):
+            release.wait(5)
+            return value != "bad"
+
+        self.treeview_ex.set_validator(validator)
+        self.treeview_ex.bell = MagicMock()
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "bad")
+        self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+
+        # The new value is shown as pending until the validator returns
+        self.assertEqual(self.treeview_ex.get_cell_value(("row1", "#1")), "bad")
+        self.assertIn("pending", self.treeview_ex.item("row1", "tags"))
+        self.assertIsNone(self.treeview_ex._editing_cell)
+        release.set()
+        self._finish_validations()
+        self.assertEqual(self.treeview_ex.get_cell_value(("row1", "#1")), "A1")
+        self.assertNotIn("pending", self.treeview_ex.item("row1", "tags"))
+        self.treeview_ex.bell.assert_called_once()
+
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "good")
+        self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        self._finish_validations()
+        self.assertEqual(
+            self.treeview_ex.get_cell_value(("row1", "#1")), "good"
+        )
+
+    def test_reediting_a_pending_cell_cancels_the_stale_validation(self):
+        release = threading.Event()
+        calls = []
+
+        def validator(cell_id_pair, value):
+            calls.append(value)
+            release.wait(5)
+            return value == "second"
+
+        self.treeview_ex.set_validator(validator, max_concurrent=1)
+        self.treeview_ex.bell = MagicMock()
+        for text in ("first", "second"):
+            self.treeview_ex.start_edit(("row1", "#1"))
+            self.treeview_ex.entry.insert(0, text)
+            self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        self.assertEqual(len(self.treeview_ex._validation_jobs), 1)
+        release.set()
+        self._finish_validations()
+        self.assertEqual(
+            self.treeview_ex.get_cell_value(("row1", "#1")), "second"
+        )
+        self.treeview_ex.bell.assert_not_called()
+
+    def test_changing_the_executor_rebuilds_the_runner(self):
+        release = threading.Event()
+
+        def validator(cell_id_pair, value):
+            release.wait(5)
+            return True
+
+        self.treeview_ex.set_validator(validator)
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "new")
+        self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        old_runner = self.treeview_ex._validation_runner
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.treeview_ex.set_validator(validator, executor=executor)
+            runner = self.treeview_ex._validation_runner
+            self.assertIsNot(runner, old_runner)
+            self.assertIs(runner.executor, executor)
+            release.set()
+            self._finish_validations()
+        self.assertEqual(self.treeview_ex.get_cell_value(("row1", "#1")), "new")
+
+    def test_paste_cells_validates_in_batches(self):
+        batches = []
+
+        def batch_validator(items):
+            batches.append(items)
+            return [value != "x" for _, value in items]
+
+        self.treeview_ex.set_validator(
+            lambda cell_id_pair, value: True, batch_validator
+        )
+        self.treeview_ex.bell = MagicMock()
+        self.treeview_ex.set_readonly_cell(("row1", "#3"))
+        skipped = self.treeview_ex.paste_cells(
+            {
+                ("row1", "#1"): "p1",
+                ("row1", "#2"): "x",
+                ("row1", "#3"): "p3",
+                ("row2", "#1"): "p4",
+            }
+        )
+        self.assertEqual(skipped, [("row1", "#3"), ("row2", "#1")])
+        self._finish_validations()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            self.treeview_ex.item("row1", "values"), ("p1", "B1", "C1")
+        )
+
+    def test_pasted_jobs_share_the_concurrency_limit(self):
+        active = []
+        peak = []
+
+        async def validator(cell_id_pair, value):
+            active.append(cell_id_pair)
+            peak.append(len(active))
+            await asyncio.sleep(0.001)
+            active.remove(cell_id_pair)
+            return True
+
+        for index in range(150):
+            self.treeview_ex.insert(
+                "", "end", iid=f"p{index}", values=("", "", "")
+            )
+        self.treeview_ex.exists = MagicMock(return_value=True)
+        self.treeview_ex.set_validator(validator, max_concurrent=4)
+        skipped = self.treeview_ex.paste_cells(
+            {
+                (f"p{index}", f"#{column}"): "v"
+                for index in range(150)
+                for column in (1, 2, 3)
+            }
+        )
+        self.assertEqual(skipped, [])
+        self.assertEqual(len(self.treeview_ex._validation_jobs), 3)
+        self._finish_validations()
+        self.assertEqual(len(peak), 450)
+        self.assertLessEqual(max(peak), 4)
+
+    def test_combobox_provider_fills_values_while_editing(self):
+        async def provider(cell_id_pair):
+            await asyncio.sleep(0)
+            return [f"{cell_id_pair[0]}-a", f"{cell_id_pair[0]}-b"]
+
+        self.treeview_ex.set_combobox_provider("#2", provider)
+        self.assertEqual(
+            self.treeview_ex._get_cell_type(("row1", "#2")), CellType.COMBOBOX
+        )
+        bridge = AsyncioBridge.for_widget(self.treeview_ex)
+        self.treeview_ex.start_edit(("row1", "#2"))
+        task = self.treeview_ex._combobox_task
+        deadline = time.monotonic() + 5
+        while not task.done() and time.monotonic() < deadline:
+            bridge._step()
+            bridge.stop()
+        self.assertEqual(
+            self.treeview_ex._editing_combobox_values, ["row1-a", "row1-b"]
+        )
+        self.treeview_ex.cancel_edit()
+        self.assertIsNone(self.treeview_ex._combobox_task)
+        bridge.close()
+
+    def test_cell_edits_are_coalesced_into_one_change_set(self):
+        change_sets = []
+        self.treeview_ex.subscribe(change_sets.append)
+        self.treeview_ex.start_edit(("row1", "#1"))
+        self.treeview_ex.entry.insert(0, "new")
+        self.treeview_ex.update_cell(("row1", "#1"), self.treeview_ex.entry)
+        self.treeview_ex.set("row1", "#2", "B9")
+        self.assertEqual(change_sets, [])
+        self.assertIsNotNone(self.treeview_ex._changes_after_id)
+
+        self.treeview_ex.flush_changes()
+        self.assertEqual(
+            change_sets,
+            [
+                (
+                    Change("cell", "row1", "#1", "A1", "new", "edit"),
+                    Change("cell", "row1", "#2", "B1", "B9", "api"),
+                )
+            ],
+        )
+        self.assertIsNone(self.treeview_ex._changes_after_id)
+
+    def test_transaction_reports_structure_and_rule_changes_once(self):
+        change_sets = []
+        events = []
+        self.treeview_ex.subscribe(change_sets.append)
+        self.treeview_ex.bind("<<CellsChanged>>", events.append)
+        with self.treeview_ex.transaction("import"):
+            self.treeview_ex.insert("", "end", iid="row3", values=("A3",))
+            self.treeview_ex.move("row3", "", 0)
+            self.treeview_ex.item("row2", values=("A2", "B2", "X"))
+            self.treeview_ex.set_readonly_row("row1")
+            self.treeview_ex.set_readonly_row("row1")  # No change
+            self.treeview_ex.delete("row2")
+        self.assertEqual(len(change_sets), 1)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(
+            change_sets[0],
+            (
+                Change("insert", "row3", None, None, ("A3",), "import"),
+                Change("move", "row3", None, ("", 2), ("", 0), "import"),
+                Change("cell", "row2", "#3", "C2", "X", "import"),
+                Change("readonly", "row1", None, False, True, "import"),
+                Change(
+                    "delete", "row2", None, ("A2", "B2", "X"), None, "import"
+                ),
+            ),
+        )
+        self.assertEqual(self.treeview_ex.last_change_set, change_sets[0])
+
+        self.treeview_ex.unsubscribe(change_sets.append)
+        self.treeview_ex.set_readonly_row("row1", False)
+        self.treeview_ex.flush_changes()
+        self.assertEqual(len(change_sets), 1)
+        self.assertEqual(len(events), 2)
+
+    def test_deleting_a_parent_reports_its_descendants(self):
+        tree = self.treeview_ex
+        tree.insert("row1", "end", iid="c1", values=("x",))
+        tree.insert("c1", "end", iid="g1", values=("y",))
+        tree.set_column_type("#1", INT)
+        tree.get_typed_value(("g1", "#1"))
+        self.assertIn("g1", tree._typed_cache)
+        change_sets = []
+        tree.subscribe(change_sets.append)
+        tree.delete("row1")
+        tree.flush_changes()
+        self.assertEqual(
+            [(change.kind, change.row) for change in change_sets[0]],
+            [("delete", "row1"), ("delete", "c1"), ("delete", "g1")],
+        )
+        self.assertNotIn("g1", tree._typed_cache)
+        self.assertNotIn("c1", tree._parent_ids)
+
+    def test_failing_subscriber_does_not_block_others(self):
+        change_sets = []
+
+        def fail(changes):
+            raise RuntimeError("boom")
+
+        self.treeview_ex.subscribe(fail)
+        self.treeview_ex.subscribe(change_sets.append)
+        with patch.object(self.treeview_ex, "_report_exception") as report:
+            self.treeview_ex.set("row1", "#2", "B9")
+            self.treeview_ex.flush_changes()
+        report.assert_called_once_with()
+        self.assertEqual(len(change_sets), 1)
+
+    def test_bulk_selection_keeps_set_in_sync(self):
+        tree = self.treeview_ex
+        for index in range(3):
+            tree.insert("row1", "end", iid=f"c{index}", values=(index,))
+        tree.insert("c0", "end", iid="g0", values=(9,))
+        tree.item("row1", open=True)
+        tree.item("c0", open=True)
+
+        self.assertEqual(tree.select_subtree("row1"), 5)
+        self.assertEqual(
+            tree.selected_items(), {"row1", "c0", "c1", "c2", "g0"}
+        )
+        self.assertEqual(set(tree.selection()), tree.selected_items())
+        self.assertTrue(tree.is_selected("g0"))
+
+        tree.select_where(lambda item_id, values: str(values[0]) == "9")
+        self.assertEqual(tree.selected_items(), {"g0"})
+        tree.select_range("c1", "c2", mode="add")
+        self.assertEqual(tree.selected_items(), {"g0", "c1", "c2"})
+        self.assertEqual(tree.select_range("g0", "row2"), 4)
+        self.assertEqual(tree.selected_items(), {"g0", "c1", "c2", "row2"})
+
+        self.assertEqual(tree.invert_selection(), 2)
+        self.assertEqual(tree.selected_items(), {"row1", "c0"})
+        tree.select_all()
+        self.assertEqual(len(tree.selected_items()), 6)
+
+        tree.selection_remove("row2")
+        tree.delete("c0")
+        self.assertEqual(tree.selected_items(), {"row1", "c1", "c2"})
+        self.assertEqual(set(tree.selection()), tree.selected_items())
+        with self.assertRaises(ValueError):
+            tree.select_subtree("row1", mode="x")
+
+    def test_own_selection_events_keep_the_index(self):
+        tree = self.treeview_ex
+        tree.select_all()
+        tree._on_select(None)  # <<TreeviewSelect>> from select_all
+        self.assertFalse(tree._selection_dirty)
+        tree.select_all()  # Unchanged: no event is expected
+        self.assertEqual(tree._own_select_events, 0)
+        tree._on_select(None)  # A click by the user
+        self.assertTrue(tree._selection_dirty)
+
+    def test_apply_to_selection_reports_one_change_set(self):
+        change_sets = []
+        self.treeview_ex.subscribe(change_sets.append)
+        self.treeview_ex.select_all()
+        count = self.treeview_ex.apply_to_selection(
+            lambda item_id: self.treeview_ex.set(item_id, "#2", "X")
+        )
+        self.assertEqual(count, 2)
+        self.assertEqual(len(change_sets), 1)
+        self.assertEqual(
+            {change.row for change in change_sets[0]}, {"row1", "row2"}
+        )
+        self.assertEqual(
+            {change.source for change in change_sets[0]}, {"selection"}
+        )
+
+    def test_move_items_moves_subtrees_in_one_change_set(self):
+        tree = self.treeview_ex
+        tree.insert("row1", "end", iid="c1", values=("x",))
+        tree.insert("", "end", iid="row3", values=("A3",))
+        change_sets = []
+        tree.subscribe(change_sets.append)
+
+        moved = tree.move_items(["row3", "c1", "row1"], "", 0)
+        self.assertEqual(moved, ["row1", "row3"])
+        self.assertEqual(tree.get_children(), ("row1", "row3", "row2"))
+        self.assertEqual(tree.get_children("row1"), ("c1",))
+        self.assertEqual(len(change_sets), 1)
+        self.assertEqual(
+            change_sets[0],
+            (
+                Change("move", "row1", None, ("", 0), ("", 0), "api"),
+                Change("move", "row3", None, ("", 2), ("", 1), "api"),
+            ),
+        )
+        with self.assertRaises(ValueError):
+            tree.move_items(["row2", "row1"], "c1")
+
+    def test_drag_and_drop_moves_selected_rows(self):
+        tree = self.treeview_ex
+        tree.insert("", "end", iid="row3", values=("A3",))
+        tree.insert("", "end", iid="row4", values=("A4",))
+        tree.identify_region = MagicMock(return_value="cell")
+        tree.identify_element = MagicMock(return_value="text")
+        tree.identify_row = lambda y: dict(enumerate(tree.get_children())).get(
+            y // 20, ""
+        )
+        tree.bbox = lambda item, column=None: (
+            0,
+            tree.get_children().index(item) * 20,
+            100,
+            20,
+        )
+        tree.set_drag_and_drop()
+        tree.set_readonly_row("row2")
+        tree.selection_set("row1", "row2", "row3")
+        change_sets = []
+        tree.subscribe(change_sets.append)
+
+        def mouse(handler, y):
+            event = Event()
+            event.x, event.y, event.state = 5, y, 0
+            return handler(event)
+
+        # Pressing a selected row keeps the selection for the drag
+        self.assertEqual(mouse(tree._on_drag_press, 5), "break")
+        mouse(tree._on_drag_motion, 75)  # Lower half of row4
+        self.assertEqual(tree._drag_items, ["row1", "row3"])
+        mouse(tree._on_drag_release, 75)
+        self.assertEqual(tree.get_children(), ("row2", "row4", "row1", "row3"))
+        self.assertEqual(len(change_sets), 1)
+        self.assertEqual({change.source for change in change_sets[0]}, {"drag"})
+
+        # Rows cannot be dropped into themselves
+        mouse(tree._on_drag_press, 45)
+        mouse(tree._on_drag_motion, 50)  # Middle of row1
+        self.assertIsNone(tree._drop_target(50))
+        mouse(tree._on_drag_release, 50)
+        self.assertEqual(tree.get_children("row1"), ())
+
+        # A click without a drag selects only the clicked row
+        mouse(tree._on_drag_press, 65)
+        mouse(tree._on_drag_release, 65)
+        self.assertEqual(tree.selected_items(), {"row3"})
+
+    def test_style_rules_tag_rows_incrementally(self):
+        tree = self.treeview_ex
+        tree.item("row1", tags=("user",))
+        tree.add_style_rule(
+            "late", lambda values: values[2] == "late", foreground="red"
+        )
+        tree.set_readonly_style()
+        tree.set_readonly_row("row2")
+        tree._apply_styles()
+        self.assertEqual(tree.item("row1", "tags"), ("user",))
+        self.assertEqual(tree.item("row2", "tags"), ("readonly",))
+
+        # Inserted rows are tagged at once
+        tree.insert("", "end", iid="row3", values=("A3", "B3", "late"))
+        self.assertEqual(tree.item("row3", "tags"), ("late",))
+        self.assertFalse(tree._style_dirty)
+
+        # Changed rows are retagged in the next batch
+        tree.set("row1", "#3", "late")
+        tree._write_cells({("row3", "#3"): "soon"})
+        self.assertEqual(list(tree._style_dirty), ["row1", "row3"])
+        tree._apply_styles()
+        self.assertEqual(tree.item("row1", "tags"), ("user", "late"))
+        self.assertFalse(tree.item("row3", "tags"))
+
+        tree.remove_style_rule("late")
+        tree.set_readonly_style(False)
+        tree._apply_styles()
+        self.assertEqual(tree.item("row1", "tags"), ("user",))
+        self.assertFalse(tree.item("row2", "tags"))
+        self.assertEqual(tree._row_styles, {})
+
+    def _shared_tree(self):
+        tree = TreeviewEx(self.root, shared_editors=True)
+        tree["columns"] = ("#1", "#2")
+        tree.insert("", "end", iid="row1", values=("A1", "B1"))
+        tree.bbox = lambda item, column=None: (0, 0, 100, 20)
+        return tree
+
+    def test_editors_are_created_on_first_use(self):
+        tree = TreeviewEx(self.root)
+        tree["columns"] = ("#1",)
+        tree.insert("", "end", iid="row1", values=("A1",))
+        tree.bbox = lambda item, column=None: (0, 0, 100, 20)
+        self.assertIsNone(tree._entry)
+        self.assertIsNone(tree._combobox)
+        self.assertIsNone(tree._context_menu)
+
+        self.assertTrue(tree.start_edit(("row1", "#1")))
+        self.assertIs(tree._editing_widget, tree.entry)
+        self.assertIs(tree.entry.master, tree)
+        self.assertIsNone(tree._combobox)
+        tree.cancel_edit()
+        self.assertIsNone(tree._context_menu)
+
+    def test_shared_editors_are_reused_across_trees(self):
+        first = self._shared_tree()
+        second = self._shared_tree()
+        self.assertIsNone(first._entry)
+        self.assertIs(first.entry, second.entry)
+        self.assertIs(first.combobox, second.combobox)
+        self.assertIs(first.context_menu, second.context_menu)
+        self.assertIs(first.entry.master, self.root)
+
+        # Starting an edit in another tree commits the previous edit
+        first.start_edit(("row1", "#1"))
+        first.entry.delete(0, "end")
+        first.entry.insert(0, "edited")
+        second.start_edit(("row1", "#2"))
+        self.assertEqual(first.get_cell_value(("row1", "#1")), "edited")
+        self.assertIsNone(first._editing_cell)
+        self.assertEqual(second.entry.get(), "B1")
+
+        # Only the owner hides the shared editor
+        first.cancel_edit()
+        self.assertEqual(second._editing_cell, ("row1", "#2"))
+        self.assertTrue(second.entry.winfo_ismapped())
+        second.destroy()
+        self.assertFalse(first.entry.winfo_ismapped())
+        self.assertIsNone(first._editor_pool.owner)
+
+    def test_shared_context_menu_targets_clicked_tree(self):
+        first = self._shared_tree()
+        second = self._shared_tree()
+        second.insert("row1", "end", iid="child", values=("C1", "C2"))
+        second.identify_row = MagicMock(return_value="row1")
+        second.context_menu.tk_popup = MagicMock()
+        event = Event()
+        event.y = 10
+        event.x_root = 100
+        event.y_root = 200
+
+        second._on_right_click(event)
+
+        first.context_menu.tk_popup.assert_called_once_with(100, 200)
+        self.assertIs(first._editor_pool.menu_owner, second)
+        first._editor_pool._menu_handler("_expand_current_node")()
+        self.assertTrue(second.item("row1", "open"))
+        self.assertFalse(first.item("row1", "open"))
+
+    def test_shared_pool_is_dropped_with_its_root(self):
+        root = Tk()
+        root.withdraw()
+        tree = TreeviewEx(root, shared_editors=True)
+        pool = weakref.ref(tree._shared_pool())
+        self.assertIsNotNone(pool().entry)
+        tree.destroy()
+        root.destroy()
+        del tree, root
+        gc.collect()
+        self.assertIsNone(pool())
+
+
+class TestTextMeasureCache(unittest.TestCase):
+    def test_measurements_are_cached_per_font_and_text(self):
+        widget = MagicMock()
+        widget.tk.call.return_value = 42
+        widget.tk.getint.side_effect = int
+        cache = _TextMeasureCache(max_entries=2)
+
+        self.assertEqual(cache.measure(widget, "TkDefaultFont", "abc"), 42)
+        self.assertEqual(cache.measure(widget, "TkDefaultFont", "abc"), 42)
+        self.assertEqual(widget.tk.call.call_count, 1)
+
+        cache.measure(widget, "TkHeadingFont", "abc")
+        cache.measure(widget, "TkDefaultFont", "xyz")
+        self.assertEqual(widget.tk.call.call_count, 3)
+        # The oldest entry was dropped to respect max_entries
+        cache.measure(widget, "TkDefaultFont", "abc")
+        self.assertEqual(widget.tk.call.call_count, 4)
+
+    def test_font_key_follows_font_configuration(self):
+        widget = MagicMock()
+        widget.tk.splitlist.side_effect = tuple
+        widget.tk.getint.side_effect = int
+        cache = _TextMeasureCache()
+
+        widget.tk.call.return_value = ("-family", "Sans", "-size", 10)
+        small = cache.font_key(widget, "AppFont")
+        widget.tk.call.return_value = 42
+        cache.measure(widget, small, "abc")
+        widget.tk.call.return_value = ("-family", "Sans", "-size", 14)
+        large = cache.font_key(widget, "AppFont")
+        self.assertNotEqual(small, large)
+
+        # A reconfigured font is measured again
+        widget.tk.call.return_value = 56
+        self.assertEqual(cache.measure(widget, large, "abc"), 56)
+        self.assertEqual(cache.measure(widget, small, "abc"), 42)
@@ -0,0 +1,135 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from treeviewex.validation import (
+    ValidationRunner,
+    validate_each,
+    validate_each_async,
+)
+
+
+def _wait(runner, timeout=5.0):
+    finished = []
+    deadline = time.monotonic() + timeout
+    while runner.busy and time.monotonic() < deadline:
+        finished += runner.poll()
+        time.sleep(0.005)
+    return finished
+
+
+class TestValidationRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = ValidationRunner(max_concurrent=2)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_plain_and_coroutine_functions(self):
+        async def is_even(value):
+            await asyncio.sleep(0)
+            return value % 2 == 0
+
+        first = self.runner.submit(lambda value: value > 0, 1)
+        second = self.runner.submit(is_even, 3)
+        results = {token: result for token, result, _ in _wait(self.runner)}
+        self.assertEqual(results, {first: True, second: False})
+
+    def test_errors_are_reported(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        token = self.runner.submit(fail)
+        ((finished, result, error),) = _wait(self.runner)
+        self.assertEqual(finished, token)
+        self.assertIsNone(result)
+        self.assertIsInstance(error, RuntimeError)
+
+    def test_concurrency_is_limited(self):
+        release = threading.Event()
+        self.runner.submit(release.wait)
+        self.runner.submit(release.wait)
+        self.runner.submit(lambda: True)
+        self.assertEqual(len(self.runner._running), 2)
+        self.assertEqual(len(self.runner._queued), 1)
+        release.set()
+        self.assertEqual(len(_wait(self.runner)), 3)
+
+    def test_cancelled_jobs_are_not_polled(self):
+        release = threading.Event()
+        running = self.runner.submit(release.wait)
+        self.runner.submit(release.wait)
+        queued = self.runner.submit(lambda: True)
+        self.runner.cancel(running)
+        self.runner.cancel(queued)
+        release.set()
+        tokens = [token for token, _, _ in _wait(self.runner)]
+        self.assertNotIn(running, tokens)
+        self.assertNotIn(queued, tokens)
+        self.assertEqual(len(tokens), 1)
+
+    def test_shutdown_closes_the_private_loop(self):
+        async def is_true(value):
+            return value is True
+
+        self.runner.submit(is_true, True)
+        _wait(self.runner)
+        loop = self.runner._loop
+        thread = self.runner._loop_thread
+        self.runner.shutdown()
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(loop.is_closed())
+
+    def test_invalid_limit_raises(self):
+        with self.assertRaises(ValueError):
+            ValidationRunner(max_concurrent=0)
+
+
+class TestValidateEach(unittest.TestCase):
+    def test_exceptions_reject_single_items(self):
+        def validator(cell_id_pair, value):
+            if value == "error":
+                raise ValueError(value)
+            return value == "ok"
+
+        items = [
+            (("r", "#1"), "ok"),
+            (("r", "#2"), "error"),
+            (("r", "#3"), "no"),
+        ]
+        self.assertEqual(validate_each(validator, items), [True, False, False])
+
+        async def async_validator(cell_id_pair, value):
+            return validator(cell_id_pair, value)
+
+        self.assertEqual(
+            asyncio.run(validate_each_async(async_validator, items)),
+            [True, False, False],
+        )
+
+    def test_async_calls_are_limited(self):
+        active = []
+        peak = []
+
+        async def validator(cell_id_pair, value):
+            active.append(value)
+            peak.append(len(active))
+            await asyncio.sleep(0)
+            active.remove(value)
+            return True
+
+        items = [(("r", f"#{i}"), i) for i in range(10)]
+        self.assertEqual(
+            asyncio.run(validate_each_async(validator, items, 3)),
+            [True] * 10,
+        )
+        self.assertEqual(max(peak), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()